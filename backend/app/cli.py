@@ -0,0 +1,514 @@
+"""
+Command-line entry point for offline batch subsetting.
+
+Usage:
+    python -m app.cli subset manifest.json [--workers N] [--report report.json]
+    python -m app.cli scan site/ [--font font.ttf] [--output chars.txt] [--subset-dir out/]
+
+The manifest lists source fonts and named character sets; every font is
+subset for every set and written in the requested formats. Subsets go
+through FontService.create_subset and convert_formats, so the output is
+identical to what the web API produces for the same inputs.
+
+Example manifest (paths are relative to the manifest file):
+
+    {
+      "output_dir": "dist/fonts",
+      "formats": ["woff2", "woff"],
+      "name": "{font}-{set}",
+      "fonts": [
+        "fonts/*.ttf",
+        {"path": "fonts/Inter.var.ttf", "axis_limits": {"wght": 700}, "name": "inter-bold-{set}"}
+      ],
+      "character_sets": {
+        "latin": {"unicode_ranges": ["U+0000-00FF", "U+2000-206F"]},
+        "ui": {"characters": "0123456789", "characters_file": "chars/ui.txt"},
+        "site": {"corpus": ["build/site.zip", "content/"], "min_count": 2}
+      }
+    }
+
+Jobs whose inputs (font content, characters, options and fontTools version)
+are unchanged since the last run are skipped, based on a state file kept in
+the output directory. A "corpus" character set is built by scanning text,
+HTML and JSON files (or zip/tar archives of them) on every run. Set
+SOURCE_DATE_EPOCH to make the head table timestamp, and with it the output
+bytes, reproducible across runs.
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+import fontTools
+
+from app.services.font_service import (
+    DEFAULT_BROTLI_QUALITY,
+    FontService,
+    resolve_axis_limits,
+    subset_options_fingerprint
+)
+from app.utils.corpus_scanner import CorpusScanner
+from app.utils.font_cache import FontCache
+from app.utils.hashing import file_sha256
+from app.utils.subset_cache import SubsetCache
+from app.utils.unicode_ranges import parse_unicode_range
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = ".fontsub-state.json"
+DEFAULT_NAME_TEMPLATE = "{font}-{set}"
+DEFAULT_FORMATS = ["woff2"]
+
+# Per-process service used by pool workers
+_worker_service: Optional[FontService] = None
+
+
+def _init_worker(font_cache_max_bytes: int, brotli_quality: int):
+    """Pool initializer: one service (and parsed font cache) per worker process"""
+    global _worker_service
+    font_cache = FontCache(max_bytes=font_cache_max_bytes) if font_cache_max_bytes > 0 else None
+    _worker_service = FontService(font_cache=font_cache, brotli_quality=brotli_quality)
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Any]:
+    """
+    Read a manifest and expand it into subset jobs.
+
+    Args:
+        manifest_path: Path to the JSON manifest
+
+    Returns:
+        Dictionary with "output_dir", "brotli_quality" and "jobs" (one dict
+        per font and character set)
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    manifest_file = Path(manifest_path).resolve()
+    base_dir = manifest_file.parent
+    with open(manifest_file, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    output_dir = base_dir / manifest.get("output_dir", "output")
+    default_formats = manifest.get("formats", DEFAULT_FORMATS)
+    default_name = manifest.get("name", DEFAULT_NAME_TEMPLATE)
+    brotli_quality = int(manifest.get("brotli_quality", DEFAULT_BROTLI_QUALITY))
+
+    character_sets = {}
+    for set_name, spec in (manifest.get("character_sets") or {}).items():
+        if isinstance(spec, str):
+            spec = {"characters": spec}
+        characters = spec.get("characters", "")
+        if spec.get("characters_file"):
+            characters += (base_dir / spec["characters_file"]).read_text(encoding="utf-8")
+        if spec.get("corpus"):
+            scanner = CorpusScanner()
+            for corpus_path in spec["corpus"]:
+                scanner.scan_path(str(base_dir / corpus_path))
+            characters += scanner.select(
+                min_count=spec.get("min_count", 1),
+                max_characters=spec.get("max_characters")
+            )
+        unicode_ranges = spec.get("unicode_ranges") or []
+        for range_spec in unicode_ranges:
+            parse_unicode_range(range_spec)
+        if not characters and not unicode_ranges:
+            raise ValueError(f"Character set '{set_name}' is empty")
+        character_sets[set_name] = {"characters": characters, "unicode_ranges": unicode_ranges}
+    if not character_sets:
+        raise ValueError("Manifest has no character_sets")
+
+    fonts = []
+    for entry in manifest.get("fonts") or []:
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        pattern = str(base_dir / entry["path"])
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise ValueError(f"No fonts match {entry['path']}")
+        for font_path in matches:
+            if not os.path.isfile(font_path):
+                raise ValueError(f"Font not found: {font_path}")
+            fonts.append({**entry, "path": str(Path(font_path).resolve())})
+    if not fonts:
+        raise ValueError("Manifest has no fonts")
+
+    jobs = []
+    names = set()
+    for font in fonts:
+        for set_name, character_set in character_sets.items():
+            name = font.get("name", default_name).format(font=Path(font["path"]).stem, set=set_name)
+            if name in names:
+                raise ValueError(f"Duplicate output name '{name}'; add {{set}} or {{font}} to the name template")
+            names.add(name)
+            jobs.append({
+                "name": name,
+                "font_path": font["path"],
+                "set": set_name,
+                "characters": character_set["characters"],
+                "unicode_ranges": character_set["unicode_ranges"],
+                "axis_limits": _axis_limits(font.get("axis_limits")),
+                "formats": font.get("formats", default_formats),
+            })
+
+    return {"output_dir": str(output_dir), "brotli_quality": brotli_quality, "jobs": jobs}
+
+
+def _axis_limits(axis_limits: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """JSON [min, max] pairs become the tuples the instancer expects"""
+    if not axis_limits:
+        return None
+    return {tag: tuple(limit) if isinstance(limit, list) else limit for tag, limit in axis_limits.items()}
+
+
+def job_key(job: Dict[str, Any], font_hash: str, brotli_quality: int) -> str:
+    """
+    Fingerprint of everything that determines a job's output.
+
+    Args:
+        job: Job from load_manifest
+        font_hash: Content hash of the source font
+        brotli_quality: WOFF2 Brotli quality
+
+    Returns:
+        Hex digest
+    """
+    return SubsetCache.make_key(
+        font_hash=font_hash,
+        characters="".join(sorted(set(job["characters"]))),
+        unicode_ranges=job["unicode_ranges"],
+        axis_limits=job["axis_limits"],
+        formats=job["formats"],
+        options=subset_options_fingerprint(),
+        brotli_quality=brotli_quality,
+        fonttools=fontTools.version
+    )
+
+
+def run_job(job: Dict[str, Any], output_dir: str, service: Optional[FontService] = None) -> Dict[str, Any]:
+    """
+    Subset one font for one character set and write every requested format.
+
+    Kept at module level so it can run in a worker process.
+
+    Args:
+        job: Job from load_manifest
+        output_dir: Directory for the output files
+        service: Font service to use; defaults to the worker's own service
+
+    Returns:
+        Dictionary with the output files and timing
+    """
+    service = service or _worker_service
+    started = time.perf_counter()
+
+    # Validate limits the same way /api/subset does
+    axis_limits = job["axis_limits"]
+    if axis_limits:
+        axes = service.extract_metadata(job["font_path"]).axes
+        unknown_axes = sorted(set(axis_limits) - {axis.tag for axis in axes})
+        if unknown_axes:
+            raise ValueError(f"Font has no axes: {', '.join(unknown_axes)}")
+        axis_limits = resolve_axis_limits(axis_limits, axes)
+
+    with tempfile.TemporaryDirectory(prefix="fontsub-") as staging_dir:
+        subset_path = service.create_subset(
+            job["font_path"],
+            job["characters"],
+            staging_dir,
+            custom_font_name=job["name"],
+            unicode_ranges=job["unicode_ranges"],
+            axis_limits=axis_limits
+        )
+        files = service.convert_formats(subset_path, job["formats"], output_dir, custom_font_name=job["name"])
+
+    return {
+        "files": [{"format": f["format"], "path": f["path"], "size": f["size"]} for f in files],
+        "seconds": round(time.perf_counter() - started, 4)
+    }
+
+
+def _outputs_intact(previous: Dict[str, Any]) -> bool:
+    """Check that the files recorded for a previous run are still in place"""
+    for output in previous.get("files", []):
+        try:
+            if os.path.getsize(output["path"]) != output["size"]:
+                return False
+        except OSError:
+            return False
+    return bool(previous.get("files"))
+
+
+def run_manifest(
+    manifest_path: str,
+    workers: int = 0,
+    force: bool = False,
+    state_path: Optional[str] = None,
+    font_cache_max_bytes: int = 256 * 1024 * 1024
+) -> Dict[str, Any]:
+    """
+    Run every job in a manifest.
+
+    Args:
+        manifest_path: Path to the JSON manifest
+        workers: Worker processes (0 = one per CPU, 1 = run inline)
+        force: Rebuild jobs even if their inputs are unchanged
+        state_path: State file used to skip unchanged jobs (defaults to
+            .fontsub-state.json in the output directory)
+        font_cache_max_bytes: Parsed font cache budget per process
+
+    Returns:
+        Report with one entry per job and a summary
+    """
+    started = time.perf_counter()
+    plan = load_manifest(manifest_path)
+    output_dir = plan["output_dir"]
+    brotli_quality = plan["brotli_quality"]
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    state_path = state_path or str(Path(output_dir) / STATE_FILENAME)
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+
+    font_hashes: Dict[str, str] = {}
+    results: List[Dict[str, Any]] = []
+    pending = []
+    for job in plan["jobs"]:
+        if job["font_path"] not in font_hashes:
+            font_hashes[job["font_path"]] = file_sha256(job["font_path"])
+        key = job_key(job, font_hashes[job["font_path"]], brotli_quality)
+
+        result = {
+            "name": job["name"],
+            "font": job["font_path"],
+            "set": job["set"],
+            "source_size": os.path.getsize(job["font_path"]),
+            "key": key,
+        }
+        previous = state.get(job["name"])
+        if not force and previous and previous.get("key") == key and _outputs_intact(previous):
+            result.update(status="skipped", files=previous["files"], seconds=0.0)
+        else:
+            pending.append((job, result))
+        results.append(result)
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(pending) > 1:
+        # spawn matches the web service's pool and avoids forking logging handlers
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(font_cache_max_bytes, brotli_quality)
+        ) as pool:
+            futures = [(pool.submit(run_job, job, output_dir), result) for job, result in pending]
+            for future, result in futures:
+                _record(result, future.result, ())
+    else:
+        font_cache = FontCache(max_bytes=font_cache_max_bytes) if font_cache_max_bytes > 0 else None
+        service = FontService(font_cache=font_cache, brotli_quality=brotli_quality)
+        for job, result in pending:
+            _record(result, run_job, (job, output_dir, service))
+
+    # Keep state for jobs that are still in the manifest and did not fail
+    new_state = {
+        result["name"]: {"key": result["key"], "files": result["files"]}
+        for result in results
+        if result["status"] != "failed"
+    }
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(new_state, f, indent=2, sort_keys=True)
+
+    counts = {status: 0 for status in ("built", "skipped", "failed")}
+    for result in results:
+        counts[result["status"]] += 1
+
+    return {
+        "output_dir": output_dir,
+        "jobs": results,
+        "summary": {
+            **counts,
+            "total": len(results),
+            "source_bytes": sum(result["source_size"] for result in results),
+            "output_bytes": sum(f["size"] for result in results for f in result.get("files", [])),
+            "seconds": round(time.perf_counter() - started, 3),
+        },
+    }
+
+
+def _record(result: Dict[str, Any], func, args):
+    """Run a job (or collect a future's result) and record the outcome"""
+    try:
+        outcome = func(*args)
+        result.update(status="built", **outcome)
+    except Exception as e:
+        logger.error(f"Error building {result['name']}: {str(e)}")
+        result.update(status="failed", error=str(e), files=[], seconds=None)
+
+
+def scan_corpus(
+    paths: List[str],
+    font_paths: List[str],
+    min_count: int = 1,
+    max_characters: Optional[int] = None,
+    subset_dir: Optional[str] = None,
+    font_name_suffix: str = "Subset"
+) -> Dict[str, Any]:
+    """
+    Scan a corpus into a character set and check it against fonts.
+
+    Args:
+        paths: Files, directories or archives to scan
+        font_paths: Fonts to report coverage for (and subset)
+        min_count: Minimum occurrences for a character to be selected
+        max_characters: Keep only this many of the most frequent characters
+        subset_dir: Subset each font to the selected characters into this directory
+        font_name_suffix: Suffix for the subset filenames
+
+    Returns:
+        Report with the selected characters, scan statistics, top
+        frequencies, per-font coverage and subset paths
+    """
+    started = time.perf_counter()
+    scanner = CorpusScanner()
+    for path in paths:
+        if not os.path.exists(path):
+            raise ValueError(f"Corpus path not found: {path}")
+        scanner.scan_path(path)
+    characters = scanner.select(min_count=min_count, max_characters=max_characters)
+
+    service = FontService()
+    if subset_dir:
+        Path(subset_dir).mkdir(parents=True, exist_ok=True)
+
+    fonts = []
+    for font_path in font_paths:
+        metadata = service.extract_metadata(font_path)
+        entry = {"font": font_path, **scanner.coverage(characters, set(metadata.character_set))}
+        if subset_dir and characters:
+            subset_path = service.create_subset(font_path, characters, subset_dir, font_name_suffix)
+            entry["subset_path"] = subset_path
+            entry["subset_size"] = os.path.getsize(subset_path)
+        fonts.append(entry)
+
+    return {
+        "characters": characters,
+        "character_count": len(characters),
+        **scanner.stats(),
+        "frequencies": scanner.frequencies(100),
+        "coverage": fonts,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Arguments (defaults to sys.argv)
+
+    Returns:
+        Exit code: 0 on success, 1 if any job failed, 2 on invalid input
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Font subsetting tools")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    subset_parser = commands.add_parser("subset", help="Subset fonts listed in a manifest")
+    subset_parser.add_argument("manifest", help="Path to the JSON manifest")
+    subset_parser.add_argument("--workers", type=int, default=int(os.getenv("FONT_WORKERS", 0)),
+                               help="Worker processes (0 = one per CPU, 1 = inline)")
+    subset_parser.add_argument("--report", help="Write the JSON report here instead of stdout")
+    subset_parser.add_argument("--state", help=f"State file (default: {STATE_FILENAME} in the output directory)")
+    subset_parser.add_argument("--force", action="store_true", help="Rebuild unchanged jobs")
+
+    scan_parser = commands.add_parser("scan", help="Build a character set from a text/HTML/JSON corpus")
+    scan_parser.add_argument("paths", nargs="+", help="Files, directories or zip/tar archives to scan")
+    scan_parser.add_argument("--font", action="append", default=[], help="Report coverage for this font (repeatable)")
+    scan_parser.add_argument("--min-count", type=int, default=1, help="Minimum occurrences for a character")
+    scan_parser.add_argument("--max-characters", type=int, help="Keep only the N most frequent characters")
+    scan_parser.add_argument("--output", help="Write the selected characters to this file")
+    scan_parser.add_argument("--subset-dir", help="Subset each --font to the selected characters into this directory")
+    scan_parser.add_argument("--suffix", default="Subset", help="Suffix for subset filenames")
+    scan_parser.add_argument("--report", help="Write the JSON report here instead of stdout")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr)
+    if not args.verbose:
+        logging.getLogger("fontTools").setLevel(logging.WARNING)
+
+    if args.command == "subset":
+        try:
+            report = run_manifest(
+                args.manifest,
+                workers=args.workers,
+                force=args.force,
+                state_path=args.state,
+                font_cache_max_bytes=int(os.getenv("FONT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+            )
+        except (OSError, ValueError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+
+        output = json.dumps(report, indent=2)
+        if args.report:
+            Path(args.report).write_text(output + "\n", encoding="utf-8")
+        else:
+            print(output)
+
+        summary = report["summary"]
+        print(
+            f"{summary['built']} built, {summary['skipped']} skipped, {summary['failed']} failed "
+            f"in {summary['seconds']}s",
+            file=sys.stderr
+        )
+        return 1 if summary["failed"] else 0
+
+    if args.command == "scan":
+        try:
+            report = scan_corpus(
+                args.paths,
+                args.font,
+                min_count=args.min_count,
+                max_characters=args.max_characters,
+                subset_dir=args.subset_dir,
+                font_name_suffix=args.suffix
+            )
+        except (OSError, ValueError, zipfile.BadZipFile, tarfile.TarError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+
+        if args.output:
+            Path(args.output).write_text(report["characters"], encoding="utf-8")
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if args.report:
+            Path(args.report).write_text(output + "\n", encoding="utf-8")
+        else:
+            print(output)
+
+        print(
+            f"{report['character_count']} characters from {report['files_scanned']} files "
+            f"({report['bytes_scanned']} bytes) in {report['seconds']}s",
+            file=sys.stderr
+        )
+        return 0
+
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
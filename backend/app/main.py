@@ -2,14 +2,21 @@
 Font Subsetting Backend API
 FastAPI application for font processing and subsetting operations.
 """
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
+from fastapi import BackgroundTasks, FastAPI, UploadFile, File, HTTPException, Form, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
+import asyncio
+import hashlib
+import json
 import os
-import shutil
-from typing import List, Optional
+import tarfile
+import zipfile
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 import logging
+import aiofiles
 from dotenv import load_dotenv
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -18,28 +25,103 @@ from slowapi.errors import RateLimitExceeded
 # Load environment variables
 load_dotenv()
 
-from app.services.font_service import FontService
-from app.models.font_models import FontMetadata, SubsetRequest, ExportRequest
+from app.services.font_service import FontService, is_collection, resolve_axis_limits
+from pydantic import TypeAdapter, ValidationError
+from app.models.font_models import (
+    CollectionSelectRequest,
+    CompactFontMetadata,
+    EstimateRequest,
+    ExportRequest,
+    FontCollection,
+    FontMetadata,
+    GlyphPage,
+    SliceRequest,
+    SubsetRequest
+)
+from app.utils.admission import AdmissionController, AdmissionRejected, Ticket, job_cost
+from app.utils.blob_store import BlobStore
+from app.utils.body_limit import BodySizeLimitMiddleware
+from app.utils.corpus_scanner import CorpusScanner, corpus_kind
+from app.utils.font_face import font_face_rule
+from app.utils.font_cache import FontCache
+from app.utils.glyph_cost import GlyphCostStore
+from app.utils.hashing import file_sha256, hashed_filename, remember_digest, split_hashed_filename
+from app.utils.http_cache import DOWNLOAD_MEDIA_TYPES, IMMUTABLE_CACHE_CONTROL, cached_json_response, etag_matches
+from app.utils.job_manager import JobManager, ProgressCallback
+from app.utils.metrics import REGISTRY, MetricsMiddleware, stage
+from app.utils.profiling import ProfileStore, ProfilingMiddleware, check_admin_token, run_in_threadpool
+from app.utils.session_janitor import SessionJanitor
 from app.utils.session_manager import SessionManager
+from app.utils.session_store import create_session_store
+from app.utils.subset_cache import SubsetCache
+from app.utils.unicode_ranges import (
+    DEFAULT_SLICES,
+    SLICE_PRESETS,
+    format_unicode_range,
+    in_ranges,
+    merge_ranges,
+    parse_unicode_range,
+    to_ranges
+)
+from app.utils.zip_stream import stream_zip, zip_bytes
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# (set RATE_LIMIT_STORAGE_URI, e.g. redis://..., to share limits across workers)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks"""
+    session_janitor.start()
+    if STARTUP_WARMUP:
+        # Not awaited: the app serves requests while font modules load
+        asyncio.get_running_loop().run_in_executor(None, font_service.warm_up)
+    yield
+    await session_janitor.stop()
+    font_service.shutdown()
+    job_manager.shutdown()
+    session_store.close()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Font Subsetting API",
     description="API for font subsetting and optimization",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add rate limiter to app state
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Upload limits
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", 10 * 1024 * 1024))
+MAX_CORPUS_SIZE = int(os.getenv("MAX_CORPUS_SIZE", 2 * 1024 * 1024 * 1024))
+CORPUS_TOP_FREQUENCIES = 100  # Most frequent characters listed in corpus scan results
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Room for form fields and multipart framing on top of the file limits
+MULTIPART_OVERHEAD = 1024 * 1024
+
+# Reject oversized upload bodies while they arrive (added before CORS so
+# the 413 still carries CORS headers)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        "/api/upload": MAX_FILE_SIZE + MULTIPART_OVERHEAD,
+        "/api/subset-font": MAX_FILE_SIZE + MULTIPART_OVERHEAD,
+        "/api/corpus": MAX_CORPUS_SIZE + MULTIPART_OVERHEAD,
+    }
+)
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -47,17 +129,123 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
-# Initialize services
-font_service = FontService()
-session_manager = SessionManager()
+# Request counts, latencies and per-request Server-Timing headers
+app.add_middleware(MetricsMiddleware)
 
 # Ensure directories exist
 UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "./uploads"))
 OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "./outputs"))
+CACHE_DIR = Path(os.getenv("CACHE_DIR", "./cache"))
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
+
+# Preload font processing modules in the background at startup
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "true").lower() in ("1", "true", "yes")
+
+# Initialize services
+subset_cache = SubsetCache(
+    str(CACHE_DIR / "subsets"),
+    max_bytes=int(os.getenv("SUBSET_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+)
+archive_cache = SubsetCache(
+    str(CACHE_DIR / "archives"),
+    max_bytes=int(os.getenv("ARCHIVE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+)
+glyph_cost_cache = SubsetCache(
+    str(CACHE_DIR / "glyph_costs"),
+    max_bytes=int(os.getenv("GLYPH_COST_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+)
+blob_store = BlobStore(str(UPLOAD_DIR / "_blobs"))
+font_cache = FontCache(max_bytes=int(os.getenv("FONT_CACHE_MAX_BYTES", 256 * 1024 * 1024)))
+font_service = FontService(
+    subset_cache=subset_cache,
+    max_workers=int(os.getenv("FONT_WORKERS", 0)),
+    font_cache=font_cache,
+    brotli_quality=int(os.getenv("WOFF2_BROTLI_QUALITY", 11)),
+    glyph_cost_store=GlyphCostStore(glyph_cost_cache)
+)
+# Session state: "memory" (single worker), "sqlite:///path" or "redis://host:port/db"
+session_store = create_session_store(os.getenv("SESSION_STORE", "memory"))
+session_manager = SessionManager(
+    session_timeout_minutes=int(os.getenv("SESSION_TIMEOUT_MINUTES", 60)),
+    store=session_store
+)
+job_manager = JobManager(store=session_store)
+# CPU-heavy font work admitted at once and allowed to queue, per worker (0 disables)
+admission = AdmissionController(
+    max_concurrent=int(os.getenv("ADMISSION_MAX_CONCURRENT", 2)),
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", 32))
+)
+session_janitor = SessionJanitor(
+    session_manager,
+    blob_store,
+    str(UPLOAD_DIR),
+    str(OUTPUT_DIR),
+    interval_seconds=float(os.getenv("SWEEP_INTERVAL_SECONDS", 300)),
+    disk_quota_bytes=int(os.getenv("DISK_QUOTA_BYTES", 0)),
+    lock_path=str(CACHE_DIR / "janitor.lock")
+)
+
+
+# Opt-in request profiling: requests sending "X-Profile: 1" and the admin token
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+profile_store = None
+if PROFILING_ENABLED:
+    if ADMIN_TOKEN:
+        profile_store = ProfileStore(
+            str(CACHE_DIR / "profiles"),
+            max_count=int(os.getenv("PROFILE_MAX_COUNT", 50))
+        )
+    else:
+        logger.error("PROFILING_ENABLED is set but ADMIN_TOKEN is not; profiling stays disabled")
+app.add_middleware(ProfilingMiddleware, store=profile_store, admin_token=ADMIN_TOKEN)
+
+
+def _collect_metrics() -> List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+    """Metric families for state tracked by other components, read at scrape time"""
+    admission_stats = admission.stats()
+    caches = {
+        "subsets": subset_cache.stats(),
+        "archives": archive_cache.stats(),
+        "glyph_costs": glyph_cost_cache.stats(),
+        "parsed_fonts": font_cache.stats(),
+    }
+    return [
+        ("fontsub_sessions", "gauge", "Sessions in the session store",
+         [({}, len(session_store.list_sessions()))]),
+        ("fontsub_job_queue_depth", "gauge", "Background jobs in this worker not finished yet",
+         [({}, job_manager.queue_depth())]),
+        ("fontsub_admission_active", "gauge", "Font jobs running under admission control",
+         [({}, admission_stats["active"])]),
+        ("fontsub_admission_queue_depth", "gauge", "Font jobs waiting for admission",
+         [({}, admission_stats["queued"])]),
+        ("fontsub_admission_admitted_total", "counter", "Font jobs admitted",
+         [({}, admission_stats["admitted"])]),
+        ("fontsub_admission_rejected_total", "counter", "Font jobs rejected with 503 because the queue was full",
+         [({}, admission_stats["rejected"])]),
+        ("fontsub_cache_hits_total", "counter", "Cache hits",
+         [({"cache": name}, stats["hits"]) for name, stats in caches.items()]),
+        ("fontsub_cache_misses_total", "counter", "Cache misses",
+         [({"cache": name}, stats["misses"]) for name, stats in caches.items()]),
+        ("fontsub_cache_evictions_total", "counter", "Cache evictions",
+         [({"cache": name}, stats["evictions"]) for name, stats in caches.items()]),
+        ("fontsub_cache_bypassed_total", "counter", "Parsed font cache lookups skipped for TTF/OTF sources",
+         [({"cache": "parsed_fonts"}, caches["parsed_fonts"]["bypassed"])]),
+        ("fontsub_cache_bytes", "gauge", "Cache occupancy in bytes",
+         [({"cache": name}, stats["bytes"]) for name, stats in caches.items()]),
+    ]
+
+
+REGISTRY.register_collector(_collect_metrics)
+
+_font_adapter = TypeAdapter(FontMetadata)
+_compact_adapter = TypeAdapter(CompactFontMetadata)
+_axis_limits_adapter = TypeAdapter(Dict[str, Union[float, Tuple[float, float], None]])
 
 
 @app.get("/")
@@ -67,28 +255,156 @@ async def root(request: Request):
     return {"status": "ok", "message": "Font Subsetting API is running"}
 
 
+@app.get("/api/cache/stats")
+@limiter.limit("30/minute")
+async def cache_stats(request: Request):
+    """
+    Get subset cache statistics.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+
+    Returns:
+        Hit/miss counts and occupancy of the subset cache, the zip
+        archive cache, the glyph cost index cache and the parsed font cache,
+        and deduplication stats for stored uploads.
+        With FONT_WORKERS > 1 each worker process keeps its own parsed font
+        cache; the figures here cover this process only.
+    """
+    return {
+        "subsets": subset_cache.stats(),
+        "archives": archive_cache.stats(),
+        "glyph_costs": glyph_cost_cache.stats(),
+        "parsed_fonts": font_cache.stats(),
+        "uploads": await run_in_threadpool(blob_store.stats),
+        "storage": session_janitor.stats()
+    }
+
+
+@app.get("/api/admission/stats")
+@limiter.limit("30/minute")
+async def admission_stats(request: Request):
+    """
+    Get admission control statistics for this worker process.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+
+    Returns:
+        Running and queued font jobs, limits, admitted and rejected counts,
+        queue wait times and the current seconds-per-cost estimate
+    """
+    return admission.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+@limiter.limit("60/minute")
+async def metrics(request: Request):
+    """
+    Prometheus metrics for this worker process.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+
+    Returns:
+        Request counts and latencies by route, pipeline stage durations and
+        byte counts, session count, job queue depth and cache statistics in
+        the Prometheus text format
+    """
+    body = await run_in_threadpool(REGISTRY.render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _require_admin(request: Request) -> ProfileStore:
+    """Check the admin token for profile endpoints (404 while profiling is disabled)"""
+    if profile_store is None:
+        raise HTTPException(status_code=404, detail="Profiling is not enabled")
+    if not check_admin_token(ADMIN_TOKEN, request.headers.get("x-admin-token")):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    return profile_store
+
+
+@app.get("/api/admin/profiles")
+@limiter.limit("30/minute")
+async def list_profiles(request: Request):
+    """
+    List stored request profiles.
+
+    Args:
+        request: FastAPI request object (X-Admin-Token header required)
+
+    Returns:
+        Stored profiles, newest first, with request method, path, status and duration
+    """
+    store = _require_admin(request)
+    return {"profiles": await run_in_threadpool(store.list)}
+
+
+@app.get("/api/admin/profiles/{request_id}")
+@limiter.limit("30/minute")
+async def get_profile(
+    request: Request,
+    request_id: str,
+    format: str = Query("pstats", pattern="^(pstats|text)$", description="pstats file or a text report"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls|ncalls)$", description="Sort key for the text report"),
+    limit: int = Query(50, ge=1, le=1000, description="Functions listed in the text report")
+):
+    """
+    Download a stored request profile.
+
+    Args:
+        request: FastAPI request object (X-Admin-Token header required)
+        request_id: X-Request-ID returned by the profiled request
+        format: "pstats" for the profile file (python -m pstats, snakeviz)
+            or "text" for a report
+        sort: Sort key for the text report
+        limit: Functions listed in the text report
+
+    Returns:
+        Profile file or text report
+    """
+    store = _require_admin(request)
+    prof_path = store.path(request_id)
+    if prof_path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if format == "text":
+        report = await run_in_threadpool(store.summary, request_id, sort, limit)
+        return PlainTextResponse(report)
+    return FileResponse(path=prof_path, filename=prof_path.name, media_type="application/octet-stream")
+
+
 @app.post("/api/upload", response_model=FontMetadata)
 @limiter.limit("10/minute")
 async def upload_font(
     request: Request,
     file: UploadFile = File(...),
-    session_id: Optional[str] = Form(None)
+    session_id: Optional[str] = Form(None),
+    compact: bool = Query(False, description="Return coverage as code point ranges without glyph lists")
 ):
     """
     Upload a font file and extract metadata.
 
+    A font collection is stored but not added to the session: the response
+    lists its members (read from their name, maxp and cmap tables only), and
+    the fonts to work with are picked with /api/collection/select.
+
     Args:
         request: FastAPI request object (for rate limiting)
-        file: Font file (.ttf, .otf, .woff, .woff2)
+        file: Font file (.ttf, .otf, .woff, .woff2) or collection (.ttc, .otc)
         session_id: Optional session ID for tracking
+        compact: Return CompactFontMetadata instead of the full glyph data
 
     Returns:
-        FontMetadata with font information and glyph data
+        FontMetadata with font information and glyph data (served from the
+        pre-serialized payload stored with the session), or a FontCollection
+        for a collection
     """
     try:
         # Validate file type
-        allowed_extensions = {".ttf", ".otf", ".woff", ".woff2"}
-        file_ext = Path(file.filename).suffix.lower()
+        allowed_extensions = {".ttf", ".otf", ".woff", ".woff2", ".ttc", ".otc"}
+        filename = Path(file.filename).name
+        file_ext = Path(filename).suffix.lower()
 
         if file_ext not in allowed_extensions:
             raise HTTPException(
@@ -96,56 +412,264 @@ async def upload_font(
                 detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
             )
 
-        # Create or get session
-        if not session_id:
-            session_id = session_manager.create_session()
-
-        # Save uploaded file
-        session_dir = UPLOAD_DIR / session_id
-        session_dir.mkdir(exist_ok=True)
-
-        file_path = session_dir / file.filename
-
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Exact file size check (the body as a whole is capped while it arrives)
+        if file.size is not None and file.size > MAX_FILE_SIZE:
+            raise _file_too_large()
+
+        # Copy the upload into the blob store, hashing as we go
+        with stage("upload") as timer:
+            digest, temp_path = await _stream_upload(file)
+            timer.nbytes = file_size = temp_path.stat().st_size
+
+        # Parsing the font is the CPU-heavy part (the glyph count is not known
+        # yet). The slot is reserved before the session and the stored font
+        # exist, so a rejected upload leaves nothing behind.
+        members = None
+        try:
+            async with _admit(job_cost(file_size=file_size)):
+                if not session_id:
+                    session_id = await run_in_threadpool(session_manager.create_session)
+
+                session_dir = UPLOAD_DIR / session_id
+                session_dir.mkdir(exist_ok=True)
+                file_path = session_dir / filename
+                await _store_font(temp_path, digest, file_path)
+
+                if is_collection(str(file_path)):
+                    members = await run_in_threadpool(font_service.list_collection_members, str(file_path))
+                else:
+                    metadata = await run_in_threadpool(font_service.extract_metadata, str(file_path))
+        finally:
+            # Already moved into the blob store unless something failed first
+            temp_path.unlink(missing_ok=True)
+
+        if members is not None:
+            collection = FontCollection(
+                session_id=session_id,
+                filename=filename,
+                file_size=file_size,
+                members=members
+            )
+            logger.info(f"Collection uploaded successfully: {filename} ({len(members)} fonts, session: {session_id})")
+            return cached_json_response(request, collection.model_dump_json().encode("utf-8"))
 
-        # Extract font metadata
-        metadata = font_service.extract_metadata(str(file_path))
         metadata.session_id = session_id
         metadata.file_path = str(file_path)
+        metadata.content_hash = digest
+
+        # Serialize once; /api/fonts is served from these bytes
+        payloads = await run_in_threadpool(_serialize_metadata, metadata)
 
         # Add metadata to session
-        session_manager.add_font(session_id, metadata)
+        await run_in_threadpool(session_manager.add_font, session_id, metadata, payloads)
+        _index_glyph_costs_later(metadata)
 
-        logger.info(f"Font uploaded successfully: {file.filename} (session: {session_id})")
+        logger.info(f"Font uploaded successfully: {filename} (session: {session_id})")
 
-        return metadata
+        return cached_json_response(request, payloads["compact" if compact else "full"])
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading font: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _store_font(temp_path: Path, digest: str, file_path: Path):
+    """
+    Move a hashed temp file into the blob store and link it into a session.
+
+    Replacing an existing file releases this session's reference to its old blob.
+
+    Args:
+        temp_path: Temp file from blob_store.temp_path()
+        digest: SHA-256 hex digest of the temp file
+        file_path: Destination in the session's upload directory
+    """
+    file_ext = file_path.suffix.lower()
+    previous_digest = await run_in_threadpool(file_sha256, str(file_path)) if file_path.exists() else None
+
+    await run_in_threadpool(blob_store.add_reference, temp_path, digest, file_ext, file_path)
+    remember_digest(str(file_path), digest)
+
+    if previous_digest and previous_digest != digest:
+        await run_in_threadpool(blob_store.release, previous_digest, file_ext)
+
+
+@app.post("/api/collection/select", response_model=List[FontMetadata])
+@limiter.limit("10/minute")
+async def select_collection_members(
+    request: Request,
+    select_request: CollectionSelectRequest,
+    compact: bool = Query(False, description="Return coverage as code point ranges without glyph lists")
+):
+    """
+    Add fonts from an uploaded collection to the session.
+
+    Each selected member is copied out of the collection as a standalone
+    font (raw tables, nothing is decompiled) and is then handled like an
+    uploaded font, so subsets, exports and slices only touch the selected
+    members.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        select_request: CollectionSelectRequest with session_id, filename and font_numbers
+        compact: Return CompactFontMetadata instead of the full glyph data
+
+    Returns:
+        FontMetadata for each selected font, in the order requested
+    """
+    try:
+        if not await run_in_threadpool(session_manager.get_session, select_request.session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        collection_path = UPLOAD_DIR / select_request.session_id / Path(select_request.filename).name
+        if not collection_path.is_file() or not is_collection(str(collection_path)):
+            raise HTTPException(status_code=404, detail="Collection not found in session")
+
+        # Members of one collection usually share their glyph tables, so each
+        # standalone member is about as large as the collection
+        member_cost = job_cost(file_size=collection_path.stat().st_size)
+
+        payloads = []
+        added = []
+        for font_number in dict.fromkeys(select_request.font_numbers):
+            # Reserved before the member is extracted and stored, so a
+            # rejected request leaves no member file behind
+            async with _admit(member_cost):
+                temp_path = blob_store.temp_path()
+                try:
+                    suffix = await run_in_threadpool(
+                        font_service.extract_collection_member, str(collection_path), font_number, str(temp_path)
+                    )
+                    digest = await run_in_threadpool(file_sha256, str(temp_path))
+                except ValueError as e:
+                    temp_path.unlink(missing_ok=True)
+                    raise HTTPException(status_code=400, detail=str(e))
+                except BaseException:
+                    temp_path.unlink(missing_ok=True)
+                    raise
+
+                file_path = collection_path.with_name(f"{collection_path.stem}-{font_number}{suffix}")
+                await _store_font(temp_path, digest, file_path)
+
+                metadata = await run_in_threadpool(font_service.extract_metadata, str(file_path))
+            metadata.session_id = select_request.session_id
+            metadata.file_path = str(file_path)
+            metadata.content_hash = digest
+            metadata.collection = collection_path.name
+            metadata.font_number = font_number
+
+            font_payloads = await run_in_threadpool(_serialize_metadata, metadata)
+            await run_in_threadpool(session_manager.add_font, select_request.session_id, metadata, font_payloads)
+            added.append(metadata)
+            payloads.append(font_payloads["compact" if compact else "full"])
+
+        # Indexed once every member is in, so index jobs never hold a slot
+        # the next member of this request is waiting for
+        for metadata in added:
+            _index_glyph_costs_later(metadata)
+
+        logger.info(
+            f"Added {len(payloads)} fonts from collection {collection_path.name} "
+            f"(session: {select_request.session_id})"
+        )
+
+        return cached_json_response(request, b"[" + b",".join(payloads) + b"]")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error selecting collection fonts: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _serialize_metadata(metadata: FontMetadata) -> Dict[str, bytes]:
+    """
+    Serialize font metadata in every response variant.
+
+    Args:
+        metadata: Font metadata
+
+    Returns:
+        Dictionary of variant name to JSON bytes
+    """
+    with stage("serialize"):
+        return {
+            "full": _font_adapter.dump_json(metadata),
+            "compact": _compact_adapter.dump_json(font_service.compact_metadata(metadata))
+        }
+
+
+def _file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size: {MAX_FILE_SIZE} bytes"
+    )
+
+
+async def _stream_upload(file: UploadFile) -> Tuple[str, Path]:
+    """
+    Copy a received upload to a temp file in the blob store in chunks.
+
+    Starlette has already spooled the file by the time the endpoint runs
+    (BodySizeLimitMiddleware caps the body while it arrives). The copy is
+    hashed as it is written and checked against the exact MAX_FILE_SIZE.
+
+    Args:
+        file: Uploaded file
+
+    Returns:
+        Tuple of (SHA-256 hex digest, temp file path)
+    """
+    temp_path = blob_store.temp_path()
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise _file_too_large()
+                hasher.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return hasher.hexdigest(), temp_path
+
+
 @app.get("/api/fonts/{session_id}", response_model=List[FontMetadata])
 @limiter.limit("50/minute")
-async def get_fonts(request: Request, session_id: str):
+async def get_fonts(
+    request: Request,
+    session_id: str,
+    compact: bool = Query(False, description="Return coverage as code point ranges without glyph lists")
+):
     """
     Get all fonts in a session.
 
+    Served from JSON serialized once at upload time (and its precompressed
+    variants). Responses carry an ETag; clients sending it back in
+    If-None-Match get a 304 while the session's fonts are unchanged.
+
     Args:
         request: FastAPI request object (for rate limiting)
         session_id: Session ID
+        compact: Return CompactFontMetadata instead of the full glyph data
 
     Returns:
-        List of FontMetadata
+        List of FontMetadata (or CompactFontMetadata)
     """
     try:
-        fonts = session_manager.get_fonts(session_id)
+        payload = await run_in_threadpool(session_manager.get_fonts_payload, session_id, "compact" if compact else "full")
 
-        if not fonts:
+        if not payload:
             raise HTTPException(status_code=404, detail="No fonts found in session")
 
-        return fonts
+        return cached_json_response(request, payload)
 
     except HTTPException:
         raise
@@ -154,6 +678,415 @@ async def get_fonts(request: Request, session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/fonts/{session_id}/{font_index}/glyphs", response_model=GlyphPage)
+@limiter.limit("120/minute")
+async def get_glyphs(
+    request: Request,
+    session_id: str,
+    font_index: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    start: Optional[int] = Query(None, ge=0, description="First code point to include"),
+    end: Optional[int] = Query(None, ge=0, description="Last code point to include")
+):
+    """
+    Get a page of glyph names for one font, ordered by code point.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        session_id: Session ID
+        font_index: Index of the font in the session
+        offset: Number of glyphs to skip
+        limit: Maximum number of glyphs to return
+        start: Optional first code point of the queried range
+        end: Optional last code point of the queried range
+
+    Returns:
+        GlyphPage
+    """
+    try:
+        metadata = await run_in_threadpool(session_manager.get_font_by_index, session_id, font_index)
+
+        if not metadata:
+            raise HTTPException(status_code=404, detail="Font not found in session")
+
+        page = await run_in_threadpool(font_service.glyph_page, metadata, font_index, offset, limit, start, end)
+        return cached_json_response(request, page.model_dump_json().encode("utf-8"))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting glyphs: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _run_subset(
+    subset_request: SubsetRequest,
+    fonts: List[FontMetadata],
+    progress: Optional[ProgressCallback] = None
+) -> Dict:
+    """
+    Generate subsets for the given fonts and record them in the session.
+
+    Runs in a worker thread, either inline for a request or as a background job.
+
+    Args:
+        subset_request: SubsetRequest with session_id, characters, and options
+        fonts: Fonts to subset
+        progress: Optional progress callback
+
+    Returns:
+        Success message with subset info for all fonts
+    """
+    # Create output directory for session
+    output_dir = OUTPUT_DIR / subset_request.session_id
+    output_dir.mkdir(exist_ok=True)
+
+    # Clear previous subset paths and exported files
+    session_manager.clear_subset_paths(subset_request.session_id)
+    session_manager.clear_exported_files(subset_request.session_id)
+
+    # Generate subset for each font (in parallel when FONT_WORKERS > 1)
+    jobs = [
+        {
+            "font_path": metadata.file_path,
+            "characters": subset_request.characters,
+            "output_dir": str(output_dir),
+            "font_name_suffix": subset_request.font_name_suffix,
+            "custom_font_name": subset_request.custom_font_name,
+            "unicode_ranges": subset_request.unicode_ranges,
+            "axis_limits": resolve_axis_limits(subset_request.axis_limits, metadata.axes)
+        }
+        for metadata in fonts
+    ]
+    if progress:
+        progress(0, len(jobs), None)
+
+    subset_paths = []
+    for subset_path in font_service.create_subsets(jobs):
+        subset_paths.append(subset_path)
+        session_manager.add_subset_path(subset_request.session_id, subset_path)
+        if progress:
+            progress(len(subset_paths), len(jobs), Path(subset_path).name)
+
+    logger.info(f"Generated {len(subset_paths)} subsets")
+
+    result = {
+        "status": "success",
+        "message": f"Generated {len(subset_paths)} subsets successfully",
+        "subset_count": len(subset_paths),
+        "character_count": len(subset_request.characters)
+    }
+    if subset_request.collection_output:
+        result["collections"] = _run_subset_collections(subset_request, fonts, output_dir)
+
+    return result
+
+
+def _run_subset_collections(
+    subset_request: SubsetRequest,
+    fonts: List[FontMetadata],
+    output_dir: Path
+) -> List[Dict[str, Union[str, int]]]:
+    """
+    Save the subsets of fonts taken from the same collection as one collection.
+
+    Fonts not taken from a collection are skipped. The collections are
+    recorded as exported files, so they are included in download-all.
+
+    Args:
+        subset_request: SubsetRequest with session_id, characters, and options
+        fonts: Fonts being subset
+        output_dir: Session output directory
+
+    Returns:
+        Description of each subset collection
+    """
+    # Collection filename -> font_number -> font (a member selected twice is included once)
+    members: Dict[str, Dict[int, FontMetadata]] = {}
+    for metadata in fonts:
+        if metadata.collection:
+            members.setdefault(metadata.collection, {})[metadata.font_number] = metadata
+
+    collections = []
+    for collection, by_number in members.items():
+        collection_fonts = [by_number[font_number] for font_number in sorted(by_number)]
+        output_filename = f"{Path(collection).stem}-{subset_request.font_name_suffix}{Path(collection).suffix}"
+        output_path = font_service.create_subset_collection(
+            [metadata.file_path for metadata in collection_fonts],
+            subset_request.characters,
+            str(output_dir / output_filename),
+            subset_request.unicode_ranges,
+            [resolve_axis_limits(subset_request.axis_limits, metadata.axes) for metadata in collection_fonts]
+        )
+        session_manager.add_exported_file(subset_request.session_id, output_path)
+
+        collections.append({
+            "filename": output_filename,
+            "download_name": hashed_filename(output_filename, file_sha256(output_path)),
+            "font_count": len(collection_fonts),
+            "size": os.path.getsize(output_path)
+        })
+
+    return collections
+
+
+def _run_export(
+    export_request: ExportRequest,
+    subset_paths: List[str],
+    progress: Optional[ProgressCallback] = None
+) -> Dict:
+    """
+    Convert the given subsets to the requested formats and record them in the session.
+
+    Runs in a worker thread, either inline for a request or as a background job.
+
+    Args:
+        export_request: ExportRequest with session_id and output formats
+        subset_paths: Subset font paths to convert
+        progress: Optional progress callback
+
+    Returns:
+        Download links for all exported fonts
+    """
+    # Convert each subset to requested formats (in parallel when FONT_WORKERS > 1)
+    jobs = [
+        {
+            "font_path": subset_path,
+            "formats": export_request.formats,
+            "output_dir": str(OUTPUT_DIR / export_request.session_id),
+            "custom_font_name": export_request.font_name
+        }
+        for subset_path in subset_paths
+    ]
+    if progress:
+        progress(0, len(jobs), None)
+
+    all_output_files = []
+    for index, output_files in enumerate(font_service.convert_formats_many(jobs)):
+        all_output_files.extend(output_files)
+
+        # Track exported file paths in session
+        for file_info in output_files:
+            session_manager.add_exported_file(export_request.session_id, file_info["path"])
+
+        if progress:
+            progress(index + 1, len(jobs), Path(subset_paths[index]).name)
+
+    logger.info(f"Exported {len(subset_paths)} fonts to formats: {export_request.formats}")
+
+    return {
+        "status": "success",
+        "message": f"Exported {len(subset_paths)} fonts successfully",
+        "files": all_output_files
+    }
+
+
+def _resolve_slices(slice_request: SliceRequest) -> List[Tuple[str, List[Tuple[int, int]]]]:
+    """
+    Turn preset names and custom slices into (name, code point ranges) pairs.
+
+    Raises:
+        ValueError: On unknown presets, bad names or malformed ranges
+    """
+    slices = []
+    for entry in slice_request.slices or DEFAULT_SLICES:
+        if isinstance(entry, str):
+            if entry not in SLICE_PRESETS:
+                raise ValueError(f"Unknown slice preset: {entry}")
+            name, ranges = entry, parse_unicode_range(SLICE_PRESETS[entry])
+        else:
+            name = entry.name
+            ranges = []
+            for spec in entry.unicode_ranges:
+                ranges.extend(parse_unicode_range(spec))
+            ranges.extend(to_ranges(ord(char) for char in entry.characters))
+            ranges = merge_ranges(ranges)
+
+        if not name or not all(c.isalnum() or c in ('-', '_') for c in name):
+            raise ValueError(f"Invalid slice name: {name!r}")
+        if name in (existing for existing, _ in slices):
+            raise ValueError(f"Duplicate slice name: {name}")
+        slices.append((name, ranges))
+
+    return slices
+
+
+def _run_slice(
+    slice_request: SliceRequest,
+    fonts: List[Tuple[int, FontMetadata]],
+    slices: List[Tuple[str, List[Tuple[int, int]]]],
+    progress: Optional[ProgressCallback] = None
+) -> Dict:
+    """
+    Slice the given fonts, write the stylesheet and record the files in the session.
+
+    Runs in a worker thread, either inline for a request or as a background job.
+
+    Args:
+        slice_request: SliceRequest with session_id and output options
+        fonts: (font index, metadata) pairs to slice
+        slices: Resolved (name, ranges) slices in priority order
+        progress: Optional progress callback
+
+    Returns:
+        Slice files and the generated stylesheet
+    """
+    output_dir = OUTPUT_DIR / slice_request.session_id
+    output_dir.mkdir(exist_ok=True)
+
+    # Slicing replaces any previous export
+    session_manager.clear_exported_files(slice_request.session_id)
+
+    # Assign each covered code point to the first slice that claims it;
+    # slices the font has no glyphs for are skipped
+    jobs = []
+    plan = []
+    for font_index, metadata in fonts:
+        coverage = sorted(ord(char) for char in metadata.character_set)
+        assigned = set()
+        font_slices = []
+        for name, ranges in slices:
+            unicodes = [code_point for code_point in coverage if in_ranges(code_point, ranges)]
+            if unicodes:
+                font_slices.append((name, unicodes))
+                assigned.update(unicodes)
+
+        remainder = [code_point for code_point in coverage if code_point not in assigned]
+        if remainder:
+            chunk_size = slice_request.remainder_chunk_size or len(remainder)
+            chunks = [remainder[i:i + chunk_size] for i in range(0, len(remainder), chunk_size)]
+            for number, chunk in enumerate(chunks, 1):
+                font_slices.append(("other" if len(chunks) == 1 else f"other-{number}", chunk))
+
+        base_name = Path(metadata.file_path).stem
+        for name, unicodes in font_slices:
+            jobs.append({
+                "font_path": metadata.file_path,
+                "unicodes": unicodes,
+                "formats": slice_request.formats,
+                "output_dir": str(output_dir),
+                "base_name": f"{base_name}-{name}"
+            })
+            plan.append((font_index, metadata, name, unicodes))
+
+    if progress:
+        progress(0, len(jobs), None)
+
+    descriptors = {
+        font_index: font_service.font_face_descriptors(metadata.file_path)
+        for font_index, metadata in fonts
+    }
+
+    rules = []
+    slice_info = []
+    for index, output_files in enumerate(font_service.create_slices(jobs)):
+        font_index, metadata, name, unicodes = plan[index]
+        unicode_range = format_unicode_range(to_ranges(unicodes))
+
+        for file_info in output_files:
+            session_manager.add_exported_file(slice_request.session_id, file_info["path"])
+
+        rules.append(font_face_rule(
+            slice_request.font_family or metadata.family_name,
+            [(file_info["filename"], file_info["format"]) for file_info in output_files],
+            unicode_range,
+            display=slice_request.font_display,
+            **descriptors[font_index]
+        ))
+        slice_info.append({
+            "font_index": font_index,
+            "name": name,
+            "unicode_range": unicode_range,
+            "character_count": len(unicodes),
+            "files": output_files
+        })
+
+        if progress:
+            progress(index + 1, len(jobs), f"{Path(metadata.file_path).stem}-{name}")
+
+    # Stylesheet sits next to the slice files, so relative URLs resolve
+    css = "\n\n".join(rules) + "\n"
+    stylesheet = font_service.stylesheet_filename(slice_request.font_family or fonts[0][1].family_name)
+    stylesheet_path = output_dir / stylesheet
+    stylesheet_path.write_text(css, encoding="utf-8")
+    session_manager.add_exported_file(slice_request.session_id, str(stylesheet_path))
+
+    logger.info(f"Generated {len(slice_info)} slices for {len(fonts)} fonts")
+
+    return {
+        "status": "success",
+        "message": f"Generated {len(slice_info)} slices successfully",
+        "slices": slice_info,
+        "stylesheet": stylesheet,
+        "css": css
+    }
+
+
+def _admit(cost: float) -> Ticket:
+    """
+    Reserve an admission slot for CPU-heavy work.
+
+    Args:
+        cost: Estimated job cost (see job_cost)
+
+    Returns:
+        Ticket to enter around the work (or hand to job_manager.submit)
+
+    Raises:
+        HTTPException: 503 with a Retry-After header when the queue is full
+    """
+    try:
+        return admission.reserve(cost)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy processing other fonts. Please retry shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+def _index_glyph_costs_later(metadata: FontMetadata):
+    """
+    Build a new font's glyph cost index in a background job.
+
+    The index reads every glyph, so it is built after the upload has been
+    answered. The job only takes an admission slot that is free right now;
+    when every slot is busy, /api/estimate builds the index on first use
+    instead.
+
+    Args:
+        metadata: Metadata of the stored font
+    """
+    ticket = admission.try_reserve(job_cost(metadata.glyph_count, metadata.file_size))
+    if ticket is None:
+        logger.info(f"Deferred glyph cost index to first estimate: {metadata.file_path}")
+        return
+
+    def build(progress: ProgressCallback):
+        font_service.index_glyph_costs(metadata.file_path, metadata.content_hash)
+
+    job_manager.submit("glyph_cost_index", metadata.session_id, build, admission=ticket)
+
+
+def _fonts_cost(fonts: Iterable[FontMetadata]) -> float:
+    """Total admission cost of processing the given fonts"""
+    return sum(job_cost(metadata.glyph_count, metadata.file_size) for metadata in fonts)
+
+
+def _job_accepted(job_id: str) -> JSONResponse:
+    """Build the 202 response returned when work is queued as a background job"""
+    return JSONResponse(
+        status_code=202,
+        content={
+            "status": "accepted",
+            "job_id": job_id,
+            "status_url": f"/api/jobs/{job_id}",
+            "events_url": f"/api/jobs/{job_id}/events"
+        }
+    )
+
+
 @app.post("/api/subset")
 @limiter.limit("20/minute")
 async def generate_subset(request: Request, subset_request: SubsetRequest):
@@ -165,47 +1098,123 @@ async def generate_subset(request: Request, subset_request: SubsetRequest):
         subset_request: SubsetRequest with session_id, characters, and options
 
     Returns:
-        Success message with subset info for all fonts
+        Success message with subset info for all fonts, or a job ID
+        when async_mode is set
     """
     try:
         # Get all fonts from session
-        fonts = session_manager.get_fonts(subset_request.session_id)
+        fonts = await run_in_threadpool(session_manager.get_fonts, subset_request.session_id)
 
         if not fonts:
             raise HTTPException(status_code=404, detail="No fonts found in session")
 
-        # Create output directory for session
-        output_dir = OUTPUT_DIR / subset_request.session_id
-        output_dir.mkdir(exist_ok=True)
-
-        # Clear previous subset paths and exported files
-        session_manager.clear_subset_paths(subset_request.session_id)
-        session_manager.clear_exported_files(subset_request.session_id)
-
-        # Generate subset for each font
-        subset_paths = []
-        for metadata in fonts:
-            subset_path = font_service.create_subset(
-                font_path=metadata.file_path,
-                characters=subset_request.characters,
-                output_dir=str(output_dir),
-                font_name_suffix=subset_request.font_name_suffix,
-                custom_font_name=subset_request.custom_font_name
+        try:
+            for spec in subset_request.unicode_ranges or []:
+                parse_unicode_range(spec)
+            if subset_request.axis_limits:
+                known_axes = set()
+                for metadata in fonts:
+                    resolve_axis_limits(subset_request.axis_limits, metadata.axes)
+                    known_axes.update(axis.tag for axis in metadata.axes)
+                unknown_axes = sorted(set(subset_request.axis_limits) - known_axes)
+                if unknown_axes:
+                    raise ValueError(f"No font in the session has axes: {', '.join(unknown_axes)}")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        cost = _fonts_cost(fonts)
+        if subset_request.async_mode:
+            job_id = job_manager.submit(
+                "subset",
+                subset_request.session_id,
+                partial(_run_subset, subset_request, fonts),
+                admission=_admit(cost)
             )
-            subset_paths.append(subset_path)
-            session_manager.add_subset_path(subset_request.session_id, subset_path)
+            return _job_accepted(job_id)
 
-        logger.info(f"Generated {len(subset_paths)} subsets")
+        async with _admit(cost):
+            return await run_in_threadpool(_run_subset, subset_request, fonts)
 
-        return {
-            "status": "success",
-            "message": f"Generated {len(subset_paths)} subsets successfully",
-            "subset_count": len(subset_paths),
-            "character_count": len(subset_request.characters)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating subset: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _run_estimate(estimate_request: EstimateRequest, fonts: List[Tuple[int, FontMetadata]]) -> Dict:
+    """
+    Estimate subset sizes for the given fonts.
+
+    Args:
+        estimate_request: EstimateRequest with characters and unicode ranges
+        fonts: (font index, metadata) pairs to estimate
+
+    Returns:
+        Per-font estimates and totals
+    """
+    estimates = []
+    for font_index, metadata in fonts:
+        estimate = font_service.estimate_subset(
+            metadata.file_path,
+            estimate_request.characters,
+            estimate_request.unicode_ranges
+        )
+        estimates.append({
+            "font_index": font_index,
+            "family_name": metadata.family_name,
+            "style_name": metadata.style_name,
+            "original_size": metadata.file_size,
+            **estimate
+        })
+
+    return {
+        "status": "success",
+        "fonts": estimates,
+        "total": {
+            format_type: sum(estimate[format_type] for estimate in estimates)
+            for format_type in ("ttf", "woff", "woff2")
         }
+    }
+
+
+@app.post("/api/estimate")
+@limiter.limit("120/minute")
+async def estimate_subset(request: Request, estimate_request: EstimateRequest):
+    """
+    Estimate subset sizes for a candidate character set without subsetting.
 
+    Sizes come from per-glyph byte costs indexed at upload time, so this is
+    cheap enough to call on every change to the character selection.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        estimate_request: EstimateRequest with session_id, characters and ranges
+
+    Returns:
+        Estimated TTF/WOFF/WOFF2 sizes per font and in total
+    """
+    try:
+        fonts = list(enumerate(await run_in_threadpool(session_manager.get_fonts, estimate_request.session_id)))
+
+        if estimate_request.font_index is not None:
+            fonts = [(index, metadata) for index, metadata in fonts if index == estimate_request.font_index]
+
+        if not fonts:
+            raise HTTPException(status_code=404, detail="No fonts found in session")
+
+        try:
+            for spec in estimate_request.unicode_ranges or []:
+                parse_unicode_range(spec)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return await run_in_threadpool(_run_estimate, estimate_request, fonts)
+
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error generating subset: {str(e)}")
+        logger.error(f"Error estimating subset: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -220,43 +1229,377 @@ async def export_font(request: Request, export_request: ExportRequest):
         export_request: ExportRequest with session_id and output formats
 
     Returns:
-        Download links for all exported fonts
+        Download links for all exported fonts, or a job ID when
+        async_mode is set
     """
     try:
         # Get all subset paths from session
-        subset_paths = session_manager.get_subset_paths(export_request.session_id)
+        subset_paths = await run_in_threadpool(session_manager.get_subset_paths, export_request.session_id)
 
         if not subset_paths:
             raise HTTPException(status_code=404, detail="No subsets found for this session")
 
-        # Convert each subset to requested formats
-        all_output_files = []
-        for subset_path in subset_paths:
-            output_files = font_service.convert_formats(
-                font_path=subset_path,
-                formats=export_request.formats,
-                output_dir=str(OUTPUT_DIR / export_request.session_id),
-                custom_font_name=export_request.font_name
+        # Subsets are converted without re-subsetting; their size sets the cost
+        cost = sum(job_cost(file_size=os.path.getsize(path)) for path in subset_paths if os.path.exists(path))
+        if export_request.async_mode:
+            job_id = job_manager.submit(
+                "export",
+                export_request.session_id,
+                partial(_run_export, export_request, list(subset_paths)),
+                admission=_admit(cost)
             )
-            all_output_files.extend(output_files)
+            return _job_accepted(job_id)
 
-            # Track exported file paths in session
-            for file_info in output_files:
-                session_manager.add_exported_file(export_request.session_id, file_info["path"])
+        async with _admit(cost):
+            return await run_in_threadpool(_run_export, export_request, list(subset_paths))
 
-        logger.info(f"Exported {len(subset_paths)} fonts to formats: {export_request.formats}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error exporting font: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        return {
-            "status": "success",
-            "message": f"Exported {len(subset_paths)} fonts successfully",
-            "files": all_output_files
-        }
 
+@app.post("/api/subset-font")
+@limiter.limit("30/minute")
+async def subset_font_file(
+    request: Request,
+    file: UploadFile = File(...),
+    characters: str = Form("", description="Characters to include in the subset"),
+    formats: str = Form("woff2", description="Comma-separated output formats: ttf, woff, woff2"),
+    unicode_ranges: Optional[str] = Form(None, description="Additional code points in CSS unicode-range syntax"),
+    axis_limits: Optional[str] = Form(None, description="JSON object of variable font axis limits, as in /api/subset"),
+    font_name: Optional[str] = Form(None, description="Output filename without extension")
+):
+    """
+    Subset a font in one call, without a session.
+
+    The font is read, subset and encoded in memory; nothing is written to
+    the upload or output directories. A single format is returned as the
+    font itself, several as a zip.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        file: Font file (.ttf, .otf, .woff, .woff2)
+        characters: Characters to include in the subset
+        formats: Comma-separated output formats
+        unicode_ranges: Additional code points in CSS unicode-range syntax
+        axis_limits: JSON object of axis limits by axis tag
+        font_name: Output filename without extension (defaults to
+            <uploaded name>-Subset)
+
+    Returns:
+        The subset font, or a zip of the requested formats
+    """
+    try:
+        filename = Path(file.filename or "font").name
+        if Path(filename).suffix.lower() not in {".ttf", ".otf", ".woff", ".woff2"}:
+            raise HTTPException(status_code=400, detail="Invalid file type. Allowed: .ttf, .otf, .woff, .woff2")
+
+        if file.size is not None and file.size > MAX_FILE_SIZE:
+            raise _file_too_large()
+
+        try:
+            limits = _axis_limits_adapter.validate_json(axis_limits) if axis_limits else None
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid axis_limits: {e.errors()[0]['msg']}")
+
+        with stage("upload") as timer:
+            data = await _read_upload(file)
+            timer.nbytes = len(data)
+
+        try:
+            async with _admit(job_cost(file_size=len(data))):
+                encoded = await run_in_threadpool(
+                    font_service.subset_bytes,
+                    data,
+                    characters,
+                    formats.split(","),
+                    [unicode_ranges] if unicode_ranges else None,
+                    limits
+                )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        base_name = "".join(c for c in (font_name or f"{Path(filename).stem}-Subset") if c.isalnum() or c in "-_. ")
+        base_name = base_name.strip(". ") or "font"
+
+        if len(encoded) == 1:
+            format_type, body = next(iter(encoded.items()))
+            output_filename = f"{base_name}.{format_type}"
+            media_type = DOWNLOAD_MEDIA_TYPES[f".{format_type}"]
+        else:
+            with stage("zip"):
+                body = zip_bytes({f"{base_name}.{format_type}": font_data for format_type, font_data in encoded.items()})
+            output_filename = f"{base_name}.zip"
+            media_type = "application/zip"
+
+        logger.info(f"Subset {filename} in memory to {', '.join(encoded)} ({len(body)} bytes)")
+
+        return Response(
+            content=body,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{output_filename}"'}
+        )
+
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error exporting font: {str(e)}")
+        logger.error(f"Error subsetting font in memory: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    """
+    Read a received upload into memory in chunks, checking it against the exact MAX_FILE_SIZE.
+
+    Args:
+        file: Uploaded file
+
+    Returns:
+        File contents
+    """
+    data = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        data += chunk
+        if len(data) > MAX_FILE_SIZE:
+            raise _file_too_large()
+    return bytes(data)
+
+
+@app.post("/api/slice")
+@limiter.limit("10/minute")
+async def slice_fonts(request: Request, slice_request: SliceRequest):
+    """
+    Split fonts into unicode-range slices and generate @font-face CSS.
+
+    Each font in the session (or the one selected by font_index) is cut into
+    one subset per slice it has glyphs for, each exported in the requested
+    formats. The stylesheet declares one @font-face rule per slice with a
+    matching unicode-range, so browsers only fetch the slices a page uses.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        slice_request: SliceRequest with session_id, slices and output options
+
+    Returns:
+        Slice files and the generated stylesheet, or a job ID when
+        async_mode is set
+    """
+    try:
+        fonts = list(enumerate(await run_in_threadpool(session_manager.get_fonts, slice_request.session_id)))
+
+        if slice_request.font_index is not None:
+            fonts = [(index, metadata) for index, metadata in fonts if index == slice_request.font_index]
+
+        if not fonts:
+            raise HTTPException(status_code=404, detail="No fonts found in session")
+
+        try:
+            slices = _resolve_slices(slice_request)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if not any(format_type.lower().strip('.') in ("ttf", "woff", "woff2") for format_type in slice_request.formats):
+            raise HTTPException(status_code=400, detail="No supported output formats requested")
+
+        cost = _fonts_cost(metadata for _, metadata in fonts)
+        if slice_request.async_mode:
+            job_id = job_manager.submit(
+                "slice",
+                slice_request.session_id,
+                partial(_run_slice, slice_request, fonts, slices),
+                admission=_admit(cost)
+            )
+            return _job_accepted(job_id)
+
+        async with _admit(cost):
+            return await run_in_threadpool(_run_slice, slice_request, fonts, slices)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error slicing fonts: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _run_corpus_scan(
+    files: List[UploadFile],
+    fonts: List[FontMetadata],
+    min_count: int,
+    max_characters: Optional[int],
+    subset_request: Optional[SubsetRequest]
+) -> Dict:
+    """
+    Scan uploaded corpus files and optionally subset the session's fonts to the result.
+
+    Runs in a worker thread.
+
+    Args:
+        files: Uploaded text, HTML, JSON or archive files
+        fonts: Session fonts to report coverage for (and subset)
+        min_count: Minimum occurrences for a character to be selected
+        max_characters: Keep only this many of the most frequent characters
+        subset_request: Subset to generate from the selected characters
+            (characters are filled in here), or None
+
+    Returns:
+        Selected characters, scan statistics, top frequencies, per-font
+        coverage and the subset result if one was requested
+    """
+    scanner = CorpusScanner()
+    with stage("corpus_scan") as timer:
+        for file in files:
+            scanner.scan_stream(file.file, Path(file.filename).name)
+        timer.nbytes = scanner.bytes_scanned
+
+    characters = scanner.select(min_count=min_count, max_characters=max_characters)
+    logger.info(f"Scanned corpus: {scanner.stats()} -> {len(characters)} characters")
+
+    result = {
+        "status": "success",
+        "characters": characters,
+        "character_count": len(characters),
+        **scanner.stats(),
+        "frequencies": scanner.frequencies(CORPUS_TOP_FREQUENCIES),
+        "coverage": [
+            {
+                "font_index": index,
+                "full_name": metadata.full_name,
+                **scanner.coverage(characters, set(metadata.character_set))
+            }
+            for index, metadata in enumerate(fonts)
+        ],
+    }
+
+    if subset_request is not None and characters:
+        subset_request.characters = characters
+        result["subset"] = _run_subset(subset_request, fonts)
+
+    return result
+
+
+@app.post("/api/corpus")
+@limiter.limit("10/minute")
+async def scan_corpus(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    session_id: Optional[str] = Form(None),
+    min_count: int = Form(1, ge=1),
+    max_characters: Optional[int] = Form(None, ge=1),
+    create_subset: bool = Form(False),
+    font_name_suffix: str = Form("Subset")
+):
+    """
+    Build a character set from the text a site actually uses.
+
+    Accepts text, HTML and JSON files or zip/tar archives of them (e.g. a
+    built site). Files are scanned in chunks into a code point frequency
+    table, so large corpora are handled in bounded memory. Characters
+    occurring fewer than min_count times are dropped. Coverage is reported
+    against every font in the session, and with create_subset the fonts are
+    subset to the selected characters as /api/subset would.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        files: Corpus files
+        session_id: Session whose fonts to report coverage for and subset
+        min_count: Minimum occurrences for a character to be selected
+        max_characters: Keep only this many of the most frequent characters
+        create_subset: Subset the session's fonts to the selected characters
+        font_name_suffix: Suffix for the subset filenames
+
+    Returns:
+        Selected characters, frequencies, per-font coverage and, with
+        create_subset, the subset result
+    """
+    try:
+        if not any(corpus_kind(Path(file.filename).name) for file in files):
+            raise HTTPException(
+                status_code=400,
+                detail="No supported files. Upload text, HTML or JSON files, or a zip/tar archive of them"
+            )
+
+        if sum(file.size or 0 for file in files) > MAX_CORPUS_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Corpus too large. Maximum size: {MAX_CORPUS_SIZE} bytes"
+            )
+
+        fonts = await run_in_threadpool(session_manager.get_fonts, session_id) if session_id else []
+
+        subset_request = None
+        if create_subset:
+            if not fonts:
+                raise HTTPException(status_code=404, detail="No fonts found in session")
+            subset_request = SubsetRequest(session_id=session_id, characters="", font_name_suffix=font_name_suffix)
+
+        cost = job_cost(file_size=sum(file.size or 0 for file in files))
+        if subset_request:
+            cost += _fonts_cost(fonts)
+        async with _admit(cost):
+            return await run_in_threadpool(
+                _run_corpus_scan, files, fonts, min_count, max_characters, subset_request
+            )
+
+    except HTTPException:
+        raise
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid archive: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error scanning corpus: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/jobs/{job_id}")
+@limiter.limit("120/minute")
+async def get_job(request: Request, job_id: str):
+    """
+    Get the status, progress and result of a background job.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        job_id: Job ID
+
+    Returns:
+        Job state
+    """
+    job = await run_in_threadpool(job_manager.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/api/jobs/{job_id}/events")
+@limiter.limit("30/minute")
+async def job_events(request: Request, job_id: str):
+    """
+    Stream background job progress as Server-Sent Events.
+
+    Emits a "progress" event on every update and a final "completed" or
+    "failed" event carrying the result or error.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        job_id: Job ID
+
+    Returns:
+        text/event-stream response
+    """
+    if not await run_in_threadpool(job_manager.get_job, job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream():
+        async for job in job_manager.events(job_id):
+            event = job["status"] if job["status"] in ("completed", "failed") else "progress"
+            yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 @app.get("/api/download-all/{session_id}")
 @limiter.limit("30/minute")
@@ -271,63 +1614,134 @@ async def download_all_fonts(request: Request, session_id: str):
     """
     try:
         # Get all exported file paths from session (converted formats)
-        exported_files = session_manager.get_exported_files(session_id)
+        exported_files = await run_in_threadpool(session_manager.get_exported_files, session_id)
 
         # If no exported files, fall back to subset paths (original format)
         if not exported_files:
-            exported_files = session_manager.get_subset_paths(session_id)
+            exported_files = await run_in_threadpool(session_manager.get_subset_paths, session_id)
 
         if not exported_files:
             raise HTTPException(status_code=404, detail="No fonts found for this session. Please generate and export fonts first.")
 
         # Get font metadata to use for zip filename
-        fonts = session_manager.get_fonts(session_id)
+        fonts = await run_in_threadpool(session_manager.get_fonts, session_id)
         font_name = None
         if fonts and len(fonts) > 0:
             # Use the first font's family name for the zip file
             font_name = fonts[0].family_name
 
-        # Create a zip archive of all exported fonts
-        zip_path = font_service.create_zip_archive(exported_files, session_id, font_name)
-        if not zip_path:
-            raise HTTPException(status_code=500, detail="Could not create zip archive")
+        zip_filename = font_service.archive_filename(font_name)
+        content_disposition = f'attachment; filename="{zip_filename}"'
 
-        return FileResponse(
-            path=zip_path,
-            filename=Path(zip_path).name,
-            media_type="application/zip"
+        # The same member set always produces the same archive
+        members = await run_in_threadpool(_archive_members, exported_files)
+        if not members:
+            raise HTTPException(status_code=404, detail="No fonts found for this session. Please generate and export fonts first.")
+        cache_key = SubsetCache.make_key(kind="zip", members=members)
+
+        cached_path = await run_in_threadpool(archive_cache.lookup, cache_key)
+        if cached_path:
+            return FileResponse(
+                path=cached_path,
+                filename=zip_filename,
+                media_type="application/zip"
+            )
+
+        return StreamingResponse(
+            _stream_archive([path for path, _, _ in members], cache_key),
+            media_type="application/zip",
+            headers={"Content-Disposition": content_disposition}
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating zip archive: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _archive_members(file_paths: List[str]) -> List[Tuple[str, str, str]]:
+    """List the files that go into a zip as (path, name, content hash)"""
+    with stage("hash"):
+        return [
+            (file_path, Path(file_path).name, file_sha256(file_path))
+            for file_path in file_paths
+            if Path(file_path).is_file()
+        ]
+
+
+def _stream_archive(file_paths: List[str], cache_key: str):
+    """
+    Stream a zip to the client while teeing it into the archive cache.
+
+    The cached copy is only kept if the whole archive was produced, so an
+    aborted download never leaves a truncated entry behind.
+    """
+    tmp_path = archive_cache.temp_path()
+    try:
+        with open(tmp_path, "wb") as tee:
+            for chunk in stream_zip(file_paths):
+                tee.write(chunk)
+                yield chunk
+        archive_cache.store(cache_key, tmp_path, move=True)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 @app.get("/api/download/{session_id}/{filename}")
 @limiter.limit("50/minute")
 async def download_font(request: Request, session_id: str, filename: str):
     """
     Download an exported font file.
 
+    Files can be requested by their plain name or by the content-hashed
+    download_name given in export and slice results. A hashed name always
+    refers to the same bytes, so it is served as immutable and 404s once
+    the file has been regenerated with different content; plain names must
+    be revalidated. Both carry a strong ETag (304 on If-None-Match) and
+    support Range requests.
+
     Args:
         request: FastAPI request object (for rate limiting)
         session_id: Session ID
-        filename: Font filename to download
+        filename: Font filename or content-hashed download name
 
     Returns:
         File download
     """
     try:
-        file_path = OUTPUT_DIR / session_id / filename
+        session_dir = OUTPUT_DIR / session_id
+        file_path = session_dir / filename
+        expected_hash = None
 
-        if not file_path.exists():
+        hashed = split_hashed_filename(filename)
+        if hashed and not file_path.is_file():
+            file_path = session_dir / hashed[0]
+            expected_hash = hashed[1]
+
+        if not file_path.is_file() or file_path.resolve().parent.parent != OUTPUT_DIR.resolve():
             raise HTTPException(status_code=404, detail="File not found")
 
+        digest = await run_in_threadpool(file_sha256, str(file_path))
+        if expected_hash and not digest.startswith(expected_hash):
+            raise HTTPException(status_code=404, detail="File has changed since this link was issued")
+
+        headers = {
+            "ETag": f'"{digest[:32]}"',
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if expected_hash else "no-cache"
+        }
+        if etag_matches(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
         return FileResponse(
             path=str(file_path),
-            filename=filename,
-            media_type="application/octet-stream"
+            filename=file_path.name,
+            media_type=DOWNLOAD_MEDIA_TYPES.get(file_path.suffix.lower(), "application/octet-stream"),
+            headers=headers
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error downloading font: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -335,30 +1749,27 @@ async def download_font(request: Request, session_id: str, filename: str):
 
 @app.delete("/api/session/{session_id}")
 @limiter.limit("20/minute")
-async def cleanup_session(request: Request, session_id: str):
+async def cleanup_session(request: Request, session_id: str, background_tasks: BackgroundTasks):
     """
     Clean up session data and temporary files.
 
+    The session's directories are moved aside immediately and deleted after
+    the response is sent.
+
     Args:
         request: FastAPI request object (for rate limiting)
         session_id: Session ID to clean up
+        background_tasks: Runs the file deletion after the response
 
     Returns:
         Success message
     """
     try:
-        # Clean up files
-        session_upload_dir = UPLOAD_DIR / session_id
-        session_output_dir = OUTPUT_DIR / session_id
-
-        if session_upload_dir.exists():
-            shutil.rmtree(session_upload_dir)
-
-        if session_output_dir.exists():
-            shutil.rmtree(session_output_dir)
+        # Drop session data and move its files to the trash
+        blob_refs = await run_in_threadpool(session_janitor.remove_session, session_id)
 
-        # Remove session data
-        session_manager.cleanup_session(session_id)
+        # Delete files and release blobs no other session references
+        background_tasks.add_task(session_janitor.purge, blob_refs)
 
         logger.info(f"Session cleaned up: {session_id}")
 
@@ -2,7 +2,7 @@
 Pydantic models for font-related data structures.
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Union
 
 
 class GlyphInfo(BaseModel):
@@ -12,10 +12,20 @@ class GlyphInfo(BaseModel):
     character: Optional[str] = None
 
 
+class AxisInfo(BaseModel):
+    """A variation axis of a variable font"""
+    tag: str
+    name: Optional[str] = None
+    min_value: float
+    default_value: float
+    max_value: float
+
+
 class FontMetadata(BaseModel):
     """Metadata extracted from a font file"""
     session_id: Optional[str] = None
     file_path: Optional[str] = None
+    content_hash: Optional[str] = None
     family_name: str
     style_name: str
     full_name: str
@@ -25,8 +35,70 @@ class FontMetadata(BaseModel):
     glyph_count: int
     character_set: List[str] = Field(default_factory=list)
     glyphs: List[GlyphInfo] = Field(default_factory=list)
+    axes: List[AxisInfo] = Field(default_factory=list, description="Variation axes (empty for static fonts)")
     file_size: int
     format: str
+    collection: Optional[str] = Field(default=None, description="Filename of the collection this font was taken from")
+    font_number: Optional[int] = Field(default=None, description="Index of the font within its collection")
+
+
+class CompactFontMetadata(BaseModel):
+    """Font metadata with coverage sent as code point ranges instead of per-glyph lists"""
+    session_id: Optional[str] = None
+    file_path: Optional[str] = None
+    content_hash: Optional[str] = None
+    family_name: str
+    style_name: str
+    full_name: str
+    version: Optional[str] = None
+    designer: Optional[str] = None
+    description: Optional[str] = None
+    glyph_count: int
+    character_count: int
+    codepoint_ranges: List[Tuple[int, int]] = Field(
+        default_factory=list,
+        description="Sorted, inclusive [start, end] code point ranges covered by the cmap"
+    )
+    axes: List[AxisInfo] = Field(default_factory=list, description="Variation axes (empty for static fonts)")
+    file_size: int
+    format: str
+    collection: Optional[str] = Field(default=None, description="Filename of the collection this font was taken from")
+    font_number: Optional[int] = Field(default=None, description="Index of the font within its collection")
+
+
+class CollectionMember(BaseModel):
+    """A font inside a font collection (.ttc/.otc)"""
+    font_number: int
+    family_name: str
+    style_name: str
+    full_name: str
+    glyph_count: int
+    character_count: int
+    format: str = Field(..., description="Format of the font once taken out of the collection (.ttf or .otf)")
+
+
+class FontCollection(BaseModel):
+    """An uploaded font collection, listed member by member"""
+    session_id: str
+    filename: str
+    file_size: int
+    members: List[CollectionMember] = Field(default_factory=list)
+
+
+class CollectionSelectRequest(BaseModel):
+    """Request to add fonts from an uploaded collection to the session"""
+    session_id: str
+    filename: str = Field(..., description="Collection filename as returned by the upload")
+    font_numbers: List[int] = Field(..., min_length=1, description="Members to add, by font_number")
+
+
+class GlyphPage(BaseModel):
+    """A page of glyph information for one font, ordered by code point"""
+    font_index: int
+    offset: int
+    limit: int
+    total: int
+    glyphs: List[GlyphInfo] = Field(default_factory=list)
 
 
 class SubsetRequest(BaseModel):
@@ -35,7 +107,57 @@ class SubsetRequest(BaseModel):
     characters: str = Field(..., description="Characters to include in subset")
     font_name_suffix: Optional[str] = Field(default="Subset", description="Suffix to add to font name")
     custom_font_name: Optional[str] = Field(default=None, description="Custom font filename (without extension)")
-    unicode_ranges: Optional[List[str]] = Field(default=None, description="Unicode ranges to include")
+    unicode_ranges: Optional[List[str]] = Field(
+        default=None,
+        description="Unicode ranges to include in addition to characters, in CSS unicode-range syntax (e.g. U+0000-00FF)"
+    )
+    axis_limits: Optional[Dict[str, Union[float, Tuple[float, float], None]]] = Field(
+        default=None,
+        description="Variable font axes to instance before subsetting, by axis tag: a number pins the axis, "
+                    "a [min, max] pair narrows it and null pins it at its default"
+    )
+    collection_output: bool = Field(
+        default=False,
+        description="Also save the subsets of fonts taken from the same collection as one collection sharing tables"
+    )
+    async_mode: bool = Field(default=False, description="Run as a background job and return a job ID immediately")
+
+
+class EstimateRequest(BaseModel):
+    """Request to estimate subset sizes without creating a subset"""
+    session_id: str
+    characters: str = Field(default="", description="Characters to include in subset")
+    unicode_ranges: Optional[List[str]] = Field(
+        default=None,
+        description="Unicode ranges to include in addition to characters, in CSS unicode-range syntax (e.g. U+0000-00FF)"
+    )
+    font_index: Optional[int] = Field(default=None, description="Estimate only this font (default: all fonts in the session)")
+
+
+class UnicodeSlice(BaseModel):
+    """A named slice of code points for unicode-range splitting"""
+    name: str = Field(..., description="Slice name, used in output filenames")
+    unicode_ranges: List[str] = Field(default_factory=list, description="Ranges in CSS unicode-range syntax")
+    characters: str = Field(default="", description="Additional characters (e.g. a frequency tier)")
+
+
+class SliceRequest(BaseModel):
+    """Request to split fonts into unicode-range slices with @font-face CSS"""
+    session_id: str
+    slices: Optional[List[Union[str, UnicodeSlice]]] = Field(
+        default=None,
+        description="Preset slice names or custom slices, in priority order; defaults to the standard script slices"
+    )
+    remainder_chunk_size: int = Field(
+        default=0,
+        ge=0,
+        description="Split code points not covered by any slice into slices of at most this many code points (0 = one slice)"
+    )
+    formats: List[str] = Field(default_factory=lambda: ["woff2"], description="Output formats: ttf, woff, woff2")
+    font_index: Optional[int] = Field(default=None, description="Slice only this font (default: all fonts in the session)")
+    font_family: Optional[str] = Field(default=None, description="font-family for the generated CSS (default: the font's family name)")
+    font_display: str = Field(default="swap", description="font-display descriptor for the generated CSS")
+    async_mode: bool = Field(default=False, description="Run as a background job and return a job ID immediately")
 
 
 class ExportRequest(BaseModel):
@@ -43,6 +165,7 @@ class ExportRequest(BaseModel):
     session_id: str
     formats: List[str] = Field(..., description="Output formats: ttf, woff, woff2")
     font_name: Optional[str] = Field(default=None, description="Custom font name")
+    async_mode: bool = Field(default=False, description="Run as a background job and return a job ID immediately")
 
 
 class SubsetResponse(BaseModel):
@@ -1,25 +1,696 @@
 """
 Font service for font manipulation using fontTools.
 """
-from fontTools.ttLib import TTFont
-from fontTools import subset
+import fontTools
+from fontTools.ttLib import TTFont, TTLibError, getTableClass, woff2
 from pathlib import Path
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import contextlib
+from contextvars import ContextVar, copy_context
+from io import BytesIO
+import hashlib
+import json
+import multiprocessing
 import os
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 import logging
 
 import zipfile
-from app.models.font_models import FontMetadata, GlyphInfo
+from app.models.font_models import AxisInfo, CollectionMember, CompactFontMetadata, FontMetadata, GlyphInfo, GlyphPage
+from app.utils.font_cache import FontCache
+from app.utils.glyph_cost import GlyphCostIndex, GlyphCostStore
+from app.utils.hashing import file_sha256, hashed_filename
+from app.utils.metrics import stage
+from app.utils.profiling import call_with_profile, profiled_call, profiling_active, unwrap_result
+from app.utils.subset_cache import SubsetCache
+from app.utils.unicode_ranges import requested_ranges, select_code_points, to_ranges
+from app.utils.zip_stream import member_compression
+
+if TYPE_CHECKING:
+    from fontTools import subset
 
 logger = logging.getLogger(__name__)
 
+# fontTools.subset and the instancer are imported on first use (they take
+# longer to import than the rest of the app); warm_up() preloads them
+
+# Subsetter options (matching fonttools best practices)
+SUBSET_OPTIONS = {
+    "name_IDs": ['*'],
+    "name_legacy": True,
+    "name_languages": ['*'],
+    "layout_features": ['*'],  # Keep all layout features
+    "no_hinting": True,  # Remove hinting for smaller file size
+    "glyph_names": True,  # Keep glyph names
+    "symbol_cmap": True,  # Keep symbol cmap
+    "legacy_cmap": True,  # Keep legacy cmap
+    "notdef_glyph": True,  # Keep .notdef glyph
+    "notdef_outline": True,  # Keep .notdef outline
+    "recommended_glyphs": True,  # Keep recommended glyphs
+}
+EXTRA_DROP_TABLES = ['GSUB', 'GPOS']  # Drop complex layout tables
+
+
+def build_subset_options() -> "subset.Options":
+    """
+    Build the subsetter options used for every subset.
+
+    Returns:
+        Configured fontTools subset Options
+    """
+    from fontTools import subset
+
+    options = subset.Options()
+    for name, value in SUBSET_OPTIONS.items():
+        setattr(options, name, value)
+    options.drop_tables += EXTRA_DROP_TABLES
+    return options
+
+
+# Subsetter.subset() has no hooks for timing its stages, so _run_subsetter
+# calls the private stages it is made of. That sequence was checked against
+# fontTools 4.55-4.66; other releases run the public subset() instead and
+# report closure as part of the "subset" stage.
+_STAGED_SUBSETTER = (4, 55) <= tuple(int(part) for part in fontTools.version.split(".")[:2]) < (4, 67)
+
+
+def subset_options_fingerprint() -> Dict:
+    """
+    Get a stable, serializable view of the subsetter options for cache keys.
+
+    Returns:
+        Dictionary of option names to values
+    """
+    return {name: value for name, value in sorted(vars(build_subset_options()).items())}
+
+
+def sniff_flavor(font_path: str) -> Optional[str]:
+    """
+    Detect the container flavor of a font file from its signature.
+
+    Args:
+        font_path: Path to the font file
+
+    Returns:
+        "woff", "woff2" or None for plain sfnt
+    """
+    with open(font_path, "rb") as f:
+        signature = f.read(4)
+    if signature == b"wOFF":
+        return "woff"
+    if signature == b"wOF2":
+        return "woff2"
+    return None
+
+
+def is_collection(font_path: str) -> bool:
+    """
+    Check whether a file is a font collection (.ttc/.otc) from its signature.
+
+    Args:
+        font_path: Path to the font file
+
+    Returns:
+        True for a TrueType/OpenType collection
+    """
+    with open(font_path, "rb") as f:
+        return f.read(4) == b"ttcf"
+
+
+# Axis tag -> pinned value, (min, max) range, or None for the default
+AxisLimits = Dict[str, Union[float, Tuple[float, float], None]]
+
+
+def resolve_axis_limits(axis_limits: Optional[AxisLimits], axes: List[AxisInfo]) -> Optional[AxisLimits]:
+    """
+    Select and validate the axis limits that apply to one font.
+
+    Limits for axes the font does not have are left out, so one request can
+    instance a mix of variable and static fonts.
+
+    Args:
+        axis_limits: Requested limits by axis tag
+        axes: The font's variation axes
+
+    Returns:
+        Limits for the font's own axes, or None if none apply
+
+    Raises:
+        ValueError: If a limit lies outside the axis range or a range is inverted
+    """
+    if not axis_limits or not axes:
+        return None
+
+    resolved: AxisLimits = {}
+    for axis in axes:
+        if axis.tag not in axis_limits:
+            continue
+        limit = axis_limits[axis.tag]
+        if limit is None:
+            values = []
+        elif isinstance(limit, (tuple, list)):
+            values = list(limit)
+        else:
+            values = [limit]
+        for value in values:
+            if not axis.min_value <= value <= axis.max_value:
+                raise ValueError(
+                    f"Value {value:g} for axis '{axis.tag}' is outside "
+                    f"{axis.min_value:g}-{axis.max_value:g}"
+                )
+        if len(values) == 2 and values[0] > values[1]:
+            raise ValueError(f"Invalid range for axis '{axis.tag}': {values[0]:g} > {values[1]:g}")
+        resolved[axis.tag] = tuple(values) if len(values) == 2 else limit
+    return resolved or None
+
+
+def _axis_location_key(axis_limits: AxisLimits) -> str:
+    """Canonical string form of axis limits, for cache keys"""
+    return json.dumps(
+        {tag: list(limit) if isinstance(limit, (tuple, list)) else limit for tag, limit in axis_limits.items()},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+
+
+def _instantiate(font: TTFont, axis_limits: AxisLimits) -> TTFont:
+    """Pin or narrow a variable font's axes in place; static fonts are returned unchanged"""
+    if "fvar" in font:
+        from fontTools.varLib import instancer
+
+        instancer.instantiateVariableFont(font, axis_limits, inplace=True)
+    return font
+
+
+# Per-process parsed font cache used inside pool workers
+_worker_font_cache: Optional[FontCache] = None
+
+
+def _init_worker(font_cache_max_bytes: int):
+    """Pool initializer: give each worker process its own parsed font cache and warm it up"""
+    global _worker_font_cache
+    if font_cache_max_bytes > 0:
+        _worker_font_cache = FontCache(max_bytes=font_cache_max_bytes)
+    _preload_modules()
+
+
+# Table modules fontTools loads on first use, preloaded by _preload_modules
+WARM_UP_TABLES = [
+    "head", "hhea", "hmtx", "maxp", "name", "OS/2", "post", "cmap", "glyf", "loca",
+    "CFF ", "CFF2", "VORG", "GDEF", "GSUB", "GPOS", "BASE", "JSTF", "MATH", "kern",
+    "fvar", "avar", "gvar", "HVAR", "VVAR", "MVAR", "STAT", "cvar", "vhea", "vmtx",
+    "cvt ", "fpgm", "prep", "gasp", "hdmx", "LTSH", "VDMX", "COLR", "CPAL", "SVG ",
+    "sbix", "CBDT", "CBLC", "EBDT", "EBLC", "DSIG", "meta",
+]
+
+
+def _preload_modules():
+    """
+    Import the modules font jobs would otherwise load on first use.
+
+    That is the subsetter, the instancer and the per-table modules fontTools
+    imports lazily; together they make up most of a cold first job. Running
+    a sample font through the pipeline as well was measured to add time
+    without making the first job any faster.
+    """
+    from fontTools import subset  # noqa: F401
+    from fontTools.varLib import instancer  # noqa: F401
+
+    for tag in WARM_UP_TABLES:
+        getTableClass(tag)
+
+
+# Output format -> sfnt flavor
+FORMAT_FLAVORS = {"ttf": None, "woff": "woff", "woff2": "woff2"}
+
+# fontTools' default WOFF2 Brotli quality
+DEFAULT_BROTLI_QUALITY = 11
+
+# fontTools has no WOFF2 quality setting: WOFF2Writer calls the module-level
+# woff2.brotli.compress() without one (checked against fontTools 4.55-4.66).
+# While an encode at another quality runs, that module is swapped for
+# _BrotliWithQuality, which only passes a quality for callers inside
+# _woff2_brotli_quality; other WOFF2 writers meanwhile get the plain call.
+_brotli_quality: ContextVar[Optional[int]] = ContextVar("woff2_brotli_quality", default=None)
+_brotli_patch_lock = threading.Lock()
+_brotli_patch_users = 0
+
+
+class _BrotliWithQuality:
+    """Stand-in for the brotli module used by fontTools' WOFF2 writer"""
+
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def compress(self, data, **kwargs):
+        quality = _brotli_quality.get()
+        if quality is not None:
+            kwargs.setdefault("quality", quality)
+        return self._module.compress(data, **kwargs)
+
+
+@contextlib.contextmanager
+def _woff2_brotli_quality(quality: int) -> Iterator[None]:
+    """Make WOFF2 encodes in the current context use the given Brotli quality"""
+    global _brotli_patch_users
+
+    if quality == DEFAULT_BROTLI_QUALITY:
+        yield
+        return
+    if not woff2.haveBrotli or not hasattr(woff2.brotli, "compress"):
+        logger.warning("fontTools' WOFF2 writer has no brotli module to wrap; using the default quality")
+        yield
+        return
+
+    with _brotli_patch_lock:
+        if _brotli_patch_users == 0:
+            woff2.brotli = _BrotliWithQuality(woff2.brotli)
+        _brotli_patch_users += 1
+    token = _brotli_quality.set(quality)
+    try:
+        yield
+    finally:
+        _brotli_quality.reset(token)
+        with _brotli_patch_lock:
+            _brotli_patch_users -= 1
+            if _brotli_patch_users == 0:
+                woff2.brotli = woff2.brotli._module
+
+
+def _resolve_unicodes(font: TTFont, ranges: List[Tuple[int, int]]) -> List[int]:
+    """
+    Resolve requested ranges to the code points the subsetter can act on.
+
+    These are the code points in the font's cmap (including variation
+    selectors and their bases) plus their bidi mirrors, which the subsetter's
+    bidi closure reaches. Anything else would only be reported missing, so
+    the ranges never need expanding beyond what the font maps.
+    """
+    from fontTools.unicodedata import mirrored
+
+    candidates = set()
+    for table in font["cmap"].tables if "cmap" in font else []:
+        if table.format == 14:
+            for selector, records in table.uvsDict.items():
+                candidates.add(selector)
+                candidates.update(code_point for code_point, _ in records)
+        else:
+            candidates.update(table.cmap)
+    candidates.update(filter(None, (mirrored(code_point) for code_point in list(candidates))))
+    return select_code_points(ranges, candidates)
+
+
+def _close_glyphs(
+    font: TTFont,
+    unicodes: List[int],
+    glyphs: Optional[Iterable[str]] = None
+) -> Optional["subset.Subsetter"]:
+    """
+    Run the first half of Subsetter.subset(): prune the font and close over its glyphs.
+
+    Only available on the fontTools releases the private stages were checked
+    against (see _STAGED_SUBSETTER).
+
+    Returns:
+        Subsetter holding the retained glyphs (glyphs_retained), or None if
+        the stages are not available and nothing was done
+    """
+    from fontTools import subset
+
+    if not _STAGED_SUBSETTER:
+        return None
+
+    subsetter = subset.Subsetter(options=build_subset_options())
+    subsetter.populate(glyphs=glyphs or [], unicodes=unicodes)
+    with stage("closure"):
+        subsetter._prune_pre_subset(font)
+        subsetter._closure_glyphs(font)
+    return subsetter
+
+
+def _run_subsetter(font: TTFont, unicodes: List[int], glyphs: Optional[Iterable[str]] = None):
+    """
+    Subset a font in place, timing glyph closure and table subsetting separately.
+
+    Tables are decompiled lazily, so parsing the tables involved is counted
+    in the stage that first touches them.
+    """
+    from fontTools import subset
+
+    subsetter = _close_glyphs(font, unicodes, glyphs)
+    if subsetter is None:
+        subsetter = subset.Subsetter(options=build_subset_options())
+        subsetter.populate(glyphs=glyphs or [], unicodes=unicodes)
+        with stage("subset"):
+            subsetter.subset(font)
+        return
+
+    with stage("subset"):
+        subsetter._subset_glyphs(font)
+        subsetter._prune_post_subset(font)
+
+
+def _subset_font_file(
+    font_path: str,
+    ranges: List[Tuple[int, int]],
+    output_path: str,
+    font_hash: Optional[str] = None,
+    font_cache: Optional[FontCache] = None,
+    axis_limits: Optional[AxisLimits] = None
+) -> str:
+    """
+    Subset a font file and save the result.
+
+    Kept at module level so it can run in a worker process.
+
+    Args:
+        font_path: Path to the original font file
+        ranges: Code point ranges to keep
+        output_path: Where to save the subset font
+        font_hash: Content hash of the font file (parsed font cache key)
+        font_cache: Parsed font cache; defaults to the worker's own cache
+        axis_limits: Variable font axes to pin or narrow before subsetting
+
+    Returns:
+        Path to the subset font file
+    """
+    font_cache = font_cache or _worker_font_cache
+
+    # Load font (a private copy when served from the parsed font cache)
+    with stage("load"):
+        if font_cache and font_hash:
+            if axis_limits:
+                # Instancing costs more than subsetting; reuse the instance across
+                # subsets of the same location
+                font = font_cache.open_derived(
+                    f"{font_hash}@{_axis_location_key(axis_limits)}",
+                    lambda: _instantiate(font_cache.open(font_hash, font_path), axis_limits)
+                )
+            else:
+                font = font_cache.open(font_hash, font_path)
+        else:
+            font = TTFont(font_path)
+            if axis_limits:
+                _instantiate(font, axis_limits)
+
+    # Subset the font
+    _run_subsetter(font, _resolve_unicodes(font, ranges))
+
+    # Save subset font
+    with stage("compile") as timer:
+        font.save(output_path)
+        timer.nbytes = os.path.getsize(output_path)
+    font.close()
+
+    return output_path
+
+
+def _wrap_sfnt(sfnt: bytes, flavor: str, brotli_quality: int) -> bytes:
+    """
+    Wrap compiled sfnt data in a WOFF or WOFF2 container.
+
+    Tables are copied through as compiled bytes, so this costs compression
+    (plus the glyf transform for WOFF2) rather than a full recompile.
+
+    Args:
+        sfnt: Compiled sfnt font data
+        flavor: "woff" or "woff2"
+        brotli_quality: Brotli quality (0-11) for WOFF2
+
+    Returns:
+        Encoded font data
+    """
+    quality = _woff2_brotli_quality(brotli_quality) if flavor == "woff2" else contextlib.nullcontext()
+    with quality, stage(f"encode_{flavor}") as timer:
+        font = TTFont(BytesIO(sfnt), recalcBBoxes=False, recalcTimestamp=False)
+        font.flavor = flavor
+        buffer = BytesIO()
+        font.save(buffer)
+        font.close()
+        timer.nbytes = buffer.tell()
+    return buffer.getvalue()
+
+
+def _encode_formats(
+    font: TTFont,
+    formats: List[str],
+    brotli_quality: int = DEFAULT_BROTLI_QUALITY
+) -> Dict[str, bytes]:
+    """
+    Encode a font in several formats from a single compile.
+
+    The font's tables are compiled once into sfnt bytes; the WOFF (zlib) and
+    WOFF2 (Brotli) wrappers are then built from those bytes concurrently.
+    Both compressors release the GIL, so threads overlap the work.
+
+    Args:
+        font: Font to encode (its flavor is reset)
+        formats: Normalized output formats (ttf, woff, woff2)
+        brotli_quality: Brotli quality (0-11) for WOFF2
+
+    Returns:
+        Dictionary of format to encoded font data
+    """
+    font.flavor = None
+    font.flavorData = None
+    with stage("compile") as timer:
+        buffer = BytesIO()
+        font.save(buffer)
+        sfnt = buffer.getvalue()
+        timer.nbytes = len(sfnt)
+
+    encoded = {}
+    wrapped = [format_type for format_type in formats if FORMAT_FLAVORS[format_type]]
+
+    if len(wrapped) > 1:
+        with ThreadPoolExecutor(max_workers=len(wrapped)) as executor:
+            # Each thread runs in a copy of the caller's context so its stages
+            # (and profile) are attributed to the current request
+            futures = {
+                format_type: executor.submit(
+                    copy_context().run, profiled_call, _wrap_sfnt, sfnt, FORMAT_FLAVORS[format_type], brotli_quality
+                )
+                for format_type in wrapped
+            }
+            for format_type, future in futures.items():
+                encoded[format_type] = future.result()
+    else:
+        for format_type in wrapped:
+            encoded[format_type] = _wrap_sfnt(sfnt, FORMAT_FLAVORS[format_type], brotli_quality)
+
+    if "ttf" in formats:
+        encoded["ttf"] = sfnt
+
+    return encoded
+
+
+def _clean_filename(name: str) -> str:
+    """Make a font name filesystem-safe"""
+    clean_name = "".join(c if c.isalnum() or c in ('-', '_') else '-' for c in name)
+    return clean_name.strip('-').lower()
+
+
+def _normalize_formats(formats: List[str]) -> List[str]:
+    """Lower-case and de-duplicate output formats, dropping unsupported ones"""
+    normalized = []
+    for format_type in formats:
+        format_type = format_type.lower().strip('.')
+
+        if format_type not in FORMAT_FLAVORS:
+            logger.warning(f"Unsupported format: {format_type}")
+            continue
+
+        if format_type not in normalized:
+            normalized.append(format_type)
+    return normalized
+
+
+def _write_encoded(
+    encoded: Dict[str, bytes],
+    formats: List[str],
+    output_dir: str,
+    base_name: str
+) -> List[Dict[str, str]]:
+    """Write encoded fonts as <base_name>.<format> and describe the files"""
+    output_files = []
+    for format_type in formats:
+        output_filename = f"{base_name}.{format_type}"
+        output_path = Path(output_dir) / output_filename
+
+        with stage("write", len(encoded[format_type])):
+            output_path.write_bytes(encoded[format_type])
+
+        output_files.append({
+            "filename": output_filename,
+            "download_name": hashed_filename(output_filename, hashlib.sha256(encoded[format_type]).hexdigest()),
+            "format": format_type,
+            "size": len(encoded[format_type]),
+            "path": str(output_path)
+        })
+
+        logger.info(f"Converted to {format_type}: {output_path}")
+
+    return output_files
+
+
+def _convert_font_file(
+    font_path: str,
+    formats: List[str],
+    output_dir: str,
+    custom_font_name: Optional[str] = None,
+    brotli_quality: int = DEFAULT_BROTLI_QUALITY
+) -> List[Dict[str, str]]:
+    """
+    Save a font in each requested format.
+
+    Kept at module level so it can run in a worker process.
+
+    Args:
+        font_path: Path to the font file
+        formats: List of output formats (ttf, woff, woff2)
+        output_dir: Directory to save converted fonts
+        custom_font_name: Optional custom filename (without extension)
+        brotli_quality: Brotli quality (0-11) for WOFF2
+
+    Returns:
+        List of output file information
+    """
+    requested = _normalize_formats(formats)
+    if not requested:
+        return []
+
+    font = TTFont(font_path)
+    encoded = _encode_formats(font, requested, brotli_quality)
+    font.close()
+
+    # Use custom name if provided, otherwise use the input filename
+    base_name = custom_font_name if custom_font_name else Path(font_path).stem
+    return _write_encoded(encoded, requested, output_dir, base_name)
+
+
+def _slice_font_file(
+    font_path: str,
+    unicodes: List[int],
+    formats: List[str],
+    output_dir: str,
+    base_name: str,
+    brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+    font_hash: Optional[str] = None,
+    font_cache: Optional[FontCache] = None
+) -> List[Dict[str, str]]:
+    """
+    Subset a font to one slice and save it in each requested format.
+
+    The subset is encoded straight from memory, without an intermediate
+    subset file. Kept at module level so it can run in a worker process.
+
+    Args:
+        font_path: Path to the original font file
+        unicodes: Code points in the slice
+        formats: Normalized output formats
+        output_dir: Directory to save the slice files
+        base_name: Output filename without extension
+        brotli_quality: Brotli quality (0-11) for WOFF2
+        font_hash: Content hash of the font file (parsed font cache key)
+        font_cache: Parsed font cache; defaults to the worker's own cache
+
+    Returns:
+        List of output file information
+    """
+    font_cache = font_cache or _worker_font_cache
+
+    with stage("load"):
+        if font_cache and font_hash:
+            font = font_cache.open(font_hash, font_path)
+        else:
+            font = TTFont(font_path)
+
+    _run_subsetter(font, unicodes)
+
+    encoded = _encode_formats(font, formats, brotli_quality)
+    font.close()
+
+    return _write_encoded(encoded, formats, output_dir, base_name)
+
 
 class FontService:
     """Service for font processing operations"""
 
+    def __init__(
+        self,
+        subset_cache: Optional[SubsetCache] = None,
+        max_workers: int = 0,
+        font_cache: Optional[FontCache] = None,
+        brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+        glyph_cost_store: Optional[GlyphCostStore] = None
+    ):
+        """
+        Initialize font service.
+
+        Args:
+            subset_cache: Optional cache for subset results
+            max_workers: Worker processes for batch subset/convert calls
+                (0 or 1 runs them serially in-process)
+            font_cache: Optional cache of parsed source fonts; worker processes
+                get their own cache with the same budget
+            brotli_quality: Brotli quality (0-11) for WOFF2 output; lower
+                trades bytes for CPU
+            glyph_cost_store: Optional store of glyph cost indexes for size
+                estimates (see index_glyph_costs)
+        """
+        self.subset_cache = subset_cache
+        self.font_cache = font_cache
+        self.glyph_cost_store = glyph_cost_store
+        self.brotli_quality = brotli_quality
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Font hash -> lock held while its glyph cost index is being built
+        self._index_locks: Dict[str, threading.Lock] = {}
+        self._index_locks_lock = threading.Lock()
+
+    @staticmethod
+    def archive_filename(font_name: Optional[str] = None) -> str:
+        """
+        Build the download filename for a zip of a session's fonts.
+
+        Args:
+            font_name: Optional font family name for cleaner zip filename
+
+        Returns:
+            Zip filename
+        """
+        if font_name:
+            return f"{_clean_filename(font_name)}-subset.zip"
+        return "font-subsets.zip"
+
+    @staticmethod
+    def stylesheet_filename(font_name: Optional[str] = None) -> str:
+        """
+        Build the filename for a generated @font-face stylesheet.
+
+        Args:
+            font_name: Optional font family name
+
+        Returns:
+            Stylesheet filename
+        """
+        if font_name:
+            return f"{_clean_filename(font_name)}-slices.css"
+        return "font-slices.css"
+
     def create_zip_archive(self, file_paths: List[str], session_id: str, font_name: Optional[str] = None) -> Optional[str]:
         """
         Create a zip archive from a list of files.
+
+        WOFF/WOFF2 members are stored as-is since they are already compressed.
+        The download endpoint streams archives with stream_zip instead.
+
         Args:
             file_paths: List of paths to the files to be zipped
             session_id: The session ID, used for naming the output zip file
@@ -31,81 +702,95 @@ class FontService:
             return None
 
         output_dir = Path(file_paths[0]).parent
-
-        # Create a clean zip filename based on font name
-        if font_name:
-            # Clean the font name to be filesystem-safe
-            clean_name = "".join(c if c.isalnum() or c in ('-', '_') else '-' for c in font_name)
-            clean_name = clean_name.strip('-').lower()
-            zip_filename = f"{clean_name}-subset.zip"
-        else:
-            zip_filename = "font-subsets.zip"
-
-        zip_filepath = output_dir / zip_filename
+        zip_filepath = output_dir / self.archive_filename(font_name)
 
         try:
-            with zipfile.ZipFile(zip_filepath, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in file_paths:
-                    p = Path(file_path)
-                    if p.exists() and p.is_file():
-                        zipf.write(file_path, p.name)
+            with stage("zip") as timer:
+                with zipfile.ZipFile(zip_filepath, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                    for file_path in file_paths:
+                        p = Path(file_path)
+                        if p.exists() and p.is_file():
+                            zipf.write(file_path, p.name, compress_type=member_compression(file_path))
+                timer.nbytes = zip_filepath.stat().st_size
             return str(zip_filepath)
         except Exception as e:
             logger.error(f"Error creating zip archive: {str(e)}")
             return None
 
-    def extract_metadata(self, font_path: str) -> FontMetadata:
+    def extract_metadata(self, font_path: str, lazy: bool = True) -> FontMetadata:
         """
         Extract metadata from a font file.
 
+        In lazy mode the font is opened without reading it into memory and only
+        the tables FontMetadata needs (name, cmap and the glyph order source)
+        are decompiled. WOFF tables are inflated individually, so the glyph
+        outlines are never touched; WOFF2 still has to Brotli-decode its single
+        stream, but the glyf/loca transform is never reversed.
+
         Args:
             font_path: Path to the font file
+            lazy: Open the font lazily (fast metadata mode)
 
         Returns:
             FontMetadata object with font information
         """
         try:
-            font = TTFont(font_path)
+            font = TTFont(font_path, lazy=True) if lazy else TTFont(font_path)
+
+            try:
+                with stage("metadata"):
+                    # Get name table
+                    name_table = font['name']
+
+                    # Extract basic metadata
+                    family_name = self._get_name_record(name_table, 1) or "Unknown"
+                    style_name = self._get_name_record(name_table, 2) or "Regular"
+                    full_name = self._get_name_record(name_table, 4) or family_name
+                    version = self._get_name_record(name_table, 5) or "Unknown"
+                    designer = self._get_name_record(name_table, 9) or None
+                    description = self._get_name_record(name_table, 10) or None
 
-            # Get name table
-            name_table = font['name']
-
-            # Extract basic metadata
-            family_name = self._get_name_record(name_table, 1) or "Unknown"
-            style_name = self._get_name_record(name_table, 2) or "Regular"
-            full_name = self._get_name_record(name_table, 4) or family_name
-            version = self._get_name_record(name_table, 5) or "Unknown"
-            designer = self._get_name_record(name_table, 9) or None
-            description = self._get_name_record(name_table, 10) or None
-
-            # Get character set
-            character_set = []
-            glyphs = []
-
-            if 'cmap' in font:
-                for table in font['cmap'].tables:
-                    if table.isUnicode():
-                        for code_point, glyph_name in table.cmap.items():
-                            try:
-                                char = chr(code_point)
-                                character_set.append(char)
-                                glyphs.append(GlyphInfo(
-                                    unicode=code_point,
-                                    name=glyph_name,
-                                    character=char
-                                ))
-                            except ValueError:
-                                pass
+                    # Variation axes
+                    axes = []
+                    if 'fvar' in font:
+                        for axis in font['fvar'].axes:
+                            axes.append({
+                                "tag": axis.axisTag,
+                                "name": self._get_name_record(name_table, axis.axisNameID),
+                                "min_value": axis.minValue,
+                                "default_value": axis.defaultValue,
+                                "max_value": axis.maxValue
+                            })
+
+                    # Get character set
+                    code_points = set()
+                    glyphs = []
+
+                    if 'cmap' in font:
+                        for table in font['cmap'].tables:
+                            if table.isUnicode():
+                                for code_point, glyph_name in table.cmap.items():
+                                    try:
+                                        char = chr(code_point)
+                                    except ValueError:
+                                        continue
+                                    code_points.add(code_point)
+                                    # Plain dicts are validated in one pass by FontMetadata
+                                    glyphs.append({
+                                        "unicode": code_point,
+                                        "name": glyph_name,
+                                        "character": char
+                                    })
+            finally:
+                font.close()
 
             # Remove duplicates and sort
-            character_set = sorted(list(set(character_set)))
+            character_set = [chr(code_point) for code_point in sorted(code_points)]
 
             # Get file info
             file_size = os.path.getsize(font_path)
             file_ext = Path(font_path).suffix.lower()
 
-            font.close()
-
             return FontMetadata(
                 family_name=family_name,
                 style_name=style_name,
@@ -116,6 +801,7 @@ class FontService:
                 glyph_count=len(glyphs),
                 character_set=character_set,
                 glyphs=glyphs,
+                axes=axes,
                 file_size=file_size,
                 format=file_ext
             )
@@ -124,13 +810,182 @@ class FontService:
             logger.error(f"Error extracting metadata: {str(e)}")
             raise
 
+    def list_collection_members(self, collection_path: str) -> List[CollectionMember]:
+        """
+        List the fonts in a font collection.
+
+        The collection is opened lazily and only each member's name, maxp and
+        cmap tables are decompiled; tables the members share are decompiled
+        once. Outlines and layout tables are never read, so listing a large
+        CJK collection costs little more than its cmaps.
+
+        Args:
+            collection_path: Path to the .ttc/.otc file
+
+        Returns:
+            One CollectionMember per font, in collection order
+        """
+        from fontTools.ttLib import TTCollection
+
+        try:
+            collection = TTCollection(collection_path, shareTables=True, lazy=True)
+
+            try:
+                with stage("metadata"):
+                    members = []
+                    for font_number, font in enumerate(collection.fonts):
+                        name_table = font['name']
+                        family_name = self._get_name_record(name_table, 1) or "Unknown"
+                        cmap = font.getBestCmap() if 'cmap' in font else None
+
+                        members.append(CollectionMember(
+                            font_number=font_number,
+                            family_name=family_name,
+                            style_name=self._get_name_record(name_table, 2) or "Regular",
+                            full_name=self._get_name_record(name_table, 4) or family_name,
+                            glyph_count=font['maxp'].numGlyphs,
+                            character_count=len(cmap or {}),
+                            format=".otf" if font.sfntVersion == "OTTO" else ".ttf"
+                        ))
+            finally:
+                collection.close()
+
+            return members
+
+        except Exception as e:
+            logger.error(f"Error listing collection members: {str(e)}")
+            raise
+
+    def extract_collection_member(self, collection_path: str, font_number: int, output_path: str) -> str:
+        """
+        Copy one font out of a collection as a standalone font file.
+
+        Tables are copied as raw bytes without being decompiled, so this costs
+        about as much as reading the member's tables from disk.
+
+        Args:
+            collection_path: Path to the .ttc/.otc file
+            font_number: Index of the font within the collection
+            output_path: Where to save the font
+
+        Returns:
+            File extension for the saved font (".ttf" or ".otf")
+
+        Raises:
+            ValueError: If the collection has no font with that number
+        """
+        try:
+            font = TTFont(collection_path, fontNumber=font_number, lazy=True, recalcBBoxes=False, recalcTimestamp=False)
+        except TTLibError as e:
+            raise ValueError(str(e))
+
+        try:
+            with stage("extract") as timer:
+                font.save(output_path, reorderTables=False)
+                timer.nbytes = os.path.getsize(output_path)
+            return ".otf" if font.sfntVersion == "OTTO" else ".ttf"
+        finally:
+            font.close()
+
+    def estimate_subset(
+        self,
+        font_path: str,
+        characters: str,
+        unicode_ranges: Optional[List[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Estimate subset sizes without running the subsetter.
+
+        Uses the font's glyph cost index, building it if the font has not
+        been indexed yet (see index_glyph_costs).
+
+        Args:
+            font_path: Path to the original font file
+            characters: String of characters to include in subset
+            unicode_ranges: Additional code points in CSS unicode-range syntax
+
+        Returns:
+            Dictionary with glyph_count, character_count and estimated ttf,
+            woff and woff2 sizes in bytes
+        """
+        ranges = requested_ranges(characters, unicode_ranges)
+
+        index = self.index_glyph_costs(font_path)
+
+        with stage("estimate"):
+            # Only code points the font maps affect the estimate
+            return index.estimate(select_code_points(ranges, index.cmap))
+
+    def compact_metadata(self, metadata: FontMetadata) -> CompactFontMetadata:
+        """
+        Convert font metadata to its compact, range-encoded form.
+
+        Args:
+            metadata: Full font metadata
+
+        Returns:
+            CompactFontMetadata without per-glyph lists
+        """
+        fields = metadata.model_dump(exclude={"character_set", "glyphs"})
+        return CompactFontMetadata(
+            **fields,
+            character_count=len(metadata.character_set),
+            codepoint_ranges=to_ranges(ord(char) for char in metadata.character_set)
+        )
+
+    def glyph_page(
+        self,
+        metadata: FontMetadata,
+        font_index: int,
+        offset: int = 0,
+        limit: int = 500,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> GlyphPage:
+        """
+        Get a page of a font's glyphs, one entry per code point.
+
+        Args:
+            metadata: Font metadata
+            font_index: Index of the font in its session
+            offset: Number of glyphs to skip
+            limit: Maximum number of glyphs to return
+            start: Optional first code point to include
+            end: Optional last code point to include
+
+        Returns:
+            GlyphPage ordered by code point
+        """
+        # cmap subtables repeat the same mappings; keep the first entry per code point
+        by_code_point: Dict[int, GlyphInfo] = {}
+        for glyph in metadata.glyphs:
+            if glyph.unicode is None or glyph.unicode in by_code_point:
+                continue
+            if start is not None and glyph.unicode < start:
+                continue
+            if end is not None and glyph.unicode > end:
+                continue
+            by_code_point[glyph.unicode] = glyph
+
+        glyphs = [by_code_point[code_point] for code_point in sorted(by_code_point)]
+
+        return GlyphPage(
+            font_index=font_index,
+            offset=offset,
+            limit=limit,
+            total=len(glyphs),
+            glyphs=glyphs[offset:offset + limit]
+        )
+
     def create_subset(
         self,
         font_path: str,
         characters: str,
         output_dir: str,
         font_name_suffix: str = "Subset",
-        custom_font_name: Optional[str] = None
+        custom_font_name: Optional[str] = None,
+        unicode_ranges: Optional[List[str]] = None,
+        axis_limits: Optional[AxisLimits] = None
     ) -> str:
         """
         Create a subset of the font containing only specified characters.
@@ -141,129 +996,588 @@ class FontService:
             output_dir: Directory to save the subset font
             font_name_suffix: Suffix to add to the output filename
             custom_font_name: Custom font filename (without extension)
+            unicode_ranges: Additional code points in CSS unicode-range syntax
+            axis_limits: Variable font axes to pin or narrow before subsetting
+                (see resolve_axis_limits)
 
         Returns:
             Path to the subset font file
         """
         try:
-            # Load font
-            font = TTFont(font_path)
+            ranges, output_path, font_hash, cache_key, cached = self._prepare_subset(
+                font_path, characters, output_dir, font_name_suffix, custom_font_name, unicode_ranges, axis_limits
+            )
+            if cached:
+                return output_path
 
-            # Get unique characters
-            unique_chars = set(characters)
+            _subset_font_file(font_path, ranges, output_path, font_hash, self.font_cache, axis_limits)
+            return self._finish_subset(cache_key, output_path)
 
-            # Convert characters to Unicode code points
-            unicodes = [ord(char) for char in unique_chars]
+        except Exception as e:
+            logger.error(f"Error creating subset: {str(e)}")
+            raise
 
-            # Create output filename
-            input_path = Path(font_path)
-            if custom_font_name:
-                # Use custom name if provided
-                output_filename = f"{custom_font_name}{input_path.suffix}"
-            else:
-                # Use default naming with suffix
-                output_filename = f"{input_path.stem}-{font_name_suffix}{input_path.suffix}"
-            output_path = Path(output_dir) / output_filename
-
-            # Create subsetter
-            subsetter = subset.Subsetter()
-
-            # Configure subsetter options (matching fonttools best practices)
-            subsetter.options.name_IDs = ['*']
-            subsetter.options.name_legacy = True
-            subsetter.options.name_languages = ['*']
-            subsetter.options.layout_features = ['*']  # Keep all layout features
-            subsetter.options.no_hinting = True  # Remove hinting for smaller file size
-            subsetter.options.glyph_names = True  # Keep glyph names
-            subsetter.options.symbol_cmap = True  # Keep symbol cmap
-            subsetter.options.legacy_cmap = True  # Keep legacy cmap
-            subsetter.options.notdef_glyph = True  # Keep .notdef glyph
-            subsetter.options.notdef_outline = True  # Keep .notdef outline
-            subsetter.options.recommended_glyphs = True  # Keep recommended glyphs
-            subsetter.options.drop_tables += ['GSUB', 'GPOS']  # Drop complex layout tables
-
-            # Populate subset with unicodes
-            subsetter.populate(unicodes=unicodes)
-
-            # Subset the font
-            subsetter.subset(font)
+    def create_subsets(self, jobs: List[Dict]) -> Iterator[str]:
+        """
+        Create subsets for several fonts, fanning them out across worker processes.
 
-            # Save subset font
-            font.save(str(output_path))
-            font.close()
+        Results are yielded in input order. If a job fails, the subsets before it
+        are still yielded and the error is raised at that position, matching a
+        serial loop over create_subset.
 
-            logger.info(f"Created subset: {output_path}")
+        Args:
+            jobs: List of keyword-argument dicts for create_subset
 
-            return str(output_path)
+        Yields:
+            Path to each subset font file
+        """
+        if not self._use_pool(len(jobs)):
+            for job in jobs:
+                yield self.create_subset(**job)
+            return
+
+        pending = []
+        for job in jobs:
+            ranges, output_path, font_hash, cache_key, cached = self._prepare_subset(
+                job["font_path"],
+                job["characters"],
+                job["output_dir"],
+                job.get("font_name_suffix", "Subset"),
+                job.get("custom_font_name"),
+                job.get("unicode_ranges"),
+                job.get("axis_limits")
+            )
+            future = None
+            if not cached:
+                future = self._submit(
+                    _subset_font_file, job["font_path"], ranges, output_path, font_hash,
+                    axis_limits=job.get("axis_limits")
+                )
+            pending.append((future, cache_key, output_path))
+
+        try:
+            for future, cache_key, output_path in pending:
+                if future is None:
+                    yield output_path
+                    continue
+                try:
+                    unwrap_result(future.result())
+                except Exception as e:
+                    logger.error(f"Error creating subset: {str(e)}")
+                    raise
+                yield self._finish_subset(cache_key, output_path)
+        finally:
+            for future, _, _ in pending:
+                if future is not None:
+                    future.cancel()
+
+    def create_subset_collection(
+        self,
+        font_paths: List[str],
+        characters: str,
+        output_path: str,
+        unicode_ranges: Optional[List[str]] = None,
+        axis_limits: Optional[List[Optional[AxisLimits]]] = None
+    ) -> str:
+        """
+        Subset several fonts and save them together as one font collection.
+
+        Fonts with the same glyph order (such as the members of one CJK
+        collection) are all subset to the union of the glyphs any of them
+        needs. Their outline and metrics tables then come out identical and,
+        like any other table that matches byte for byte, are stored once.
+        Where the subsetter's closure stage is not available (see
+        _STAGED_SUBSETTER) each font is subset on its own.
+
+        Args:
+            font_paths: Paths to the original fonts, in collection order
+            characters: String of characters to include in the subsets
+            output_path: Where to save the collection (.ttc/.otc)
+            unicode_ranges: Additional code points in CSS unicode-range syntax
+            axis_limits: Axes to pin or narrow, per font (see resolve_axis_limits)
+
+        Returns:
+            Path to the subset collection
+        """
+        from fontTools.ttLib import TTCollection
+
+        ranges = requested_ranges(characters, unicode_ranges)
+
+        fonts = []
+        try:
+            with stage("load"):
+                for index, font_path in enumerate(font_paths):
+                    font = self.font_cache.open(file_sha256(font_path), font_path) if self.font_cache else TTFont(font_path)
+                    fonts.append(font)
+                    limits = axis_limits[index] if axis_limits else None
+                    if limits:
+                        _instantiate(font, limits)
+
+            # Glyphs needed by each group of fonts sharing a glyph order
+            retained: Dict[Tuple[str, ...], set] = {}
+            glyph_orders = []
+            font_unicodes = [_resolve_unicodes(font, ranges) for font in fonts]
+            for font, unicodes in zip(fonts, font_unicodes):
+                subsetter = _close_glyphs(font, unicodes)
+                glyph_order = tuple(font.getGlyphOrder())
+                if subsetter is not None:
+                    retained.setdefault(glyph_order, set()).update(subsetter.glyphs_retained)
+                glyph_orders.append(glyph_order)
+
+            for font, unicodes, glyph_order in zip(fonts, font_unicodes, glyph_orders):
+                _run_subsetter(font, unicodes, glyphs=retained.get(glyph_order))
+
+            with stage("compile") as timer:
+                collection = TTCollection()
+                collection.fonts = fonts
+                collection.save(output_path, shareTables=True)
+                timer.nbytes = os.path.getsize(output_path)
+
+            logger.info(f"Created subset collection of {len(fonts)} fonts: {output_path}")
+
+            return output_path
 
         except Exception as e:
-            logger.error(f"Error creating subset: {str(e)}")
+            logger.error(f"Error creating subset collection: {str(e)}")
             raise
 
+        finally:
+            for font in fonts:
+                font.close()
+
     def convert_formats(
         self,
         font_path: str,
         formats: List[str],
         output_dir: str,
-        custom_font_name: Optional[str] = None
+        custom_font_name: Optional[str] = None,
+        brotli_quality: Optional[int] = None
     ) -> List[Dict[str, str]]:
         """
         Convert font to specified formats.
 
+        The font is compiled once; WOFF and WOFF2 are wrapped from the same
+        compiled data concurrently.
+
         Args:
             font_path: Path to the font file
             formats: List of output formats (ttf, woff, woff2)
             output_dir: Directory to save converted fonts
             custom_font_name: Optional custom filename (without extension)
+            brotli_quality: Brotli quality for WOFF2 (defaults to the service setting)
 
         Returns:
             List of output file information
         """
+        if brotli_quality is None:
+            brotli_quality = self.brotli_quality
+
         try:
-            font = TTFont(font_path)
-            input_path = Path(font_path)
-            output_files = []
+            return _convert_font_file(font_path, formats, output_dir, custom_font_name, brotli_quality)
+
+        except Exception as e:
+            logger.error(f"Error converting formats: {str(e)}")
+            raise
+
+    def convert_formats_many(self, jobs: List[Dict]) -> Iterator[List[Dict[str, str]]]:
+        """
+        Convert several fonts, fanning them out across worker processes.
+
+        Results are yielded in input order with the same error semantics as
+        create_subsets.
+
+        Args:
+            jobs: List of keyword-argument dicts for convert_formats
+
+        Yields:
+            List of output file information for each font
+        """
+        if not self._use_pool(len(jobs)):
+            for job in jobs:
+                yield self.convert_formats(**job)
+            return
+
+        futures = [
+            self._submit(
+                _convert_font_file, **{"brotli_quality": self.brotli_quality, **job}
+            )
+            for job in jobs
+        ]
+        try:
+            for future in futures:
+                try:
+                    yield unwrap_result(future.result())
+                except Exception as e:
+                    logger.error(f"Error converting formats: {str(e)}")
+                    raise
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def subset_bytes(
+        self,
+        data: bytes,
+        characters: str,
+        formats: List[str],
+        unicode_ranges: Optional[List[str]] = None,
+        axis_limits: Optional[AxisLimits] = None
+    ) -> Dict[str, bytes]:
+        """
+        Subset a font held in memory and encode it in each requested format.
+
+        Nothing touches the disk: the font is parsed from the given bytes
+        (WOFF/WOFF2 through the parsed font cache, keyed by content hash),
+        instanced, subset and encoded from a single compile.
+
+        Args:
+            data: Font file contents (ttf, otf, woff or woff2)
+            characters: Characters to include in the subset
+            formats: Output formats (ttf, woff, woff2)
+            unicode_ranges: Additional code points in CSS unicode-range syntax
+            axis_limits: Variable font axes to pin or narrow before subsetting;
+                limits for axes the font does not have are ignored
+
+        Returns:
+            Dictionary of format to encoded font data, in request order
+
+        Raises:
+            ValueError: If no format is supported, the data is not a font, a
+                unicode range is malformed or an axis limit is out of range
+        """
+        requested = _normalize_formats(formats)
+        if not requested:
+            raise ValueError(f"No supported output format. Allowed: {', '.join(FORMAT_FLAVORS)}")
+
+        ranges = requested_ranges(characters, unicode_ranges)
+
+        font_hash = None
+        if self.font_cache:
+            with stage("hash", len(data)):
+                font_hash = hashlib.sha256(data).hexdigest()
 
+        with stage("load", len(data)):
+            try:
+                if font_hash:
+                    font = self.font_cache.open(font_hash, BytesIO(data))
+                else:
+                    font = TTFont(BytesIO(data))
+            except TTLibError as e:
+                raise ValueError(f"Invalid font file: {str(e)}")
+
+            try:
+                axes = []
+                if "fvar" in font:
+                    axes = [
+                        AxisInfo(tag=axis.axisTag, min_value=axis.minValue, default_value=axis.defaultValue, max_value=axis.maxValue)
+                        for axis in font["fvar"].axes
+                    ]
+                resolved = resolve_axis_limits(axis_limits, axes)
+                if resolved and font_hash:
+                    # Same instance reuse as _subset_font_file
+                    font.close()
+                    font = self.font_cache.open_derived(
+                        f"{font_hash}@{_axis_location_key(resolved)}",
+                        lambda: _instantiate(self.font_cache.open(font_hash, BytesIO(data)), resolved)
+                    )
+                elif resolved:
+                    _instantiate(font, resolved)
+            except Exception:
+                font.close()
+                raise
+
+        try:
+            _run_subsetter(font, _resolve_unicodes(font, ranges))
+            encoded = _encode_formats(font, requested, self.brotli_quality)
+        finally:
+            font.close()
+        return {format_type: encoded[format_type] for format_type in requested}
+
+    def create_slices(self, jobs: List[Dict]) -> Iterator[List[Dict[str, str]]]:
+        """
+        Subset and encode unicode-range slices, fanning them out across worker processes.
+
+        Each slice file is cached per (font hash, slice code points, format),
+        so re-slicing a font only regenerates what is missing. Results are
+        yielded in input order with the same error semantics as create_subsets.
+
+        Args:
+            jobs: List of dicts with font_path, unicodes, formats, output_dir
+                and base_name (output filename without extension)
+
+        Yields:
+            List of output file information for each slice
+        """
+        use_pool = self._use_pool(len(jobs))
+
+        pending = []
+        for job in jobs:
+            formats = _normalize_formats(job["formats"])
+
+            font_hash = None
+            if self.subset_cache or self.font_cache:
+                font_hash = file_sha256(job["font_path"])
+
+            # Serve slice files from the cache when possible
+            cache_keys = {}
+            missing = []
             for format_type in formats:
-                format_type = format_type.lower().strip('.')
+                cache_key = None
+                if self.subset_cache:
+                    cache_key = SubsetCache.make_key(
+                        kind="slice",
+                        font_hash=font_hash,
+                        unicodes=job["unicodes"],
+                        options=subset_options_fingerprint(),
+                        format=format_type,
+                        brotli_quality=self.brotli_quality if format_type == "woff2" else None
+                    )
+                    output_path = Path(job["output_dir"]) / f"{job['base_name']}.{format_type}"
+                    if self.subset_cache.fetch(cache_key, str(output_path)):
+                        continue
+                cache_keys[format_type] = cache_key
+                missing.append(format_type)
 
-                if format_type not in ['ttf', 'woff', 'woff2']:
-                    logger.warning(f"Unsupported format: {format_type}")
-                    continue
+            args = (
+                job["font_path"], job["unicodes"], missing, job["output_dir"],
+                job["base_name"], self.brotli_quality, font_hash
+            )
+            future = None
+            if missing and use_pool:
+                future = self._submit(_slice_font_file, *args)
+            pending.append((job, formats, args, future, cache_keys))
 
-                # Use custom name if provided, otherwise use the input filename
-                base_name = custom_font_name if custom_font_name else input_path.stem
-                output_filename = f"{base_name}.{format_type}"
-                output_path = Path(output_dir) / output_filename
+        try:
+            for job, formats, args, future, cache_keys in pending:
+                missing = args[2]
+                if missing:
+                    try:
+                        if future is not None:
+                            generated = unwrap_result(future.result())
+                        else:
+                            generated = _slice_font_file(*args, font_cache=self.font_cache)
+                    except Exception as e:
+                        logger.error(f"Error creating slice: {str(e)}")
+                        raise
 
-                # Save in the specified format
-                if format_type == 'woff':
-                    font.flavor = 'woff'
-                elif format_type == 'woff2':
-                    font.flavor = 'woff2'
+                    for file_info in generated:
+                        cache_key = cache_keys[file_info["format"]]
+                        if cache_key:
+                            self.subset_cache.store(cache_key, file_info["path"])
                 else:
-                    font.flavor = None
+                    logger.info(f"Created slice from cache: {job['base_name']}")
 
-                font.save(str(output_path))
+                output_files = []
+                for format_type in formats:
+                    output_filename = f"{job['base_name']}.{format_type}"
+                    output_path = Path(job["output_dir"]) / output_filename
+                    output_files.append({
+                        "filename": output_filename,
+                        "download_name": hashed_filename(output_filename, file_sha256(str(output_path))),
+                        "format": format_type,
+                        "size": output_path.stat().st_size,
+                        "path": str(output_path)
+                    })
+                yield output_files
+        finally:
+            for _, _, _, future, _ in pending:
+                if future is not None:
+                    future.cancel()
 
-                file_size = os.path.getsize(output_path)
+    def font_face_descriptors(self, font_path: str) -> Dict[str, str]:
+        """
+        Read the font-weight and font-style an @font-face rule should declare.
 
-                output_files.append({
-                    "filename": output_filename,
-                    "format": format_type,
-                    "size": file_size,
-                    "path": str(output_path)
-                })
+        Args:
+            font_path: Path to the font file
 
-                logger.info(f"Converted to {format_type}: {output_path}")
+        Returns:
+            Dictionary with "weight" (a weight or a "min max" range for
+            variable fonts) and "style"
+        """
+        font = TTFont(font_path, lazy=True)
+        try:
+            weight = "400"
+            style = "normal"
+
+            if "OS/2" in font:
+                os2 = font["OS/2"]
+                weight = str(os2.usWeightClass)
+                if os2.fsSelection & 0x01:
+                    style = "italic"
+                elif os2.fsSelection & 0x200:
+                    style = "oblique"
+            elif "head" in font and font["head"].macStyle & 0x02:
+                style = "italic"
+
+            if "fvar" in font:
+                for axis in font["fvar"].axes:
+                    if axis.axisTag == "wght":
+                        weight = f"{axis.minValue:g} {axis.maxValue:g}"
 
+            return {"weight": weight, "style": style}
+        finally:
             font.close()
 
-            return output_files
+    def warm_up(self) -> float:
+        """
+        Preload the modules font jobs need (see _preload_modules).
+
+        Blocking; run it in the background at startup. With worker
+        processes, the pool is started too and each worker preloads them.
 
+        Returns:
+            Seconds taken in this process
+        """
+        start = time.perf_counter()
+        try:
+            _preload_modules()
+            if self.max_workers > 1:
+                pool = self._get_pool()
+                for _ in range(self.max_workers):
+                    pool.submit(int)
         except Exception as e:
-            logger.error(f"Error converting formats: {str(e)}")
-            raise
+            logger.warning(f"Font module preload failed: {str(e)}")
+        elapsed = time.perf_counter() - start
+        logger.info(f"Font modules preloaded in {elapsed * 1000:.0f}ms")
+        return elapsed
+
+    def shutdown(self):
+        """Shut down the worker process pool, if one was started."""
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _use_pool(self, job_count: int) -> bool:
+        return self.max_workers > 1 and job_count > 1
+
+    def _submit(self, func, *args, **kwargs) -> Future:
+        """
+        Submit a call to the worker pool.
+
+        When the current request is being profiled the call runs under
+        cProfile in the worker; pass its result through unwrap_result.
+        """
+        if profiling_active():
+            return self._get_pool().submit(call_with_profile, func, *args, **kwargs)
+        return self._get_pool().submit(func, *args, **kwargs)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn avoids forking a process that is running event loop threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.font_cache.max_bytes if self.font_cache else 0,)
+                )
+                logger.info(f"Started font worker pool with {self.max_workers} processes")
+            return self._pool
+
+    def _prepare_subset(
+        self,
+        font_path: str,
+        characters: str,
+        output_dir: str,
+        font_name_suffix: str,
+        custom_font_name: Optional[str],
+        unicode_ranges: Optional[List[str]] = None,
+        axis_limits: Optional[AxisLimits] = None
+    ) -> Tuple[List[Tuple[int, int]], str, Optional[str], Optional[str], bool]:
+        """
+        Resolve the output path and code point ranges for a subset and consult the cache.
+
+        Returns:
+            Tuple of (ranges, output path, font hash, cache key, served from cache)
+        """
+        # Merged ranges are canonical, so they key the cache as they are
+        ranges = requested_ranges(characters, unicode_ranges)
+
+        # Create output filename
+        input_path = Path(font_path)
+        if custom_font_name:
+            # Use custom name if provided
+            output_filename = f"{custom_font_name}{input_path.suffix}"
+        else:
+            # Use default naming with suffix
+            output_filename = f"{input_path.stem}-{font_name_suffix}{input_path.suffix}"
+        output_path = str(Path(output_dir) / output_filename)
+
+        # Content hash keys both the subset cache and the parsed font cache
+        font_hash = None
+        if self.subset_cache or self.font_cache:
+            with stage("hash"):
+                font_hash = file_sha256(font_path)
+
+        # Serve repeat subsets from the cache when possible
+        cache_key = None
+        if self.subset_cache:
+            key_parts = {
+                "font_hash": font_hash,
+                "ranges": ranges,
+                "options": subset_options_fingerprint(),
+                "flavor": sniff_flavor(font_path),
+            }
+            if axis_limits:
+                key_parts["axis_limits"] = _axis_location_key(axis_limits)
+            cache_key = SubsetCache.make_key(**key_parts)
+            with stage("cache_fetch"):
+                hit = self.subset_cache.fetch(cache_key, output_path)
+            if hit:
+                logger.info(f"Created subset from cache: {output_path}")
+                return ranges, output_path, font_hash, cache_key, True
+
+        return ranges, output_path, font_hash, cache_key, False
+
+    def _finish_subset(self, cache_key: Optional[str], output_path: str) -> str:
+        if cache_key:
+            with stage("cache_store"):
+                self.subset_cache.store(cache_key, output_path)
+
+        logger.info(f"Created subset: {output_path}")
+
+        return output_path
+
+    def index_glyph_costs(self, font_path: str, font_hash: Optional[str] = None) -> GlyphCostIndex:
+        """
+        Get a font's glyph cost index, building and storing it if needed.
+
+        Building reads every glyph (for WOFF2, reversing the glyf/loca
+        transform), so it is kept out of extract_metadata and runs after an
+        upload has been answered. A caller arriving while the same font is
+        being indexed waits for that build instead of repeating it.
+
+        Args:
+            font_path: Path to the font file
+            font_hash: Content hash of the font file, if already known
+
+        Returns:
+            GlyphCostIndex for the font
+        """
+        font_hash = font_hash or file_sha256(font_path)
+        index = self.glyph_cost_store.get(font_hash) if self.glyph_cost_store else None
+        if index is not None:
+            return index
+
+        with self._index_locks_lock:
+            lock = self._index_locks.setdefault(font_hash, threading.Lock())
+        try:
+            with lock:
+                index = self.glyph_cost_store.get(font_hash) if self.glyph_cost_store else None
+                if index is None:
+                    font = TTFont(font_path, lazy=True)
+                    try:
+                        with stage("glyph_cost_index"):
+                            index = GlyphCostIndex.build(font, build_subset_options())
+                    finally:
+                        font.close()
+                    if self.glyph_cost_store:
+                        self.glyph_cost_store.put(font_hash, index)
+        finally:
+            with self._index_locks_lock:
+                if not lock.locked():
+                    self._index_locks.pop(font_hash, None)
+        return index
 
     def _get_name_record(self, name_table, name_id: int) -> Optional[str]:
         """
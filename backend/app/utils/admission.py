@@ -0,0 +1,245 @@
+"""
+Admission control for CPU-heavy font work.
+
+fontTools work is CPU-bound, so running many jobs at once in a worker only
+makes every one of them slower. The controller lets a few jobs run at a
+time, queues a bounded number of others and turns the rest away, so the
+API can answer with a fast 503 instead of timing out.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Any, Dict, List, Optional
+import logging
+
+from app.utils.metrics import ADMISSION_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Starting estimate of seconds per unit of cost, refined as jobs finish
+DEFAULT_SECONDS_PER_COST = 0.1
+# Weight of the latest job in the running service time estimate
+EWMA_WEIGHT = 0.2
+MAX_RETRY_AFTER = 60
+
+
+def job_cost(glyph_count: int = 0, file_size: int = 0) -> float:
+    """
+    Estimate the relative cost of processing a font.
+
+    Subsetting and encoding time grows with the number of glyphs and with
+    the amount of font data to decode and compile. One unit is roughly the
+    fixed overhead of a job on a small font.
+
+    Args:
+        glyph_count: Glyphs in the font (0 if not known yet)
+        file_size: Font file size in bytes
+
+    Returns:
+        Cost in units (at least 1)
+    """
+    return 1 + glyph_count / 1000 + file_size / (1024 * 1024)
+
+
+class AdmissionRejected(Exception):
+    """Raised when the queue is full; retry_after is a suggested wait in seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Admission queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """
+    A reserved place in the admission queue.
+
+    Use as an async context manager: entering waits until the job may run,
+    leaving frees its slot for the next queued job.
+    """
+
+    def __init__(self, controller: Optional["AdmissionController"], cost: float, future: Optional[asyncio.Future]):
+        self._controller = controller
+        self.cost = cost
+        self._future = future
+        self._reserved_at = time.monotonic()
+        self._started_at: Optional[float] = None
+
+    async def __aenter__(self) -> "Ticket":
+        if self._controller is None:
+            return self
+        if self._future is not None:
+            try:
+                await self._future
+            except asyncio.CancelledError:
+                self._controller._abandon(self)
+                raise
+        self._started_at = time.monotonic()
+        self._controller._record_wait(self._started_at - self._reserved_at)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._controller is not None:
+            self._controller._release(self, time.monotonic() - self._started_at)
+
+
+class AdmissionController:
+    """
+    Bounded, cost-ordered admission of CPU-heavy jobs.
+
+    Up to max_concurrent jobs run at once. Further jobs wait in a queue of at
+    most max_queue entries, served in order of arrival time plus expected
+    run time (cost times the measured seconds per unit of cost). Small jobs
+    therefore overtake large ones that arrived shortly before them, while a
+    large job waits at most about its own expected run time for later small
+    ones. Jobs arriving at a full queue are rejected with a Retry-After
+    estimate.
+
+    Must be used from a single event loop; limits apply per worker process.
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_queue: int = 32):
+        """
+        Initialize admission controller.
+
+        Args:
+            max_concurrent: Jobs allowed to run at once (0 disables admission control)
+            max_queue: Jobs allowed to wait for a slot
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.seconds_per_cost = DEFAULT_SECONDS_PER_COST
+
+        self._active = 0
+        # Heap of [priority, sequence, ticket, future]
+        self._waiters: List[List[Any]] = []
+        self._sequence = itertools.count()
+
+        self.admitted = 0
+        self.rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrent > 0
+
+    def reserve(self, cost: float = 1.0) -> Ticket:
+        """
+        Take a slot, or a place in the queue, for a job.
+
+        Args:
+            cost: Estimated job cost (see job_cost)
+
+        Returns:
+            Ticket to enter before running the job
+
+        Raises:
+            AdmissionRejected: If the queue is full
+        """
+        if not self.enabled:
+            return Ticket(None, cost, None)
+
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return Ticket(self, cost, None)
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            retry_after = self.retry_after()
+            logger.warning(f"Admission queue full ({len(self._waiters)} waiting); retry after {retry_after}s")
+            raise AdmissionRejected(retry_after)
+
+        future = asyncio.get_running_loop().create_future()
+        ticket = Ticket(self, cost, future)
+        priority = time.monotonic() + cost * self.seconds_per_cost
+        heapq.heappush(self._waiters, [priority, next(self._sequence), ticket, future])
+        return ticket
+
+    def try_reserve(self, cost: float = 1.0) -> Optional[Ticket]:
+        """
+        Take a slot for optional work only if one is free right now.
+
+        Unlike reserve(), this never queues, so background work such as
+        indexing cannot crowd out requests waiting for a slot.
+
+        Args:
+            cost: Estimated job cost (see job_cost)
+
+        Returns:
+            Ticket to enter before running the job, or None if every slot
+            is taken or jobs are already waiting
+        """
+        if not self.enabled:
+            return Ticket(None, cost, None)
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return Ticket(self, cost, None)
+        return None
+
+    def retry_after(self) -> int:
+        """
+        Estimate how long until a new job would find room in the queue.
+
+        Returns:
+            Seconds, between 1 and MAX_RETRY_AFTER
+        """
+        if not self.enabled:
+            return 1
+        queued_cost = sum(entry[2].cost for entry in self._waiters)
+        seconds = queued_cost * self.seconds_per_cost / self.max_concurrent
+        return max(1, min(MAX_RETRY_AFTER, math.ceil(seconds)))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get admission statistics.
+
+        Returns:
+            Dictionary with running and queued jobs, limits, admitted and
+            rejected counts and queue wait times
+        """
+        return {
+            "enabled": self.enabled,
+            "active": self._active,
+            "queued": len(self._waiters),
+            "queued_cost": round(sum(entry[2].cost for entry in self._waiters), 2),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "mean_wait_seconds": round(self._wait_total / self.admitted, 4) if self.admitted else 0.0,
+            "max_wait_seconds": round(self._wait_max, 4),
+            "seconds_per_cost": round(self.seconds_per_cost, 4),
+        }
+
+    def _record_wait(self, seconds: float):
+        self.admitted += 1
+        self._wait_total += seconds
+        self._wait_max = max(self._wait_max, seconds)
+        ADMISSION_WAIT_SECONDS.observe(seconds)
+
+    def _release(self, ticket: Ticket, elapsed: float):
+        """Learn from a finished job and hand its slot to the next waiter"""
+        sample = elapsed / max(ticket.cost, 1e-6)
+        self.seconds_per_cost += EWMA_WEIGHT * (sample - self.seconds_per_cost)
+        self._grant_next()
+
+    def _grant_next(self):
+        while self._waiters:
+            _, _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # The slot passes straight to the waiter; _active is unchanged
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    def _abandon(self, ticket: Ticket):
+        """A waiter was cancelled: drop it from the queue, or pass on the slot it was just given"""
+        for index, entry in enumerate(self._waiters):
+            if entry[2] is ticket:
+                self._waiters.pop(index)
+                heapq.heapify(self._waiters)
+                return
+        # Already granted (the future resolved as the waiter was cancelled)
+        self._grant_next()
@@ -0,0 +1,206 @@
+"""
+Content-addressed storage for uploaded font files.
+"""
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStore:
+    """
+    Stores each distinct uploaded file once, keyed by its SHA-256 digest.
+
+    Sessions reference a blob through a hard link in their own upload
+    directory, so the blob's link count doubles as its reference count and
+    the original filename is preserved for the rest of the pipeline.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize blob store.
+
+        Args:
+            root: Directory for blobs; must be on the same filesystem as the
+                session upload directories for hard links to work
+        """
+        self.root = Path(root)
+        self.tmp_dir = self.root / "tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def temp_path(self) -> Path:
+        """
+        Get a fresh path for streaming an upload before its digest is known.
+
+        Returns:
+            Path inside the store's temp directory
+        """
+        return self.tmp_dir / f"{uuid.uuid4().hex}.part"
+
+    def blob_path(self, digest: str, suffix: str) -> Path:
+        """
+        Get the storage path for a blob.
+
+        Args:
+            digest: SHA-256 hex digest of the contents
+            suffix: File extension including the dot
+
+        Returns:
+            Blob path
+        """
+        return self.root / digest[:2] / f"{digest}{suffix.lower()}"
+
+    def add_reference(self, temp_path: Path, digest: str, suffix: str, dest_path: Path) -> bool:
+        """
+        Commit a streamed upload and reference it from a session directory.
+
+        If a blob with the same digest already exists the upload is discarded
+        and the existing blob is reused.
+
+        Args:
+            temp_path: Path the upload was streamed to
+            digest: SHA-256 hex digest of the upload
+            suffix: File extension including the dot
+            dest_path: Session path that should reference the blob
+
+        Returns:
+            True if an existing blob was reused
+        """
+        blob = self.blob_path(digest, suffix)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            deduplicated = blob.exists()
+            if deduplicated:
+                temp_path.unlink(missing_ok=True)
+            else:
+                os.replace(temp_path, blob)
+
+            # Link into place via a temp name so an existing file is swapped atomically
+            link_tmp = dest_path.with_name(f".{dest_path.name}.{uuid.uuid4().hex}")
+            try:
+                os.link(blob, link_tmp)
+            except OSError:
+                # No hard links (e.g. different filesystem): fall back to a private copy
+                shutil.copyfile(blob, link_tmp)
+            os.replace(link_tmp, dest_path)
+
+        if deduplicated:
+            logger.info(f"Reused stored blob {digest} for {dest_path.name}")
+        return deduplicated
+
+    def release(self, digest: str, suffix: str) -> int:
+        """
+        Drop a blob once no session references it anymore.
+
+        Call after the session's reference has been removed.
+
+        Args:
+            digest: SHA-256 hex digest of the contents
+            suffix: File extension including the dot
+
+        Returns:
+            Bytes freed (0 if the blob is still referenced)
+        """
+        blob = self.blob_path(digest, suffix)
+        with self._lock:
+            try:
+                stat = blob.stat()
+                if stat.st_nlink <= 1:
+                    blob.unlink()
+                    logger.info(f"Deleted unreferenced blob: {digest}")
+                    return stat.st_size
+            except FileNotFoundError:
+                pass
+        return 0
+
+    def collect_garbage(self, grace_seconds: float = 300) -> Tuple[int, int]:
+        """
+        Delete blobs no session links to, e.g. after session directories were
+        removed without releasing their blobs.
+
+        Blobs modified within the grace period are kept so an upload that is
+        being linked into place (possibly by another process) is not raced.
+
+        Args:
+            grace_seconds: Minimum age of a blob before it can be collected
+
+        Returns:
+            Tuple of (blobs deleted, bytes freed)
+        """
+        cutoff = time.time() - grace_seconds
+        deleted = 0
+        freed = 0
+        for path in list(self.root.glob("??/*")):
+            with self._lock:
+                try:
+                    stat = path.stat()
+                    if stat.st_nlink > 1 or stat.st_mtime > cutoff:
+                        continue
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+            deleted += 1
+            freed += stat.st_size
+
+        # Streams abandoned mid-upload
+        for path in list(self.tmp_dir.glob("*.part")):
+            try:
+                stat = path.stat()
+                if stat.st_mtime <= cutoff:
+                    path.unlink()
+                    freed += stat.st_size
+            except FileNotFoundError:
+                continue
+
+        if deleted:
+            logger.info(f"Collected {deleted} unreferenced blobs ({freed} bytes)")
+        return deleted, freed
+
+    def reference_count(self, digest: str, suffix: str) -> int:
+        """
+        Get the number of session references to a blob.
+
+        Args:
+            digest: SHA-256 hex digest of the contents
+            suffix: File extension including the dot
+
+        Returns:
+            Reference count (0 if the blob does not exist)
+        """
+        try:
+            return self.blob_path(digest, suffix).stat().st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get blob store statistics.
+
+        Returns:
+            Dictionary with blob count, stored bytes and referenced bytes
+        """
+        blobs = 0
+        stored_bytes = 0
+        referenced_bytes = 0
+        for path in self.root.glob("??/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            blobs += 1
+            stored_bytes += stat.st_size
+            referenced_bytes += stat.st_size * max(stat.st_nlink - 1, 0)
+        return {
+            "blobs": blobs,
+            "stored_bytes": stored_bytes,
+            "referenced_bytes": referenced_bytes
+        }
+
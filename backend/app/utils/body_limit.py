@@ -0,0 +1,65 @@
+"""
+Request body size limits for upload routes.
+
+Starlette parses a multipart body (spooling file parts to temporary files)
+before the endpoint runs, so a size check inside the endpoint only fires
+after the whole upload has been received. This middleware enforces the
+limit while the body arrives instead.
+"""
+from typing import Dict
+import logging
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware rejecting oversized request bodies with 413.
+
+    A Content-Length above the limit is rejected before any of the body is
+    read. Bodies without one (chunked uploads) are counted as they are
+    received and cut off as soon as they pass the limit.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        """
+        Initialize body size limit middleware.
+
+        Args:
+            app: ASGI application
+            limits: Request path -> maximum body size in bytes
+        """
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body too large. Maximum size: {limit} bytes"
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            logger.warning(f"Rejected {scope['path']} upload of {int(content_length)} bytes")
+            await JSONResponse(status_code=413, content={"detail": detail})(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPExceptions from body parsing as they are
+                    logger.warning(f"Rejected {scope['path']} upload after {received} bytes")
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,359 @@
+"""
+Streaming code point frequency scanning of text, HTML and JSON corpora.
+"""
+import codecs
+import json
+import mmap
+import os
+import re
+import tarfile
+import unicodedata
+import zipfile
+from collections import Counter
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+# File kinds by suffix; anything else (images, scripts, fonts) is skipped
+HTML_SUFFIXES = {".html", ".htm", ".xhtml", ".xml", ".svg"}
+JSON_SUFFIXES = {".json", ".webmanifest"}
+TEXT_SUFFIXES = {".txt", ".md", ".markdown", ".csv", ".tsv", ".po", ".strings", ".yml", ".yaml", ".srt", ".vtt"}
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+# Elements whose content is never rendered with the page font
+HTML_SKIP_ELEMENTS = {"script", "style"}
+# Attributes whose values are shown to users
+HTML_TEXT_ATTRIBUTES = {"alt", "title", "placeholder", "aria-label", "label"}
+
+# Unterminated JSON string data kept between chunks before it is counted as-is
+_MAX_PENDING_JSON = 64 * CHUNK_SIZE
+
+# A JSON string literal, optionally followed by the colon that makes it a key
+_JSON_STRING = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"(\s*:)?', re.S)
+
+# Categories never worth keeping in a subset: controls, surrogates, unassigned
+_EXCLUDED_CATEGORIES = {"Cc", "Cs", "Cn"}
+
+
+def corpus_kind(name: str) -> Optional[str]:
+    """
+    Classify a corpus file by name.
+
+    Args:
+        name: File name or path
+
+    Returns:
+        "archive", "html", "json", "text", or None for files that are skipped
+    """
+    lower = name.lower()
+    if lower.endswith(ARCHIVE_SUFFIXES):
+        return "archive"
+    suffix = Path(lower).suffix
+    if suffix in HTML_SUFFIXES:
+        return "html"
+    if suffix in JSON_SUFFIXES:
+        return "json"
+    if suffix in TEXT_SUFFIXES:
+        return "text"
+    return None
+
+
+class _TextSink:
+    """Counts every character"""
+
+    def __init__(self, counts: Counter):
+        self.counts = counts
+
+    def feed(self, text: str):
+        self.counts.update(text)
+
+    def close(self):
+        pass
+
+
+class _HTMLSink(HTMLParser):
+    """Counts rendered text and user-visible attribute values, skipping scripts and styles"""
+
+    def __init__(self, counts: Counter):
+        super().__init__(convert_charrefs=True)
+        self.counts = counts
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in HTML_SKIP_ELEMENTS:
+            self._skip_depth += 1
+            return
+        for name, value in attrs:
+            if value and name in HTML_TEXT_ATTRIBUTES:
+                self.counts.update(value)
+
+    def handle_endtag(self, tag):
+        if tag in HTML_SKIP_ELEMENTS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.counts.update(data)
+
+
+class _JSONSink:
+    """
+    Counts the characters of JSON string values (not keys).
+
+    Works on arbitrary chunks without parsing the document, so JSON Lines,
+    concatenated documents and very large files are handled in bounded
+    memory. Only an unterminated string at the end of a chunk is carried
+    over.
+    """
+
+    def __init__(self, counts: Counter):
+        self.counts = counts
+        self._pending = ""
+
+    def feed(self, text: str, final: bool = False):
+        buffer = self._pending + text
+        position = 0
+        for match in _JSON_STRING.finditer(buffer):
+            # The colon that marks a key may still be in the next chunk
+            if not final and not buffer[match.end():].strip():
+                break
+            position = match.end()
+            if match.group(2):
+                continue
+            value = match.group(1)
+            if "\\" in value:
+                try:
+                    value = json.loads(f'"{value}"')
+                except ValueError:
+                    pass
+            self.counts.update(value)
+
+        rest = buffer[position:]
+        quote = rest.find('"')
+        self._pending = rest[quote:] if quote >= 0 else ""
+        if len(self._pending) > _MAX_PENDING_JSON:
+            # Not valid JSON; count the text rather than buffering without bound
+            self.counts.update(self._pending)
+            self._pending = ""
+
+    def close(self):
+        self.feed("", final=True)
+        self._pending = ""
+
+
+_SINKS = {"html": _HTMLSink, "json": _JSONSink, "text": _TextSink}
+
+
+def _decoder_for(head: bytes):
+    """Incremental decoder for a document, honoring a UTF-16 byte order mark"""
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return codecs.getincrementaldecoder("utf-16")(errors="ignore")
+    # utf-8-sig drops a UTF-8 BOM; undecodable bytes are skipped
+    return codecs.getincrementaldecoder("utf-8-sig")(errors="ignore")
+
+
+class CorpusScanner:
+    """
+    Accumulates code point frequencies over text, HTML and JSON documents.
+
+    Documents are decoded incrementally in fixed-size chunks (files on disk
+    are memory-mapped), so memory use is bounded by the chunk size and the
+    number of distinct code points, not by corpus size. Zip and tar archives
+    (e.g. a built site) are scanned member by member without extracting them;
+    nested archives are skipped.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize scanner.
+
+        Args:
+            chunk_size: Bytes decoded at a time
+        """
+        self.chunk_size = chunk_size
+        self.counts: Counter = Counter()
+        self.files_scanned = 0
+        self.files_skipped = 0
+        self.bytes_scanned = 0
+
+    def scan_path(self, path: str):
+        """
+        Scan a file, an archive or every file below a directory.
+
+        Args:
+            path: Path to scan
+        """
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    self.scan_path(os.path.join(root, name))
+            return
+
+        kind = corpus_kind(path)
+        if kind is None:
+            self.files_skipped += 1
+            return
+        if kind == "archive":
+            with open(path, "rb") as f:
+                self.scan_archive(f, path)
+            return
+
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                self.files_scanned += 1
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self._scan_chunks(
+                    (mapped[offset:offset + self.chunk_size] for offset in range(0, len(mapped), self.chunk_size)),
+                    kind
+                )
+
+    def scan_stream(self, stream: IO[bytes], name: str):
+        """
+        Scan an open binary stream, e.g. an uploaded file.
+
+        Args:
+            stream: Readable binary stream (must be seekable for zip archives)
+            name: File name, used to pick the document kind
+        """
+        kind = corpus_kind(name)
+        if kind is None:
+            self.files_skipped += 1
+        elif kind == "archive":
+            self.scan_archive(stream, name)
+        else:
+            self._scan_chunks(iter(lambda: stream.read(self.chunk_size), b""), kind)
+
+    def scan_archive(self, fileobj: IO[bytes], name: str):
+        """
+        Scan the members of a zip or tar archive.
+
+        Args:
+            fileobj: Open archive
+            name: Archive file name
+        """
+        if name.lower().endswith(".zip"):
+            with zipfile.ZipFile(fileobj) as archive:
+                for info in archive.infolist():
+                    kind = corpus_kind(info.filename)
+                    if info.is_dir():
+                        continue
+                    if kind is None or kind == "archive":
+                        self.files_skipped += 1
+                        continue
+                    with archive.open(info) as member:
+                        self._scan_chunks(iter(lambda: member.read(self.chunk_size), b""), kind)
+            return
+
+        # Stream mode reads the tar sequentially, compressed or not
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for info in archive:
+                if not info.isfile():
+                    continue
+                kind = corpus_kind(info.name)
+                if kind is None or kind == "archive":
+                    self.files_skipped += 1
+                    continue
+                member = archive.extractfile(info)
+                self._scan_chunks(iter(lambda: member.read(self.chunk_size), b""), kind)
+
+    def select(self, min_count: int = 1, max_characters: Optional[int] = None) -> str:
+        """
+        Pick the characters to subset to.
+
+        Control characters, surrogates and unassigned code points are left out.
+
+        Args:
+            min_count: Minimum number of occurrences
+            max_characters: Keep only this many of the most frequent characters
+
+        Returns:
+            Selected characters in code point order
+        """
+        selected = [
+            (char, count) for char, count in self.counts.items()
+            if count >= min_count and unicodedata.category(char) not in _EXCLUDED_CATEGORIES
+        ]
+        if max_characters is not None:
+            selected = sorted(selected, key=lambda pair: (-pair[1], pair[0]))[:max_characters]
+        return "".join(sorted(char for char, _ in selected))
+
+    def coverage(self, characters: str, font_characters: Set[str], missing_limit: int = 100) -> Dict[str, Any]:
+        """
+        Compare selected characters with a font's cmap.
+
+        Args:
+            characters: Selected characters
+            font_characters: Characters the font maps
+            missing_limit: Number of missing characters to list, most frequent first
+
+        Returns:
+            Dictionary with covered/missing counts, the share of all character
+            occurrences the font covers, and the most frequent missing characters
+        """
+        missing = [char for char in characters if char not in font_characters]
+        missing.sort(key=lambda char: (-self.counts[char], char))
+
+        occurrences = sum(self.counts[char] for char in characters)
+        missing_occurrences = sum(self.counts[char] for char in missing)
+
+        return {
+            "characters": len(characters),
+            "covered": len(characters) - len(missing),
+            "missing_count": len(missing),
+            "occurrence_coverage": round(1 - missing_occurrences / occurrences, 6) if occurrences else 1.0,
+            "missing": [
+                {"character": char, "codepoint": f"U+{ord(char):04X}", "count": self.counts[char]}
+                for char in missing[:missing_limit]
+            ],
+        }
+
+    def frequencies(self, limit: Optional[int] = None) -> List[List[Any]]:
+        """
+        Most frequent characters.
+
+        Args:
+            limit: Number of entries (default: all)
+
+        Returns:
+            [character, count] pairs, most frequent first
+        """
+        return [[char, count] for char, count in self.counts.most_common(limit)]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get scan statistics.
+
+        Returns:
+            Dictionary with file and byte counts and character totals
+        """
+        return {
+            "files_scanned": self.files_scanned,
+            "files_skipped": self.files_skipped,
+            "bytes_scanned": self.bytes_scanned,
+            "total_characters": sum(self.counts.values()),
+            "distinct_characters": len(self.counts),
+        }
+
+    def _scan_chunks(self, chunks: Iterable[bytes], kind: str):
+        """Decode a document chunk by chunk and feed it to the sink for its kind"""
+        sink = _SINKS[kind](self.counts)
+        decoder = None
+        for chunk in chunks:
+            if decoder is None:
+                decoder = _decoder_for(chunk[:2])
+            self.bytes_scanned += len(chunk)
+            text = decoder.decode(chunk)
+            if text:
+                sink.feed(text)
+        if decoder is not None:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                sink.feed(tail)
+        sink.close()
+        self.files_scanned += 1
@@ -0,0 +1,209 @@
+"""
+Memory-budgeted in-process cache of decoded web fonts and derived fonts.
+"""
+import copy
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Any, BinaryIO, Callable, Dict, Optional, Union
+import logging
+import sys
+
+from fontTools.ttLib import TTFont
+
+logger = logging.getLogger(__name__)
+
+# WOFF and WOFF2 signatures; other sources are opened directly
+_WEB_FONT_SIGNATURES = (b"wOFF", b"wOF2")
+
+
+def _is_web_font(source: Union[str, BinaryIO]) -> bool:
+    """Check the container signature without moving a file object's position"""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read(4) in _WEB_FONT_SIGNATURES
+    position = source.tell()
+    try:
+        return source.read(4) in _WEB_FONT_SIGNATURES
+    finally:
+        source.seek(position)
+
+
+class _CachedFont:
+    """Decoded sfnt data plus the container details needed to reproduce the source"""
+
+    __slots__ = ("sfnt", "flavor", "flavor_data")
+
+    def __init__(self, sfnt: bytes, flavor: Optional[str], flavor_data: Any):
+        self.sfnt = sfnt
+        self.flavor = flavor
+        self.flavor_data = flavor_data
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the entry: the sfnt data plus WOFF metadata and private data"""
+        size = sys.getsizeof(self.sfnt)
+        for name in ("metaData", "privData"):
+            data = getattr(self.flavor_data, name, None)
+            if data:
+                size += sys.getsizeof(data)
+        return size
+
+
+class FontCache:
+    """
+    LRU cache of decoded fonts keyed by content hash.
+
+    Entries hold sfnt table data that is expensive to produce: WOFF and
+    WOFF2 sources after the container has been decoded (zlib, Brotli and
+    glyf/loca transform reversal), and derived fonts such as variable font
+    instances. open() and open_derived() hand out a fresh TTFont over those
+    immutable bytes, so every caller gets an independent copy it may subset
+    in place.
+
+    Tables are still decompiled on every use. Deep-copying or unpickling a
+    decompiled TTFont measured slower than decompiling again, so plain
+    TTF/OTF sources gain nothing from a cached copy and open() reads them
+    straight from the source instead, loading glyphs lazily. Those opens
+    are counted as bypassed rather than as hits or misses.
+
+    The memory budget counts the bytes held by the entries.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize font cache.
+
+        Args:
+            max_bytes: Approximate memory budget for cached font data
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CachedFont]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    def open(self, key: str, font_path: Union[str, BinaryIO]) -> TTFont:
+        """
+        Get a private copy of a source font, decoding it on first use.
+
+        Only WOFF and WOFF2 sources are cached; other fonts are opened
+        lazily from the source on every call.
+
+        Args:
+            key: Content hash of the font file
+            font_path: Path to the font file, or a file object over its
+                contents (read on a cache miss)
+
+        Returns:
+            TTFont the caller owns and may modify
+        """
+        if not _is_web_font(font_path):
+            with self._lock:
+                self.bypassed += 1
+            return TTFont(font_path, lazy=True)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            entry = self._decode(font_path)
+            self._store(key, entry)
+
+        return self._materialize(entry)
+
+    def open_derived(self, key: str, build: Callable[[], TTFont]) -> TTFont:
+        """
+        Get a private copy of a font derived from a source font, building it on first use.
+
+        Used for intermediates that are expensive to produce and shared by
+        several subsets, such as variable font instances. Derived entries
+        share the memory budget with source fonts.
+
+        Args:
+            key: Cache key identifying the source font and the derivation
+            build: Produces the derived font on a cache miss; the cache takes
+                ownership of the returned TTFont
+
+        Returns:
+            TTFont the caller owns and may modify
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            entry = self._snapshot(build())
+            self._store(key, entry)
+
+        return self._materialize(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction/bypass counts and occupancy
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bypassed": self.bypassed,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _decode(self, font_path: Union[str, BinaryIO]) -> _CachedFont:
+        return self._snapshot(TTFont(font_path))
+
+    def _snapshot(self, font: TTFont) -> _CachedFont:
+        flavor, flavor_data = font.flavor, font.flavorData
+
+        # Re-serialize as plain sfnt; untouched tables are copied through raw
+        font.flavor = None
+        buffer = BytesIO()
+        font.save(buffer, reorderTables=False)
+        font.close()
+
+        return _CachedFont(buffer.getvalue(), flavor, flavor_data)
+
+    def _materialize(self, entry: _CachedFont) -> TTFont:
+        font = TTFont(BytesIO(entry.sfnt))
+        # Restore the source container so saving reproduces the original flavor
+        font.flavor = entry.flavor
+        font.flavorData = copy.copy(entry.flavor_data)
+        return font
+
+    def _store(self, key: str, entry: _CachedFont):
+        size = entry.nbytes
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous.nbytes
+            self._entries[key] = entry
+            self._total_bytes += size
+
+            while self._total_bytes > self.max_bytes and self._entries:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.nbytes
+                self.evictions += 1
+                logger.info(f"Evicted parsed font from cache: {evicted_key}")
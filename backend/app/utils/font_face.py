@@ -0,0 +1,55 @@
+"""
+@font-face stylesheet generation.
+"""
+from typing import Iterable, List, Tuple
+
+# Output format -> CSS format() hint, in order of preference
+CSS_FORMATS = {"woff2": "woff2", "woff": "woff", "ttf": "truetype"}
+
+
+def _css_string(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def font_face_rule(
+    family: str,
+    sources: Iterable[Tuple[str, str]],
+    unicode_range: str,
+    weight: str = "400",
+    style: str = "normal",
+    display: str = "swap"
+) -> str:
+    """
+    Build one @font-face rule.
+
+    Args:
+        family: font-family name
+        sources: (url, output format) pairs; ordered by preference in the rule
+        unicode_range: unicode-range value
+        weight: font-weight descriptor (a single weight or a "min max" range)
+        style: font-style descriptor
+        display: font-display descriptor
+
+    Returns:
+        CSS text of the rule
+    """
+    ordered = sorted(
+        (pair for pair in sources if pair[1] in CSS_FORMATS),
+        key=lambda pair: list(CSS_FORMATS).index(pair[1])
+    )
+    src = ",\n       ".join(
+        f"url({_css_string(url)}) format({_css_string(CSS_FORMATS[format_type])})"
+        for url, format_type in ordered
+    )
+
+    lines: List[str] = [
+        "@font-face {",
+        f"  font-family: {_css_string(family)};",
+        f"  font-style: {style};",
+        f"  font-weight: {weight};",
+        f"  font-display: {display};",
+        f"  src: {src};",
+        f"  unicode-range: {unicode_range};",
+        "}",
+    ]
+    return "\n".join(lines)
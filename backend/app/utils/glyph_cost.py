@@ -0,0 +1,693 @@
+"""
+Per-glyph byte cost index for estimating subset sizes without running the subsetter.
+"""
+import json
+import math
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from fontTools.ttLib import TTFont, getTableClass, newTable, woff2
+from fontTools.ttLib.tables._c_m_a_p import splitRange
+
+from app.utils.subset_cache import SubsetCache
+
+if TYPE_CHECKING:
+    from fontTools import subset
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Tables whose subset size is computed from the glyph set rather than copied
+GLYPH_TABLES = {"glyf", "loca", "CFF ", "CFF2", "gvar", "post", "cmap", "kern"}
+# Tables that shrink roughly in proportion to the number of glyphs kept
+SCALED_TABLES = {"hmtx", "vmtx", "HVAR", "VVAR", "GDEF", "VORG"}
+
+# Tables that reference name IDs the subsetter keeps
+_NAME_REFERENCING_TABLES = ("fvar", "STAT", "CPAL")
+
+# Glyph data sample sizes used to measure how compression ratios change with size
+_SAMPLE_SIZES = (512, 2 * 1024, 8 * 1024, 32 * 1024, 128 * 1024)
+# Largest glyph data sample compressed with Brotli
+_WOFF2_CURVE_LIMIT = 32 * 1024
+# Bytes of each table compressed to measure its ratio
+_TABLE_SAMPLE_SIZE = 256 * 1024
+# Bytes of each table fed to Brotli to compare it with per-table zlib
+_WOFF2_SAMPLE_SIZE = 16 * 1024
+
+# fontTools' WOFF zlib level
+_WOFF_ZLIB_LEVEL = 6
+# WOFF2's glyf transform typically saves this much over plain Brotli (loca is dropped entirely)
+_WOFF2_TRANSFORM_GAIN = 0.9
+
+# TrueType composite glyph flags
+_ARG_1_AND_2_ARE_WORDS = 0x0001
+_WE_HAVE_A_SCALE = 0x0008
+_MORE_COMPONENTS = 0x0020
+_WE_HAVE_AN_X_AND_Y_SCALE = 0x0040
+_WE_HAVE_A_TWO_BY_TWO = 0x0080
+_WE_HAVE_INSTRUCTIONS = 0x0100
+
+
+def _padded(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def _parse_glyph(data: bytes, hinting: bool) -> Tuple[bytes, List[int]]:
+    """
+    List the components of a glyf record, stripping hinting instructions if requested.
+
+    Returns:
+        Tuple of (glyph data as the subsetter writes it, component glyph IDs)
+    """
+    if len(data) < 10:
+        return data, []
+
+    contours = struct.unpack(">h", data[:2])[0]
+    if contours >= 0:
+        if hinting:
+            return data, []
+        offset = 10 + 2 * contours
+        instruction_length = struct.unpack(">H", data[offset:offset + 2])[0]
+        return data[:offset] + b"\0\0" + data[offset + 2 + instruction_length:], []
+
+    components = []
+    offset = 10
+    flags = _MORE_COMPONENTS
+    while flags & _MORE_COMPONENTS:
+        flags, glyph_id = struct.unpack(">HH", data[offset:offset + 4])
+        components.append(glyph_id)
+        offset += 4 + (4 if flags & _ARG_1_AND_2_ARE_WORDS else 2)
+        if flags & _WE_HAVE_A_SCALE:
+            offset += 2
+        elif flags & _WE_HAVE_AN_X_AND_Y_SCALE:
+            offset += 4
+        elif flags & _WE_HAVE_A_TWO_BY_TWO:
+            offset += 8
+    if flags & _WE_HAVE_INSTRUCTIONS and not hinting:
+        return data[:offset], components
+    return data, components
+
+
+def _gvar_sizes(data: bytes, glyph_count: int) -> List[int]:
+    """Bytes of glyph variation data per glyph, from the gvar offset array"""
+    flags, data_offset = struct.unpack(">HI", data[14:20])
+    count = min(glyph_count, struct.unpack(">H", data[12:14])[0])
+    if flags & 1:
+        offsets = struct.unpack(f">{count + 1}I", data[20:20 + 4 * (count + 1)])
+    else:
+        offsets = [value * 2 for value in struct.unpack(f">{count + 1}H", data[20:20 + 2 * (count + 1)])]
+    sizes = [offsets[i + 1] - offsets[i] for i in range(count)]
+    return sizes + [0] * (glyph_count - count)
+
+
+def _ratio_curve(sample: bytes, compress, sizes: Iterable[int] = _SAMPLE_SIZES) -> List[Tuple[int, float]]:
+    """Compression ratio of growing prefixes of a sample"""
+    curve = []
+    for size in sizes:
+        prefix = sample[:size]
+        if not prefix:
+            break
+        curve.append((len(prefix), len(compress(prefix)) / len(prefix)))
+        if len(prefix) < size:
+            break
+    return curve or [(1, 1.0)]
+
+
+def _ratio_at(curve: List[List[float]], size: float) -> float:
+    """Interpolate a compression ratio for a data size (log scale in size)"""
+    if size <= curve[0][0]:
+        return curve[0][1]
+    for (size_a, ratio_a), (size_b, ratio_b) in zip(curve, curve[1:]):
+        if size <= size_b:
+            weight = (math.log(size) - math.log(size_a)) / (math.log(size_b) - math.log(size_a))
+            return ratio_a + (ratio_b - ratio_a) * weight
+    return curve[-1][1]
+
+
+def _woff2_curve(sample: bytes, woff_curve: List[Tuple[int, float]]) -> List[Tuple[int, float]]:
+    """
+    Brotli ratio curve for glyph data.
+
+    Brotli at quality 11 is slow, so only the smaller samples are compressed;
+    larger sizes follow the zlib curve's trend.
+    """
+    curve = _ratio_curve(sample, _brotli_compress, [size for size in _SAMPLE_SIZES if size <= _WOFF2_CURVE_LIMIT])
+    for size, ratio in woff_curve[len(curve):]:
+        last_size, last_ratio = curve[-1]
+        curve.append((size, last_ratio * ratio / _ratio_at(woff_curve, last_size)))
+    return curve
+
+
+def _zlib_ratio(data: bytes) -> float:
+    """WOFF compression ratio of a table (WOFF stores tables raw when zlib does not help)"""
+    sample = data[:_TABLE_SAMPLE_SIZE]
+    if not sample:
+        return 1.0
+    return min(1.0, len(zlib.compress(sample, _WOFF_ZLIB_LEVEL)) / len(sample))
+
+
+def _dropped_tables(font: TTFont, options: "subset.Options") -> Set[str]:
+    """Tables the subsetter removes before or while subsetting glyphs"""
+    # Options come from fontTools.subset, which has added subset_glyphs to
+    # the table classes it can subset by the time we get here
+    dropped = set()
+    for tag in font.reader.keys():
+        clazz = getTableClass(tag)
+        if (
+            tag.strip() in options.drop_tables
+            or (tag.strip() in options.hinting_tables and not options.hinting)
+            or (tag == "kern" and not options.legacy_kern and "GPOS" in font.reader)
+            or (
+                tag.strip() not in options.no_subset_tables
+                and not hasattr(clazz, "subset_glyphs")
+                and not options.passthrough_tables
+            )
+        ):
+            dropped.add(tag)
+    return dropped
+
+
+def _pruned_name_table(font: TTFont, options: "subset.Options", kept: Iterable[str]) -> bytes:
+    """The name table as the subsetter writes it (records are pruned by ID, platform and language)"""
+    shell = TTFont()
+    for tag in _NAME_REFERENCING_TABLES:
+        if tag in kept:
+            shell[tag] = font[tag]
+    name = newTable("name")
+    name.decompile(font.reader["name"], font)
+    shell["name"] = name
+    name.prune_post_subset(shell, options)
+    return name.compile(shell)
+
+
+def _format4_size(pairs: List[Tuple[int, int]]) -> int:
+    """Size of a cmap format 4 subtable mapping sorted BMP (code point, glyph ID) pairs"""
+    if not pairs:
+        return 24
+    cmap = dict(pairs)
+    # Split runs of consecutive code points into segments the way fontTools does
+    ends = []
+    starts = [pairs[0][0]]
+    last = pairs[0][0]
+    for code_point, _ in pairs[1:]:
+        if code_point == last + 1:
+            last = code_point
+            continue
+        split_starts, split_ends = splitRange(starts[-1], last, cmap)
+        starts.extend(split_starts)
+        ends.extend(split_ends)
+        starts.append(code_point)
+        last = code_point
+    split_starts, split_ends = splitRange(starts[-1], last, cmap)
+    starts.extend(split_starts)
+    ends.extend(split_ends)
+
+    # Segments whose glyph IDs are not consecutive use the glyph ID array
+    glyph_ids = 0
+    for start, end in zip(starts, ends):
+        if cmap[end] - cmap[start] != end - start or any(
+            cmap[code_point + 1] != cmap[code_point] + 1 for code_point in range(start, end)
+        ):
+            glyph_ids += end - start + 1
+    return 16 + 8 * (len(ends) + 1) + 2 * glyph_ids
+
+
+def _format12_size(pairs: List[Tuple[int, int]]) -> int:
+    """Size of a cmap format 12 subtable mapping sorted (code point, glyph ID) pairs"""
+    groups = 0
+    previous = None
+    for code_point, gid in pairs:
+        if previous is None or code_point != previous[0] + 1 or gid != previous[1] + 1:
+            groups += 1
+        previous = (code_point, gid)
+    return 16 + 12 * groups
+
+
+def _subtable_size(format_type: int, pairs: List[Tuple[int, int]]) -> int:
+    if format_type == 4:
+        return _format4_size([pair for pair in pairs if pair[0] <= 0xFFFF])
+    return _format12_size(pairs)
+
+
+class GlyphCostIndex:
+    """
+    Byte costs of a font's glyphs, used to estimate subset sizes in milliseconds.
+
+    Built once per font from the raw tables and the service's subsetter
+    options: glyf records or CFF charstrings plus a share of the subroutines,
+    glyph variation data, glyph names, composite components (for closure),
+    kern pairs and the cmap subtables the subsetter keeps. Tables that do not
+    depend on the glyph set are counted at the size the subsetter writes them.
+    WOFF sizes use each table's own zlib ratio, with the glyph data ratio
+    measured on samples of several sizes and interpolated; WOFF2 sizes scale
+    those by how much better Brotli did on the same font.
+
+    Uncompressed sizes are usually within a few percent; compressed sizes are
+    usually within 10%, less accurate for subsets of a few hundred bytes
+    where container overhead and short-input compression dominate.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Initialize from serialized index data.
+
+        Args:
+            data: Dictionary produced by build() or to_json()
+        """
+        self.data = data
+        self.cmap: Dict[int, int] = dict(zip(data["cmap_codepoints"], data["cmap_glyphs"]))
+        self.components: Dict[int, List[int]] = {int(gid): parts for gid, parts in data["components"].items()}
+
+    @classmethod
+    def build(cls, font: TTFont, options: "subset.Options") -> "GlyphCostIndex":
+        """
+        Build the index from an open font.
+
+        Args:
+            font: Font to index (may be opened lazily)
+            options: Subsetter options the estimates should match
+
+        Returns:
+            GlyphCostIndex
+        """
+        glyph_order = font.getGlyphOrder()
+        glyph_count = len(glyph_order)
+        glyph_ids = {name: gid for gid, name in enumerate(glyph_order)}
+        dropped = _dropped_tables(font, options)
+        kept = [tag for tag in font.reader.keys() if tag not in dropped]
+
+        costs = [0] * glyph_count
+        variation_costs = [0] * glyph_count
+        name_costs = [0] * glyph_count
+        components: Dict[str, List[int]] = {}
+        glyph_data: List[Tuple[int, bytes]] = []
+        outline_tag = None
+        fixed_outline_bytes = 0
+
+        # Unicode subtables keep the requested code points and share identical data;
+        # the others keep only glyphs requested by name, so none survive
+        cmap: Dict[int, int] = {}
+        unicode_formats: List[int] = []
+        variation_selector_bytes = 0
+        if "cmap" in kept:
+            for table in font["cmap"].tables:
+                if table.format == 14:
+                    variation_selector_bytes += 8 + getattr(table, "length", 0)
+                elif table.format != 0 and table.isUnicode():
+                    unicode_formats.append(table.format)
+                    for code_point, glyph_name in table.cmap.items():
+                        if glyph_name in glyph_ids:
+                            cmap.setdefault(code_point, glyph_ids[glyph_name])
+
+        if "glyf" in font and "loca" in font:
+            outline_tag = "glyf"
+            raw_glyf = font.reader["glyf"]
+            offsets = font["loca"].locations
+            for gid in range(min(glyph_count, len(offsets) - 1)):
+                record = raw_glyf[offsets[gid]:offsets[gid + 1]]
+                if not record:
+                    continue
+                record, parts = _parse_glyph(record, options.hinting)
+                # Glyphs are padded to two bytes so loca can use short offsets
+                costs[gid] = (len(record) + 1) & ~1
+                if parts:
+                    components[str(gid)] = parts
+                glyph_data.append((gid, record))
+        else:
+            for tag in ("CFF ", "CFF2"):
+                if tag not in font:
+                    continue
+                outline_tag = tag
+                cff = font[tag].cff
+                top = cff.topDictIndex[0]
+                index = top.CharStrings.charStringsIndex
+                lengths = [index.offsets[i + 1] - index.offsets[i] for i in range(len(index.offsets) - 1)]
+                charstring_bytes = sum(lengths)
+
+                # Subroutines are shared; charge each glyph in proportion to its charstring
+                subr_bytes = sum(
+                    subrs.offsets[-1] - subrs.offsets[0]
+                    for subrs in [cff.GlobalSubrs] + [
+                        private.Subrs for private in _private_dicts(top) if hasattr(private, "Subrs")
+                    ]
+                    if getattr(subrs, "offsets", None)
+                )
+                subr_share = subr_bytes / charstring_bytes if charstring_bytes else 0
+
+                raw_cff = font.reader[tag]
+                for gid, length in enumerate(lengths[:glyph_count]):
+                    # Charstring, subroutine share, INDEX offset and charset entry
+                    costs[gid] = round(length * (1 + subr_share)) + 4
+                    start = index.offsetBase + index.offsets[gid]
+                    glyph_data.append((gid, raw_cff[start:start + length]))
+                if tag == "CFF ":
+                    for gid, name in enumerate(glyph_order):
+                        name_costs[gid] = len(name) + 2
+                fixed_outline_bytes = max(
+                    0, len(raw_cff) - charstring_bytes - subr_bytes - 4 * len(lengths) - sum(name_costs)
+                )
+                break
+
+        if "gvar" in kept:
+            variation_costs = _gvar_sizes(font.reader["gvar"], glyph_count)
+
+        post_format = None
+        if "post" in kept:
+            post = font["post"]
+            post_format = post.formatType
+            if post_format == 2 and options.glyph_names:
+                standard = set(_standard_mac_glyph_names())
+                for gid, name in enumerate(glyph_order):
+                    name_costs[gid] = 2 + (0 if name in standard else len(name) + 1)
+
+        kern_pairs: List[int] = []
+        if "kern" in kept:
+            for subtable in font["kern"].kernTables:
+                for (left, right) in getattr(subtable, "kernTable", {}):
+                    if left in glyph_ids and right in glyph_ids:
+                        kern_pairs.extend((glyph_ids[left], glyph_ids[right]))
+
+        tables = {tag: len(font.reader[tag]) for tag in kept}
+        table_data = {tag: font.reader[tag] for tag in kept}
+        if "name" in kept:
+            table_data["name"] = _pruned_name_table(font, options, kept)
+            tables["name"] = len(table_data["name"])
+
+        # Glyph data in cmap order approximates what a typical subset keeps
+        ordered = dict(glyph_data)
+        sample = b"".join(ordered.pop(gid) for gid in sorted(set(cmap.values())) if gid in ordered)
+        sample += b"".join(ordered.values())
+
+        woff_curve = _ratio_curve(sample, lambda data: zlib.compress(data, _WOFF_ZLIB_LEVEL))
+        woff_ratios = {tag: _zlib_ratio(data) for tag, data in table_data.items()}
+        # WOFF2 compresses all tables as one Brotli stream; compare it with per-table zlib
+        heads = [data[:_WOFF2_SAMPLE_SIZE] for tag, data in sorted(table_data.items()) if tag not in ("glyf", "loca")]
+        zlib_bytes = sum(min(len(head), len(zlib.compress(head, _WOFF_ZLIB_LEVEL))) for head in heads)
+        woff2_factor = len(_brotli_compress(b"".join(heads))) / zlib_bytes if zlib_bytes else 1.0
+
+        return cls({
+            "version": INDEX_VERSION,
+            "glyph_count": glyph_count,
+            "outline": outline_tag,
+            "costs": costs,
+            "variation_costs": variation_costs,
+            "name_costs": name_costs,
+            "post_format": post_format,
+            "components": components,
+            "kern_pairs": kern_pairs,
+            "kern_pair_count": len(kern_pairs) // 2,
+            "cmap_codepoints": list(cmap.keys()),
+            "cmap_glyphs": list(cmap.values()),
+            "cmap_formats": unicode_formats,
+            "cmap_variation_bytes": variation_selector_bytes,
+            "tables": tables,
+            "fixed_outline_bytes": fixed_outline_bytes,
+            "woff_curve": woff_curve,
+            "woff2_curve": _woff2_curve(sample, woff_curve),
+            "woff_ratios": woff_ratios,
+            "woff2_factor": woff2_factor,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "GlyphCostIndex":
+        """
+        Load a serialized index.
+
+        Args:
+            raw: JSON produced by to_json()
+
+        Returns:
+            GlyphCostIndex
+        """
+        return cls(json.loads(raw))
+
+    def to_json(self) -> str:
+        """
+        Serialize the index.
+
+        Returns:
+            Compact JSON string
+        """
+        return json.dumps(self.data, separators=(",", ":"))
+
+    def closure(self, code_points: Iterable[int]) -> Tuple[Set[int], int]:
+        """
+        Resolve code points to the glyphs a subset would keep.
+
+        Args:
+            code_points: Requested code points
+
+        Returns:
+            Tuple of (glyph IDs including composite components and the
+            glyphs the subsetter always keeps, number of code points the
+            font maps)
+        """
+        glyph_count = self.data["glyph_count"]
+        # .notdef, plus .null, CR and space for TrueType (recommended glyphs)
+        glyphs = set(range(min(glyph_count, 4 if self.data["outline"] == "glyf" else 1)))
+
+        mapped = 0
+        for code_point in code_points:
+            gid = self.cmap.get(code_point)
+            if gid is not None:
+                glyphs.add(gid)
+                mapped += 1
+
+        pending = [gid for gid in glyphs if gid in self.components]
+        while pending:
+            for component in self.components.get(pending.pop(), ()):
+                if component not in glyphs:
+                    glyphs.add(component)
+                    if component in self.components:
+                        pending.append(component)
+
+        return glyphs, mapped
+
+    def estimate(self, code_points: Iterable[int]) -> Dict[str, int]:
+        """
+        Estimate subset sizes for a set of code points.
+
+        Args:
+            code_points: Requested code points
+
+        Returns:
+            Dictionary with glyph_count, character_count (code points the font
+            maps) and estimated ttf, woff and woff2 sizes in bytes
+        """
+        code_points = sorted(set(code_points))
+        glyphs, mapped = self.closure(code_points)
+        table_sizes = self.table_sizes(glyphs, code_points)
+        data = self.data
+        outline = data["outline"]
+        ratios = data["woff_ratios"]
+
+        ttf = 12 + 16 * len(table_sizes)
+        woff = 44 + 20 * len(table_sizes)
+        woff2 = 48 + 4 * len(table_sizes)
+        for tag, size in table_sizes.items():
+            ttf += _padded(math.ceil(size))
+            ratio = ratios.get(tag, 1.0)
+            if tag == outline:
+                # Glyph data follows the size-dependent curve; CFF headers, strings
+                # and private DICTs compress like the rest of the table
+                glyph_bytes = min(size, sum(data["costs"][gid] for gid in glyphs))
+                other_bytes = size - glyph_bytes
+                woff += _padded(math.ceil(
+                    glyph_bytes * _ratio_at(data["woff_curve"], glyph_bytes) + other_bytes * ratio
+                ))
+                gain = _WOFF2_TRANSFORM_GAIN if outline == "glyf" else 1.0
+                woff2 += (
+                    glyph_bytes * _ratio_at(data["woff2_curve"], glyph_bytes) * gain
+                    + other_bytes * ratio * data["woff2_factor"]
+                )
+            else:
+                woff += _padded(math.ceil(size * ratio))
+                if not (tag == "loca" and outline == "glyf"):
+                    woff2 += size * ratio * data["woff2_factor"]
+
+        return {
+            "glyph_count": len(glyphs),
+            "character_count": mapped,
+            "ttf": int(ttf),
+            "woff": int(woff),
+            "woff2": _padded(math.ceil(woff2)),
+        }
+
+    def table_sizes(self, glyphs: Set[int], code_points: List[int]) -> Dict[str, float]:
+        """
+        Estimate the uncompressed size of each table in a subset.
+
+        Args:
+            glyphs: Glyph IDs kept (see closure())
+            code_points: Requested code points, sorted
+
+        Returns:
+            Dictionary of table tag to estimated bytes
+        """
+        data = self.data
+        kept = len(glyphs)
+        fraction = kept / data["glyph_count"] if data["glyph_count"] else 1.0
+
+        glyph_bytes = sum(data["costs"][gid] for gid in glyphs)
+        table_sizes: Dict[str, float] = {}
+
+        for tag, length in data["tables"].items():
+            if tag in SCALED_TABLES:
+                table_sizes[tag] = length * fraction
+            elif tag not in GLYPH_TABLES:
+                table_sizes[tag] = length
+
+        if data["outline"] == "glyf":
+            table_sizes["glyf"] = glyph_bytes
+            table_sizes["loca"] = (kept + 1) * (2 if glyph_bytes < 0x20000 else 4)
+        elif data["outline"]:
+            table_sizes[data["outline"]] = data["fixed_outline_bytes"] + glyph_bytes + sum(
+                data["name_costs"][gid] for gid in glyphs
+            )
+        if "gvar" in data["tables"]:
+            # Header and offsets; shared tuples are kept whole
+            variation_bytes = sum(data["variation_costs"][gid] for gid in glyphs)
+            shared_bytes = data["tables"]["gvar"] - sum(data["variation_costs"]) - 20 - 4 * (data["glyph_count"] + 1)
+            table_sizes["gvar"] = 20 + 4 * (kept + 1) + max(0, shared_bytes) + variation_bytes
+
+        if "post" in data["tables"]:
+            table_sizes["post"] = 32
+            if data["post_format"] == 2:
+                table_sizes["post"] += 2 + sum(data["name_costs"][gid] for gid in glyphs)
+
+        if "cmap" in data["tables"]:
+            table_sizes["cmap"] = self._cmap_size(code_points, glyphs)
+
+        if "kern" in data["tables"] and data["kern_pair_count"]:
+            pairs = data["kern_pairs"]
+            kept_pairs = sum(
+                1 for i in range(0, len(pairs), 2) if pairs[i] in glyphs and pairs[i + 1] in glyphs
+            )
+            table_sizes["kern"] = 18 + 6 * kept_pairs if kept_pairs else 0
+
+        return {tag: size for tag, size in table_sizes.items() if size}
+
+    def _cmap_size(self, code_points: List[int], glyphs: Set[int]) -> int:
+        """Size of the subset cmap for the requested (sorted) code points and kept glyphs"""
+        data = self.data
+        # Kept glyphs are renumbered in their original order
+        new_ids = {gid: new_id for new_id, gid in enumerate(sorted(glyphs))}
+        pairs = [
+            (code_point, new_ids[self.cmap[code_point]]) for code_point in code_points if code_point in self.cmap
+        ]
+        formats = list(data["cmap_formats"])
+        if 4 in formats and (not pairs or pairs[-1][0] <= 0xFFFF):
+            # Format 12 subtables with the same BMP mappings as a format 4 one are dropped
+            formats = [format_type for format_type in formats if format_type != 12]
+
+        size = 4 + data["cmap_variation_bytes"]
+        if pairs:
+            size += 8 * len(formats) + sum(_subtable_size(format_type, pairs) for format_type in set(formats))
+        return size
+
+
+def _private_dicts(top) -> List[Any]:
+    """Private DICTs of a CFF/CFF2 top DICT (one per FD for CID-keyed fonts)"""
+    if hasattr(top, "FDArray"):
+        return [fd.Private for fd in top.FDArray if hasattr(fd, "Private")]
+    return [top.Private] if hasattr(top, "Private") else []
+
+
+def _standard_mac_glyph_names() -> List[str]:
+    from fontTools.ttLib.standardGlyphOrder import standardGlyphOrder
+    return standardGlyphOrder
+
+
+def _brotli_compress(data: bytes) -> bytes:
+    if not woff2.haveBrotli:
+        return zlib.compress(data, 9)
+    return woff2.brotli.compress(data, mode=woff2.brotli.MODE_FONT, quality=11)
+
+
+class GlyphCostStore:
+    """
+    Glyph cost indexes keyed by font content hash.
+
+    Indexes are written as JSON to a size-bounded on-disk cache shared by all
+    workers and kept in a small per-process LRU once loaded.
+    """
+
+    def __init__(self, cache: SubsetCache, memory_entries: int = 64):
+        """
+        Initialize store.
+
+        Args:
+            cache: On-disk cache for serialized indexes
+            memory_entries: Indexes kept in memory per process
+        """
+        self.cache = cache
+        self.memory_entries = memory_entries
+        self._entries: "OrderedDict[str, GlyphCostIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, font_hash: str, index: GlyphCostIndex):
+        """
+        Save an index.
+
+        Args:
+            font_hash: Content hash of the font
+            index: Index to save
+        """
+        tmp_path = self.cache.temp_path()
+        try:
+            Path(tmp_path).write_text(index.to_json(), encoding="utf-8")
+            self.cache.store(self._key(font_hash), tmp_path, move=True)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._remember(font_hash, index)
+
+    def clear_memory(self):
+        """Drop the indexes kept in memory; the on-disk cache is left alone"""
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, font_hash: str) -> Optional[GlyphCostIndex]:
+        """
+        Load an index.
+
+        Args:
+            font_hash: Content hash of the font
+
+        Returns:
+            GlyphCostIndex or None if the font has not been indexed
+        """
+        with self._lock:
+            index = self._entries.get(font_hash)
+            if index is not None:
+                self._entries.move_to_end(font_hash)
+                return index
+
+        path = self.cache.lookup(self._key(font_hash))
+        if path is None:
+            return None
+        try:
+            index = GlyphCostIndex.from_json(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._remember(font_hash, index)
+        return index
+
+    def _remember(self, font_hash: str, index: GlyphCostIndex):
+        with self._lock:
+            self._entries[font_hash] = index
+            self._entries.move_to_end(font_hash)
+            while len(self._entries) > self.memory_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _key(font_hash: str) -> str:
+        # Bumping the index version orphans old entries; the cache evicts them
+        return SubsetCache.make_key(font_hash=font_hash, glyph_cost_index=INDEX_VERSION)
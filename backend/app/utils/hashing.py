@@ -0,0 +1,101 @@
+"""
+Content hashing helpers for font files.
+"""
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+CHUNK_SIZE = 1024 * 1024
+
+# (path, size, mtime_ns) -> hex digest
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+_digest_lock = threading.Lock()
+_MEMO_LIMIT = 4096
+
+# Hex digits of the digest embedded in content-hashed filenames
+NAME_HASH_LENGTH = 16
+_HASHED_NAME = re.compile(rf"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{{{NAME_HASH_LENGTH}}})(?P<suffix>\.[A-Za-z0-9]+)$")
+
+
+def file_sha256(path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents.
+
+    Digests are memoized on (path, size, mtime) so repeated lookups for an
+    unchanged file do not re-read it.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest string
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    with _digest_lock:
+        digest = _digest_memo.get(memo_key)
+    if digest:
+        return digest
+
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    digest = hasher.hexdigest()
+
+    remember_digest(path, digest)
+
+    return digest
+
+
+def remember_digest(path: str, digest: str):
+    """
+    Record a digest computed elsewhere (e.g. while streaming an upload).
+
+    Args:
+        path: Path to the file
+        digest: Hex digest of the file's current contents
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    with _digest_lock:
+        if len(_digest_memo) >= _MEMO_LIMIT:
+            _digest_memo.clear()
+        _digest_memo[memo_key] = digest
+
+
+def hashed_filename(filename: str, digest: str) -> str:
+    """
+    Embed a content digest in a filename (Inter-subset.woff2 ->
+    Inter-subset.<hash>.woff2), so the name changes whenever the content does.
+
+    Args:
+        filename: Plain filename with an extension
+        digest: Hex SHA-256 of the file's contents
+
+    Returns:
+        Content-hashed filename
+    """
+    stem, _, suffix = filename.rpartition(".")
+    return f"{stem}.{digest[:NAME_HASH_LENGTH]}.{suffix}"
+
+
+def split_hashed_filename(name: str) -> Optional[Tuple[str, str]]:
+    """
+    Take a content-hashed filename apart.
+
+    Args:
+        name: Filename as built by hashed_filename
+
+    Returns:
+        (plain filename, embedded digest prefix), or None if the name
+        carries no digest
+    """
+    match = _HASHED_NAME.match(name)
+    if not match:
+        return None
+    return match.group("stem") + match.group("suffix"), match.group("hash")
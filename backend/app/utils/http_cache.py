@@ -0,0 +1,172 @@
+"""
+HTTP caching helpers (ETags and conditional requests).
+"""
+import gzip
+import hashlib
+import threading
+from typing import Dict, Optional, Union
+
+import brotli
+from fastapi import Request, Response
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Media types of downloadable output files, by extension
+DOWNLOAD_MEDIA_TYPES = {
+    ".woff2": "font/woff2",
+    ".woff": "font/woff",
+    ".ttf": "font/ttf",
+    ".otf": "font/otf",
+    ".ttc": "font/collection",
+    ".otc": "font/collection",
+    ".css": "text/css; charset=utf-8",
+    ".zip": "application/zip",
+}
+
+# For URLs whose content never changes (content-hashed filenames)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def make_etag(payload: bytes) -> str:
+    """
+    Build a strong ETag for a response body.
+
+    Args:
+        payload: Response body
+
+    Returns:
+        Quoted ETag value
+    """
+    return f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches an ETag.
+
+    Args:
+        request: Incoming request
+        etag: Current quoted ETag
+
+    Returns:
+        True if the client's cached copy is still valid
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    # Weak comparison, as required for If-None-Match
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class EncodedPayload:
+    """
+    A serialized response body with its ETag and lazily built compressed variants.
+
+    Build once, serve many times: each encoding is compressed at most once.
+    """
+
+    def __init__(self, raw: bytes):
+        """
+        Initialize payload.
+
+        Args:
+            raw: Uncompressed response body
+        """
+        self.raw = raw
+        self.etag = make_etag(raw)
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """
+        Get the body in the given content coding.
+
+        Args:
+            encoding: "br", "gzip" or None for identity
+
+        Returns:
+            Encoded body
+        """
+        if encoding is None:
+            return self.raw
+
+        with self._lock:
+            body = self._variants.get(encoding)
+            if body is None:
+                if encoding == "br":
+                    body = brotli.compress(self.raw, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+                else:
+                    body = gzip.compress(self.raw, compresslevel=GZIP_LEVEL, mtime=0)
+                self._variants[encoding] = body
+            return body
+
+
+def negotiate_encoding(request: Request, size: int) -> Optional[str]:
+    """
+    Pick a content coding the client accepts.
+
+    Args:
+        request: Incoming request
+        size: Uncompressed body size
+
+    Returns:
+        "br", "gzip" or None for identity
+    """
+    if size < MIN_COMPRESS_SIZE:
+        return None
+
+    accepted = set()
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                continue
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+
+    for coding in ("br", "gzip"):
+        if coding in accepted:
+            return coding
+    return None
+
+
+def cached_json_response(request: Request, payload: Union[bytes, EncodedPayload]) -> Response:
+    """
+    Serve a pre-serialized JSON body with an ETag, answering 304 when unchanged.
+
+    The body is sent Brotli- or gzip-compressed when the client accepts it.
+
+    Args:
+        request: Incoming request
+        payload: Serialized JSON body
+
+    Returns:
+        200 response with the body, or an empty 304
+    """
+    if not isinstance(payload, EncodedPayload):
+        payload = EncodedPayload(payload)
+
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding"
+    }
+
+    if etag_matches(request, payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    encoding = negotiate_encoding(request, len(payload.raw))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=payload.encoded(encoding), media_type="application/json", headers=headers)
@@ -0,0 +1,265 @@
+"""
+Background job manager for long-running font operations.
+"""
+import asyncio
+import contextlib
+import json
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+# Callback handed to job functions: progress(completed, total, current_item)
+ProgressCallback = Callable[[int, int, Optional[str]], None]
+
+TERMINAL_STATUSES = {"completed", "failed"}
+
+# How often events() re-reads a job that runs in another worker
+REMOTE_POLL_SECONDS = 1.0
+
+
+class JobManager:
+    """
+    Runs font jobs off the event loop and tracks their progress.
+
+    Jobs run in the worker that accepted them. With a shared store, every
+    state change is also written there so any worker can answer status
+    requests and stream events for the job.
+    """
+
+    def __init__(self, job_ttl_minutes: int = 60, store: Optional[SessionStore] = None):
+        """
+        Initialize job manager.
+
+        Args:
+            job_ttl_minutes: How long finished jobs are kept for polling
+            store: Optional session store used to share job state across workers
+        """
+        self.jobs: Dict[str, Dict] = {}
+        self.job_ttl = timedelta(minutes=job_ttl_minutes)
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.store = store if store is not None and store.shared else None
+        # Store writes block; one thread keeps them off the event loop and in order
+        self._publisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-publish") if self.store else None
+
+    def submit(
+        self,
+        kind: str,
+        session_id: str,
+        func: Callable[[ProgressCallback], Any],
+        admission: Optional[AsyncContextManager] = None
+    ) -> str:
+        """
+        Start a job in the background.
+
+        Must be called from the event loop. The function runs in a worker thread
+        and receives a progress callback.
+
+        Args:
+            kind: Job type (e.g. "subset", "export")
+            session_id: Session the job belongs to
+            func: Callable taking a progress callback and returning the job result
+            admission: Optional admission ticket; the job stays pending until
+                it is admitted
+
+        Returns:
+            Job ID
+        """
+        self._prune_finished()
+
+        job_id = str(uuid.uuid4())
+        now = datetime.now()
+        self.jobs[job_id] = {
+            "job_id": job_id,
+            "kind": kind,
+            "session_id": session_id,
+            "status": "pending",
+            "progress": {"completed": 0, "total": 0, "current": None},
+            "result": None,
+            "error": None,
+            "created_at": now.isoformat(),
+            "updated_at": now.isoformat()
+        }
+        self._subscribers[job_id] = []
+        self._publish(dict(self.jobs[job_id]))
+
+        loop = asyncio.get_running_loop()
+        self._tasks[job_id] = loop.create_task(self._run(job_id, func, loop, admission))
+
+        logger.info(f"Submitted {kind} job: {job_id} (session: {session_id})")
+        return job_id
+
+    def queue_depth(self) -> int:
+        """
+        Count this worker's jobs that have not finished yet.
+
+        Returns:
+            Number of pending or running jobs
+        """
+        with self._lock:
+            return sum(1 for job in self.jobs.values() if job["status"] not in TERMINAL_STATUSES)
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """
+        Get job state.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job data or None if not found
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job:
+                return dict(job)
+
+        # Started by another worker
+        if self.store:
+            value = self.store.get_value(f"job:{job_id}")
+            if value:
+                return json.loads(value)
+        return None
+
+    async def events(self, job_id: str) -> AsyncIterator[Dict]:
+        """
+        Subscribe to job updates.
+
+        Yields the current state first, then every update until the job finishes.
+
+        Args:
+            job_id: Job ID
+
+        Yields:
+            Job data snapshots
+        """
+        if job_id not in self.jobs:
+            async for job in self._remote_events(job_id):
+                yield job
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(queue)
+        try:
+            job = self.get_job(job_id)
+            if job is None:
+                return
+            yield job
+            while job["status"] not in TERMINAL_STATUSES:
+                job = await queue.get()
+                yield job
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers and queue in subscribers:
+                subscribers.remove(queue)
+
+    async def _remote_events(self, job_id: str) -> AsyncIterator[Dict]:
+        """Follow a job running in another worker by polling the shared store"""
+        job = await run_in_threadpool(self.get_job, job_id)
+        if job is None:
+            return
+        yield job
+        while job["status"] not in TERMINAL_STATUSES:
+            await asyncio.sleep(REMOTE_POLL_SECONDS)
+            latest = await run_in_threadpool(self.get_job, job_id)
+            if latest is None:
+                return
+            if latest["updated_at"] != job["updated_at"]:
+                job = latest
+                yield job
+
+    async def _run(
+        self,
+        job_id: str,
+        func: Callable[[ProgressCallback], Any],
+        loop: asyncio.AbstractEventLoop,
+        admission: Optional[AsyncContextManager] = None
+    ):
+        def progress(completed: int, total: int, current: Optional[str] = None):
+            self._update(job_id, loop, status="running",
+                         progress={"completed": completed, "total": total, "current": current})
+
+        try:
+            async with admission or contextlib.nullcontext():
+                self._update(job_id, loop, status="running")
+                result = await run_in_threadpool(func, progress)
+            self._update(job_id, loop, status="completed", result=result)
+            logger.info(f"Job completed: {job_id}")
+        except Exception as e:
+            detail = getattr(e, "detail", None) or str(e)
+            self._update(job_id, loop, status="failed", error=detail)
+            logger.error(f"Job failed: {job_id}: {detail}")
+        finally:
+            self._tasks.pop(job_id, None)
+
+    def _update(self, job_id: str, loop: asyncio.AbstractEventLoop, **changes):
+        """Apply changes to a job and notify subscribers. Safe to call from any thread."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            job.update(changes)
+            job["updated_at"] = datetime.now().isoformat()
+            snapshot = dict(job)
+
+        self._publish(snapshot)
+
+        def notify():
+            for queue in self._subscribers.get(job_id, []):
+                queue.put_nowait(snapshot)
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            notify()
+        else:
+            loop.call_soon_threadsafe(notify)
+
+    def shutdown(self):
+        """Finish writing queued job snapshots to the shared store"""
+        if self._publisher:
+            self._publisher.shutdown(wait=True)
+
+    def _publish(self, snapshot: Dict):
+        """Queue a job snapshot for writing to the shared store, if there is one"""
+        if self.store:
+            self._publisher.submit(self._write_snapshot, snapshot)
+
+    def _write_snapshot(self, snapshot: Dict):
+        try:
+            self.store.put_value(
+                f"job:{snapshot['job_id']}",
+                json.dumps(snapshot),
+                self.job_ttl.total_seconds()
+            )
+        except Exception as e:
+            logger.error(f"Error publishing job state: {snapshot['job_id']}: {str(e)}")
+
+    def _prune_finished(self):
+        """Drop finished jobs older than the retention window"""
+        cutoff = datetime.now() - self.job_ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self.jobs.items()
+                if job["status"] in TERMINAL_STATUSES
+                and datetime.fromisoformat(job["updated_at"]) < cutoff
+            ]
+            for job_id in expired:
+                del self.jobs[job_id]
+                self._subscribers.pop(job_id, None)
+
+        if expired:
+            logger.info(f"Pruned {len(expired)} finished jobs")
@@ -0,0 +1,322 @@
+"""
+Request and pipeline stage metrics.
+
+Metrics are kept per process and rendered in the Prometheus text exposition
+format, so no client library is needed. Pipeline code wraps its stages in
+stage(); durations (and byte counts, where a stage produces data) go into
+process-wide histograms and into the current request's timings, which the
+middleware returns in a Server-Timing header.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds: 1ms .. 1min
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Bytes: 1KB .. 64MB
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(9))
+
+# (stage, seconds) pairs recorded while handling the current request
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+# A collector returns (name, type, help, [(labels, value), ...]) families at scrape time
+Collector = Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base for labelled metrics; children are keyed by label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines += self._render_child(key, value)
+        return lines
+
+    def _render_child(self, key: Tuple[str, ...], value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        if not self.labelnames:
+            self._values[()] = 0
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed distribution with a sum and count per label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DURATION_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            child = self._values.get(key)
+            if child is None:
+                # Per-bucket counts, then sum and count
+                child = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    child[i] += 1
+                    break
+            child[-2] += value
+            child[-1] += 1
+
+    def _render_child(self, key: Tuple[str, ...], value) -> List[str]:
+        lines = []
+        cumulative = 0
+        for i, bound in enumerate(self.buckets):
+            cumulative += value[i]
+            labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(value[-2])}")
+        lines.append(f"{self.name}_count{labels} {value[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide set of metrics plus collectors evaluated at scrape time"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def register_collector(self, collector: Collector):
+        """
+        Add a callable producing metric families when scraped.
+
+        Use for figures other components already track (cache statistics,
+        session counts) rather than mirroring them into gauges.
+
+        Args:
+            collector: Callable returning (name, type, help, samples) tuples,
+                where samples are (labels dict, value) pairs
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        May block on collectors (e.g. a session store query); call it off
+        the event loop.
+
+        Returns:
+            Exposition text
+        """
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "fontsub_stage_duration_seconds", "Time spent in each pipeline stage", ("stage",)
+)
+STAGE_BYTES = REGISTRY.histogram(
+    "fontsub_stage_bytes", "Bytes produced or read by each pipeline stage", ("stage",), SIZE_BUCKETS
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "fontsub_http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    "fontsub_http_request_duration_seconds", "HTTP request latency, to the end of the response body", ("method", "route")
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "fontsub_http_requests_in_flight", "HTTP requests currently being handled"
+)
+ADMISSION_WAIT_SECONDS = REGISTRY.histogram(
+    "fontsub_admission_wait_seconds", "Time font jobs waited in the admission queue"
+)
+
+
+class StageTimer:
+    """Handle yielded by stage(); set nbytes to record the stage's data size"""
+
+    def __init__(self):
+        self.nbytes: Optional[int] = None
+
+
+@contextmanager
+def stage(name: str, nbytes: Optional[int] = None) -> Iterator[StageTimer]:
+    """
+    Time a pipeline stage.
+
+    The duration is recorded in the stage histogram and, inside a request,
+    in that request's Server-Timing header. Worker threads see the request
+    only if they run in a copy of its context (run_in_threadpool does this;
+    with an executor, submit contextvars.copy_context().run).
+
+    Args:
+        name: Stage name (e.g. "closure", "encode_woff2")
+        nbytes: Data size, if known up front; otherwise set it on the
+            yielded timer
+
+    Yields:
+        StageTimer
+    """
+    timer = StageTimer()
+    timer.nbytes = nbytes
+    start = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        if timer.nbytes is not None:
+            STAGE_BYTES.observe(timer.nbytes, stage=name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((name, elapsed))
+
+
+def server_timing(timings: List[Tuple[str, float]], total: float) -> str:
+    """
+    Format stage timings as a Server-Timing header value.
+
+    Repeated stages (e.g. one subset per font) are summed, in first-seen order.
+
+    Args:
+        timings: (stage, seconds) pairs
+        total: Handler time in seconds
+
+    Returns:
+        Header value, e.g. "closure;dur=12.1, compile;dur=3.4, total;dur=17.9"
+    """
+    durations: Dict[str, float] = {}
+    for name, seconds in list(timings):
+        durations[name] = durations.get(name, 0.0) + seconds
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in durations.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting requests and adding Server-Timing headers.
+
+    Requests are labelled with their route template (e.g.
+    /api/download/{session_id}/{filename}) to keep label sets small. For
+    streamed responses the header covers the work done before the first
+    byte; the latency histogram runs to the end of the body.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: List[Tuple[str, float]] = []
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = server_timing(timings, time.perf_counter() - start)
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"server-timing", header.encode("latin-1"))]}
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _request_timings.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUESTS.inc(method=scope["method"], route=route, status=str(status))
+            HTTP_SECONDS.observe(time.perf_counter() - start, method=scope["method"], route=route)
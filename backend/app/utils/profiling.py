@@ -0,0 +1,356 @@
+"""
+Opt-in per-request profiling.
+
+A request carrying "X-Profile: 1" and the admin token runs its offloaded
+work under cProfile: calls made through run_in_threadpool, threads started
+with profiled_call in a copy of the request's context, and worker process
+calls wrapped with call_with_profile. The per-thread and per-process
+profiles are merged and stored as a pstats file keyed by request ID.
+"""
+import cProfile
+import hmac
+import io
+import json
+import pstats
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from starlette.concurrency import run_in_threadpool as _starlette_run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Client-supplied request IDs are used as file names
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("active_profile", default=None)
+
+# Set while a thread runs under one of our profilers; cProfile cannot nest
+_thread_state = threading.local()
+
+
+class _RawStats:
+    """Adapter letting pstats.Stats load a stats dict from a worker process"""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class ProfiledResult:
+    """Return value of call_with_profile: the call's result plus its profile data"""
+
+    def __init__(self, value: Any, stats: Dict):
+        self.value = value
+        self.stats = stats
+
+
+class RequestProfile:
+    """Profile data collected for one request, merged from every thread that worked on it"""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.stats = pstats.Stats()
+        self.calls = 0
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def add(self, profiler: Any):
+        """
+        Merge a finished profile.
+
+        Args:
+            profiler: cProfile.Profile (disabled) or object with a stats dict
+        """
+        with self._lock:
+            if self.closed:
+                return
+            self.stats.add(profiler)
+            self.calls += 1
+
+    def close(self):
+        """Stop accepting data (work still running for the request is dropped)"""
+        with self._lock:
+            self.closed = True
+
+
+def profiling_active() -> bool:
+    """Whether the current context belongs to a request being profiled"""
+    profile = _active_profile.get()
+    return profile is not None and not profile.closed
+
+
+def profiled_call(func: Callable, *args, **kwargs) -> Any:
+    """
+    Call a function, profiling it if the current request is being profiled.
+
+    Run it in a copy of the request's context when calling from another
+    thread (e.g. executor.submit(copy_context().run, profiled_call, func)).
+
+    Args:
+        func: Function to call
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        The function's return value
+    """
+    profile = _active_profile.get()
+    if profile is None or profile.closed or getattr(_thread_state, "profiling", False):
+        return func(*args, **kwargs)
+
+    profiler = cProfile.Profile()
+    _thread_state.profiling = True
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        _thread_state.profiling = False
+        profile.add(profiler)
+
+
+async def run_in_threadpool(func: Callable, *args, **kwargs) -> Any:
+    """
+    Starlette's run_in_threadpool, profiling the call for profiled requests.
+
+    Args:
+        func: Function to call in a worker thread
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        The function's return value
+    """
+    return await _starlette_run_in_threadpool(profiled_call, func, *args, **kwargs)
+
+
+def call_with_profile(func: Callable, *args, **kwargs) -> ProfiledResult:
+    """
+    Run a function under cProfile and return its result with the profile data.
+
+    Module level so it can be submitted to a worker process. Threads the
+    function starts with profiled_call are included.
+
+    Args:
+        func: Function to call
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        ProfiledResult
+    """
+    profile = RequestProfile("worker")
+    token = _active_profile.set(profile)
+    try:
+        value = profiled_call(func, *args, **kwargs)
+    finally:
+        _active_profile.reset(token)
+    return ProfiledResult(value, profile.stats.stats)
+
+
+def unwrap_result(result: Any) -> Any:
+    """
+    Merge the profile data of a worker process call into the current request.
+
+    Args:
+        result: Return value of a pool future (ProfiledResult or plain value)
+
+    Returns:
+        The call's own return value
+    """
+    if not isinstance(result, ProfiledResult):
+        return result
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.add(_RawStats(result.stats))
+    return result.value
+
+
+class ProfileStore:
+    """
+    Stored request profiles with bounded retention.
+
+    Each profile is a pstats file (<request_id>.prof, readable with
+    python -m pstats or snakeviz) plus a JSON sidecar describing the request.
+    Only the newest max_count profiles are kept.
+    """
+
+    def __init__(self, profile_dir: str, max_count: int = 50):
+        """
+        Initialize profile store.
+
+        Args:
+            profile_dir: Directory for profiles (may be shared by workers)
+            max_count: Number of profiles to keep
+        """
+        self.profile_dir = Path(profile_dir)
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.max_count = max_count
+        self._lock = threading.Lock()
+
+    def save(self, profile: RequestProfile, info: Dict[str, Any]):
+        """
+        Store a request's profile and prune old ones.
+
+        Args:
+            profile: Collected profile
+            info: Request description (method, path, status, duration)
+        """
+        prof_path = self.profile_dir / f"{profile.request_id}.prof"
+        with self._lock:
+            profile.stats.dump_stats(str(prof_path))
+            info = {
+                **info,
+                "request_id": profile.request_id,
+                "profiled_calls": profile.calls,
+                "size": prof_path.stat().st_size,
+                "created_at": time.time(),
+            }
+            (self.profile_dir / f"{profile.request_id}.json").write_text(json.dumps(info), encoding="utf-8")
+            self._prune()
+        logger.info(f"Stored profile for request {profile.request_id}")
+
+    def list(self) -> List[Dict[str, Any]]:
+        """
+        Describe stored profiles, newest first.
+
+        Returns:
+            List of request descriptions
+        """
+        profiles = []
+        for info_path in self.profile_dir.glob("*.json"):
+            try:
+                profiles.append(json.loads(info_path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda info: info["created_at"], reverse=True)
+
+    def path(self, request_id: str) -> Optional[Path]:
+        """
+        Locate a stored profile.
+
+        Args:
+            request_id: Request ID
+
+        Returns:
+            Path to the pstats file, or None if unknown
+        """
+        if not REQUEST_ID_PATTERN.match(request_id):
+            return None
+        prof_path = self.profile_dir / f"{request_id}.prof"
+        return prof_path if prof_path.is_file() else None
+
+    def summary(self, request_id: str, sort: str = "cumulative", limit: int = 50) -> Optional[str]:
+        """
+        Render a stored profile as pstats text.
+
+        Args:
+            request_id: Request ID
+            sort: pstats sort key (cumulative, tottime, calls, ...)
+            limit: Number of functions to list
+
+        Returns:
+            Report text, or None if the profile is unknown
+        """
+        prof_path = self.path(request_id)
+        if prof_path is None:
+            return None
+        stream = io.StringIO()
+        stats = pstats.Stats(str(prof_path), stream=stream)
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def _prune(self):
+        """Delete the oldest profiles beyond max_count. Caller holds the lock."""
+        info_paths = sorted(self.profile_dir.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+        for info_path in info_paths[self.max_count:]:
+            info_path.unlink(missing_ok=True)
+            info_path.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def check_admin_token(admin_token: Optional[str], supplied: Optional[str]) -> bool:
+    """
+    Compare a supplied admin token with the configured one in constant time.
+
+    Args:
+        admin_token: Configured token (None disables admin access)
+        supplied: Token sent by the client
+
+    Returns:
+        True if both are set and match
+    """
+    if not admin_token or not supplied:
+        return False
+    return hmac.compare_digest(admin_token.encode("utf-8"), supplied.encode("utf-8"))
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests that ask for it.
+
+    A request is profiled when it sends "X-Profile: 1" with a valid
+    "X-Admin-Token"; the response then carries the X-Request-ID its profile
+    is stored under (the client's own X-Request-ID if it sent a valid one).
+    Work done on the event loop itself is not profiled, and async_mode jobs
+    continue after the response, so they are not included either.
+    """
+
+    def __init__(self, app, store: Optional[ProfileStore], admin_token: Optional[str]):
+        self.app = app
+        self.store = store
+        self.admin_token = admin_token
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.store is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        if headers.get("x-profile", "").lower() not in ("1", "true"):
+            await self.app(scope, receive, send)
+            return
+        if not check_admin_token(self.admin_token, headers.get("x-admin-token")):
+            logger.warning(f"Ignoring profiling request without a valid admin token: {scope['path']}")
+            await self.app(scope, receive, send)
+            return
+
+        request_id = headers.get("x-request-id", "")
+        if not REQUEST_ID_PATTERN.match(request_id) or self.store.path(request_id):
+            request_id = uuid.uuid4().hex
+
+        profile = RequestProfile(request_id)
+        token = _active_profile.set(profile)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_request_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("ascii"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _active_profile.reset(token)
+            duration = time.perf_counter() - start
+            profile.close()
+            info = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "duration_seconds": round(duration, 6),
+            }
+            try:
+                await _starlette_run_in_threadpool(self.store.save, profile, info)
+            except Exception as e:
+                logger.error(f"Error storing profile {request_id}: {str(e)}")
@@ -0,0 +1,361 @@
+"""
+Background cleanup of expired sessions and disk quota enforcement.
+"""
+import asyncio
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.blob_store import BlobStore
+from app.utils.session_manager import SessionManager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TRASH_DIR_NAME = ".trash"
+
+
+def _is_session_dir(path: Path) -> bool:
+    """Session directories are named by session ID; skip the blob store and trash"""
+    return path.is_dir() and not path.name.startswith(("_", "."))
+
+
+def _private_bytes(path: Path) -> int:
+    """
+    Bytes that removing a directory tree would actually free.
+
+    Hard links into the blob store are not counted; their data is freed when
+    the blob itself is released.
+    """
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                stat = os.lstat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            if stat.st_nlink <= 1:
+                total += stat.st_size
+    return total
+
+
+class SessionJanitor:
+    """
+    Expires sessions and reclaims their disk space off the request path.
+
+    Session directories are first renamed into a per-root trash directory,
+    which is cheap and atomic, and deleted later by purge(). A periodic sweep
+    expires idle sessions, removes directories whose session no longer
+    exists, enforces a disk quota by evicting the least recently accessed
+    sessions, and collects unreferenced upload blobs.
+
+    With several workers sharing the same directories, a lock file makes
+    sure only one of them sweeps at a time.
+    """
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        blob_store: BlobStore,
+        upload_dir: str,
+        output_dir: str,
+        interval_seconds: float = 300,
+        disk_quota_bytes: int = 0,
+        orphan_grace_seconds: float = 600,
+        lock_path: Optional[str] = None
+    ):
+        """
+        Initialize janitor.
+
+        Args:
+            session_manager: Session manager whose sessions are swept
+            blob_store: Blob store holding uploaded files
+            upload_dir: Root of the per-session upload directories
+            output_dir: Root of the per-session output directories
+            interval_seconds: Time between sweeps
+            disk_quota_bytes: Maximum bytes for uploads and outputs (0 = no quota)
+            orphan_grace_seconds: Minimum age of a directory without a session
+                before it is removed
+            lock_path: Lock file used to elect a single sweeping worker
+        """
+        self.session_manager = session_manager
+        self.blob_store = blob_store
+        self.roots = [Path(upload_dir), Path(output_dir)]
+        self.interval_seconds = interval_seconds
+        self.disk_quota_bytes = disk_quota_bytes
+        self.orphan_grace_seconds = orphan_grace_seconds
+        self.lock_path = lock_path
+
+        self._task: Optional[asyncio.Task] = None
+        self._purge_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "sweeps": 0,
+            "sessions_expired": 0,
+            "sessions_evicted": 0,
+            "orphans_removed": 0,
+            "bytes_reclaimed": 0,
+            "blobs_collected": 0,
+            "disk_usage_bytes": None,
+            "last_sweep_at": None,
+            "last_sweep_seconds": None,
+        }
+
+    def start(self):
+        """Start periodic sweeping. Must be called from the event loop."""
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"Session janitor started (every {self.interval_seconds}s)")
+
+    async def stop(self):
+        """Stop periodic sweeping."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def discard(self, session_id: str):
+        """
+        Move a session's directories to the trash.
+
+        Cheap enough for the request path; call purge() afterwards (e.g. as a
+        background task) to delete them.
+
+        Args:
+            session_id: Session ID
+        """
+        for root in self.roots:
+            session_dir = root / session_id
+            if not session_dir.exists():
+                continue
+            trash_dir = root / TRASH_DIR_NAME
+            trash_dir.mkdir(exist_ok=True)
+            try:
+                os.replace(session_dir, trash_dir / f"{session_id}.{uuid.uuid4().hex}")
+            except FileNotFoundError:
+                # Already discarded by another request or worker
+                pass
+
+    def purge(self, blob_refs: Iterable[Tuple[str, str]] = ()) -> int:
+        """
+        Delete everything in the trash and release the given blobs.
+
+        Args:
+            blob_refs: (digest, suffix) pairs of blobs the discarded sessions
+                referenced
+
+        Returns:
+            Bytes reclaimed
+        """
+        reclaimed = 0
+        with self._purge_lock:
+            for root in self.roots:
+                trash_dir = root / TRASH_DIR_NAME
+                if not trash_dir.exists():
+                    continue
+                for entry in list(trash_dir.iterdir()):
+                    reclaimed += _private_bytes(entry)
+                    shutil.rmtree(entry, ignore_errors=True)
+
+        for digest, suffix in blob_refs:
+            reclaimed += self.blob_store.release(digest, suffix)
+
+        self._count(bytes_reclaimed=reclaimed)
+        return reclaimed
+
+    def remove_session(self, session_id: str) -> Set[Tuple[str, str]]:
+        """
+        Drop a session's state and move its directories to the trash.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            (digest, suffix) pairs of the blobs the session referenced
+        """
+        blob_refs = {
+            (font.content_hash, Path(font.file_path).suffix)
+            for font in self.session_manager.get_fonts(session_id)
+            if font.content_hash and font.file_path
+        }
+        self.session_manager.cleanup_session(session_id)
+        self.discard(session_id)
+        return blob_refs
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Expire idle sessions, remove orphaned directories and enforce the quota.
+
+        Returns:
+            Counts for this sweep (expired, orphans, evicted, bytes_reclaimed)
+        """
+        lock_file = self._acquire_sweep_lock()
+        if lock_file is False:
+            return {"expired": 0, "orphans": 0, "evicted": 0, "bytes_reclaimed": 0}
+
+        started = time.monotonic()
+        try:
+            reclaimed = 0
+
+            # Idle sessions; their blobs are picked up by garbage collection
+            cutoff = time.time() - self.session_manager.session_timeout.total_seconds()
+            expired = self.session_manager.store.expired_sessions(cutoff)
+            for session_id in expired:
+                self.session_manager.cleanup_session(session_id)
+                self.discard(session_id)
+            if expired:
+                logger.info(f"Expired {len(expired)} sessions")
+
+            # Directories whose session is gone (e.g. lost with an in-memory store)
+            known = {session_id for session_id, _ in self.session_manager.store.list_sessions()}
+            orphan_cutoff = time.time() - self.orphan_grace_seconds
+            orphans = set()
+            for root in self.roots:
+                for path in root.iterdir():
+                    if not _is_session_dir(path) or path.name in known:
+                        continue
+                    try:
+                        if path.stat().st_mtime < orphan_cutoff:
+                            orphans.add(path.name)
+                    except FileNotFoundError:
+                        continue
+            for session_id in orphans:
+                self.discard(session_id)
+            if orphans:
+                logger.info(f"Removing {len(orphans)} orphaned session directories")
+
+            reclaimed += self.purge()
+            evicted, evicted_bytes = self._enforce_quota()
+            reclaimed += evicted_bytes
+
+            collected, collected_bytes = self.blob_store.collect_garbage()
+            reclaimed += collected_bytes
+
+            self._count(
+                sweeps=1,
+                sessions_expired=len(expired),
+                orphans_removed=len(orphans),
+                sessions_evicted=evicted,
+                blobs_collected=collected,
+                bytes_reclaimed=collected_bytes
+            )
+            with self._stats_lock:
+                self._stats["last_sweep_at"] = datetime.now().isoformat()
+                self._stats["last_sweep_seconds"] = round(time.monotonic() - started, 3)
+
+            return {
+                "expired": len(expired),
+                "orphans": len(orphans),
+                "evicted": evicted,
+                "bytes_reclaimed": reclaimed
+            }
+        finally:
+            if lock_file:
+                lock_file.close()
+
+    def disk_usage(self) -> Tuple[int, List[Tuple[str, int]]]:
+        """
+        Measure disk used by uploads and outputs.
+
+        Returns:
+            Tuple of (total bytes including stored blobs, per-session private
+            bytes as (session ID, bytes) pairs)
+        """
+        per_session: Dict[str, int] = {}
+        for root in self.roots:
+            for path in root.iterdir():
+                if _is_session_dir(path):
+                    per_session[path.name] = per_session.get(path.name, 0) + _private_bytes(path)
+
+        total = self.blob_store.stats()["stored_bytes"] + sum(per_session.values())
+        return total, list(per_session.items())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get janitor statistics.
+
+        Returns:
+            Dictionary with sweep counts, reclaimed bytes and last measured
+            disk usage
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["disk_quota_bytes"] = self.disk_quota_bytes
+        stats["interval_seconds"] = self.interval_seconds
+        return stats
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await run_in_threadpool(self.sweep)
+            except Exception as e:
+                logger.error(f"Error sweeping sessions: {str(e)}")
+
+    def _enforce_quota(self) -> Tuple[int, int]:
+        """Evict least recently accessed sessions until usage is under the quota"""
+        usage, per_session = self.disk_usage()
+        with self._stats_lock:
+            self._stats["disk_usage_bytes"] = usage
+
+        if not self.disk_quota_bytes or usage <= self.disk_quota_bytes:
+            return 0, 0
+
+        on_disk = dict(per_session)
+        evicted = 0
+        reclaimed = 0
+        for session_id, _ in self.session_manager.store.list_sessions():
+            if usage <= self.disk_quota_bytes:
+                break
+            if session_id not in on_disk:
+                continue
+
+            freed = self.purge(self.remove_session(session_id))
+            usage -= freed
+            reclaimed += freed
+            evicted += 1
+            logger.info(f"Evicted session {session_id} for disk quota ({freed} bytes)")
+
+        with self._stats_lock:
+            self._stats["disk_usage_bytes"] = usage
+        if usage > self.disk_quota_bytes:
+            logger.warning(f"Disk usage {usage} still above quota {self.disk_quota_bytes} after eviction")
+        return evicted, reclaimed
+
+    def _acquire_sweep_lock(self):
+        """
+        Take the cross-process sweep lock without blocking.
+
+        Returns:
+            Open lock file to close when done, None if no lock is configured,
+            or False if another worker holds the lock
+        """
+        if not self.lock_path or fcntl is None:
+            return None
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        return lock_file
+
+    def _count(self, **increments: int):
+        with self._stats_lock:
+            for name, value in increments.items():
+                self._stats[name] += value
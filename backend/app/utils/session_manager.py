@@ -1,29 +1,68 @@
 """
 Session manager for tracking user sessions and temporary data.
 """
+import threading
+import time
 import uuid
-from typing import Dict, Optional, List
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import Dict, Optional, List, Tuple
+from datetime import timedelta
 import logging
 
 from app.models.font_models import FontMetadata
+from app.utils.http_cache import EncodedPayload
+from app.utils.session_store import MemorySessionStore, SessionStore
 
 logger = logging.getLogger(__name__)
 
+# Session lists
+FONTS_FIELD = "fonts"  # Full metadata JSON per font
+SUBSET_PATHS_FIELD = "subset_paths"
+EXPORTED_FILES_FIELD = "exported_files"
+
+# Bounds for the per-process decode and payload caches
+_DECODED_SESSIONS_LIMIT = 64
+_PAYLOAD_CACHE_LIMIT = 128
+
+# Most session lookups are reads; the access time is written at most this often
+_TOUCH_INTERVAL_SECONDS = 30
+
+
+def _payload_field(variant: str) -> str:
+    """List holding the pre-serialized JSON of each font for a payload variant"""
+    return FONTS_FIELD if variant == "full" else f"{FONTS_FIELD}:{variant}"
+
 
 class SessionManager:
-    """Manages user sessions and associated data"""
+    """
+    Manages user sessions and associated data.
 
-    def __init__(self, session_timeout_minutes: int = 60):
+    State lives in a SessionStore, so with a shared store (SQLite, Redis)
+    any worker can serve any session. Fonts are stored as the JSON payloads
+    produced at upload time; decoded metadata and compressed list payloads
+    are cached per process.
+
+    Store calls block (SQLite locks, Redis round trips), so call these
+    methods from a worker thread, not from the event loop.
+    """
+
+    def __init__(self, session_timeout_minutes: int = 60, store: Optional[SessionStore] = None):
         """
         Initialize session manager.
 
         Args:
             session_timeout_minutes: Session timeout in minutes
+            store: Session storage backend (defaults to an in-memory store)
         """
-        self.sessions: Dict[str, Dict] = {}
+        self.store = store or MemorySessionStore()
         self.session_timeout = timedelta(minutes=session_timeout_minutes)
 
+        # Session ID -> (session version, decoded fonts)
+        self._decoded_fonts: "OrderedDict[str, Tuple[int, List[FontMetadata]]]" = OrderedDict()
+        # (session ID, variant) -> (session version, payload)
+        self._payload_cache: "OrderedDict[tuple, Tuple[int, EncodedPayload]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
     def create_session(self) -> str:
         """
         Create a new session.
@@ -32,13 +71,7 @@ class SessionManager:
             Session ID
         """
         session_id = str(uuid.uuid4())
-        self.sessions[session_id] = {
-            "created_at": datetime.now(),
-            "last_accessed": datetime.now(),
-            "fonts": [],  # List of FontMetadata
-            "subset_paths": [],  # List of subset paths
-            "exported_files": []  # List of exported file paths
-        }
+        self.store.create(session_id, time.time())
 
         logger.info(f"Created session: {session_id}")
         return session_id
@@ -51,35 +84,81 @@ class SessionManager:
             session_id: Session ID
 
         Returns:
-            Session data or None if not found
+            Session data (created_at, last_accessed) or None if not found
         """
-        if session_id in self.sessions:
-            session = self.sessions[session_id]
-
-            # Check if session is expired
-            if datetime.now() - session["last_accessed"] > self.session_timeout:
-                logger.info(f"Session expired: {session_id}")
-                self.cleanup_session(session_id)
-                return None
-
-            # Update last accessed time
-            session["last_accessed"] = datetime.now()
-            return session
+        timeout = self.session_timeout.total_seconds()
+        session = self.store.touch(session_id, time.time(), timeout, min(_TOUCH_INTERVAL_SECONDS, timeout / 10))
+        if session is None:
+            return None
+
+        # Check if session is expired
+        if session["expired"]:
+            logger.info(f"Session expired: {session_id}")
+            self.cleanup_session(session_id)
+            return None
 
-        return None
+        return session
 
-    def add_font(self, session_id: str, metadata: FontMetadata):
+    def add_font(self, session_id: str, metadata: FontMetadata, payloads: Optional[Dict[str, bytes]] = None):
         """
         Add font metadata to session.
 
         Args:
             session_id: Session ID
             metadata: Font metadata
+            payloads: Pre-serialized JSON of the metadata, keyed by variant
+                (e.g. "full", "compact")
+        """
+        payloads = dict(payloads or {})
+        if "full" not in payloads:
+            payloads["full"] = metadata.model_dump_json().encode("utf-8")
+
+        if self.get_session(session_id):
+            # One atomic append keeps the variant lists aligned
+            values = {_payload_field(variant): payload.decode("utf-8") for variant, payload in payloads.items()}
+            if self.store.append(session_id, values):
+                logger.info(f"Added font to session: {session_id}")
+
+    def get_fonts_payload(self, session_id: str, variant: str) -> Optional[EncodedPayload]:
+        """
+        Get the serialized JSON array of all fonts in a session.
+
+        Built from the per-font payloads stored by add_font. The encoded
+        payload is reused for as long as the session's version is unchanged,
+        so repeat requests do not read the fonts back from the store.
+
+        Args:
+            session_id: Session ID
+            variant: Payload variant (e.g. "full", "compact")
+
+        Returns:
+            EncodedPayload, or None if the session has no fonts or a font has no
+            payload for this variant
         """
         session = self.get_session(session_id)
-        if session:
-            session["fonts"].append(metadata)
-            logger.info(f"Added font to session: {session_id}, total fonts: {len(session['fonts'])}")
+        if not session:
+            return None
+
+        cache_key = (session_id, variant)
+        with self._cache_lock:
+            cached = self._payload_cache.get(cache_key)
+            if cached is not None and cached[0] == session["version"]:
+                self._payload_cache.move_to_end(cache_key)
+                return cached[1]
+
+        # Lists read after the version can only be newer; the next call then rebuilds
+        parts = self.store.get_list(session_id, _payload_field(variant))
+        if not parts:
+            return None
+        if variant != "full" and len(parts) != self.store.count(session_id, FONTS_FIELD):
+            return None
+
+        payload = EncodedPayload(("[" + ",".join(parts) + "]").encode("utf-8"))
+        with self._cache_lock:
+            self._payload_cache[cache_key] = (session["version"], payload)
+            if len(self._payload_cache) > _PAYLOAD_CACHE_LIMIT:
+                self._payload_cache.popitem(last=False)
+        return payload
 
     def get_fonts(self, session_id: str) -> List[FontMetadata]:
         """
@@ -93,7 +172,7 @@ class SessionManager:
         """
         session = self.get_session(session_id)
         if session:
-            return session.get("fonts", [])
+            return self._decode_fonts(session_id, session["version"])
         return []
 
     def get_font_by_index(self, session_id: str, index: int) -> Optional[FontMetadata]:
@@ -120,9 +199,7 @@ class SessionManager:
             session_id: Session ID
             subset_path: Path to subset font
         """
-        session = self.get_session(session_id)
-        if session:
-            session["subset_paths"].append(subset_path)
+        if self.get_session(session_id) and self.store.append(session_id, {SUBSET_PATHS_FIELD: subset_path}):
             logger.info(f"Added subset path for session: {session_id}")
 
     def get_subset_paths(self, session_id: str) -> List[str]:
@@ -135,9 +212,8 @@ class SessionManager:
         Returns:
             List of subset font paths
         """
-        session = self.get_session(session_id)
-        if session:
-            return session.get("subset_paths", [])
+        if self.get_session(session_id):
+            return self.store.get_list(session_id, SUBSET_PATHS_FIELD)
         return []
 
     def clear_subset_paths(self, session_id: str):
@@ -147,9 +223,8 @@ class SessionManager:
         Args:
             session_id: Session ID
         """
-        session = self.get_session(session_id)
-        if session:
-            session["subset_paths"] = []
+        if self.get_session(session_id):
+            self.store.clear_list(session_id, SUBSET_PATHS_FIELD)
             logger.info(f"Cleared subset paths for session: {session_id}")
 
     def add_exported_file(self, session_id: str, file_path: str):
@@ -160,9 +235,7 @@ class SessionManager:
             session_id: Session ID
             file_path: Path to exported file
         """
-        session = self.get_session(session_id)
-        if session:
-            session["exported_files"].append(file_path)
+        if self.get_session(session_id) and self.store.append(session_id, {EXPORTED_FILES_FIELD: file_path}):
             logger.info(f"Added exported file for session: {session_id}")
 
     def get_exported_files(self, session_id: str) -> List[str]:
@@ -175,9 +248,8 @@ class SessionManager:
         Returns:
             List of exported file paths
         """
-        session = self.get_session(session_id)
-        if session:
-            return session.get("exported_files", [])
+        if self.get_session(session_id):
+            return self.store.get_list(session_id, EXPORTED_FILES_FIELD)
         return []
 
     def clear_exported_files(self, session_id: str):
@@ -187,9 +259,8 @@ class SessionManager:
         Args:
             session_id: Session ID
         """
-        session = self.get_session(session_id)
-        if session:
-            session["exported_files"] = []
+        if self.get_session(session_id):
+            self.store.clear_list(session_id, EXPORTED_FILES_FIELD)
             logger.info(f"Cleared exported files for session: {session_id}")
 
     def cleanup_session(self, session_id: str):
@@ -199,20 +270,44 @@ class SessionManager:
         Args:
             session_id: Session ID
         """
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            logger.info(f"Cleaned up session: {session_id}")
+        self.store.delete(session_id)
+        with self._cache_lock:
+            for cache_key in [key for key in self._payload_cache if key[0] == session_id]:
+                del self._payload_cache[cache_key]
+            self._decoded_fonts.pop(session_id, None)
+        logger.info(f"Cleaned up session: {session_id}")
 
     def cleanup_expired_sessions(self):
         """Clean up all expired sessions"""
-        now = datetime.now()
-        expired_sessions = [
-            sid for sid, session in self.sessions.items()
-            if now - session["last_accessed"] > self.session_timeout
-        ]
+        cutoff = time.time() - self.session_timeout.total_seconds()
+        expired_sessions = self.store.expired_sessions(cutoff)
 
         for session_id in expired_sessions:
             self.cleanup_session(session_id)
 
         if expired_sessions:
             logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
+
+    def _decode_fonts(self, session_id: str, version: int) -> List[FontMetadata]:
+        """
+        Parse a session's stored font JSON, reusing earlier results.
+
+        The fonts list is append-only while a session exists, so after a
+        version change only fonts added since the last call are parsed.
+        """
+        with self._cache_lock:
+            cached = self._decoded_fonts.get(session_id)
+            if cached is not None:
+                self._decoded_fonts.move_to_end(session_id)
+                if cached[0] == version:
+                    return list(cached[1])
+
+        decoded = cached[1] if cached is not None else []
+        raws = self.store.get_list(session_id, FONTS_FIELD)
+        fonts = decoded[:len(raws)] + [FontMetadata.model_validate_json(raw) for raw in raws[len(decoded):]]
+
+        with self._cache_lock:
+            self._decoded_fonts[session_id] = (version, fonts)
+            if len(self._decoded_fonts) > _DECODED_SESSIONS_LIMIT:
+                self._decoded_fonts.popitem(last=False)
+        return list(fonts)
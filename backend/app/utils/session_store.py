@@ -0,0 +1,789 @@
+"""
+Session storage backends.
+
+SessionManager keeps session state in a SessionStore so that several API
+workers (or instances) can share it. Values are plain strings; each session
+holds a creation time, a last-access time, named append-only lists and a
+version counter that changes whenever one of its lists does.
+"""
+from abc import ABC, abstractmethod
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(ABC):
+    """
+    Interface for session storage backends.
+
+    Every method must be safe to call from several threads. Updates that
+    touch several lists at once (append) must be atomic.
+    """
+
+    # Whether the store is visible to other processes
+    shared = False
+
+    @abstractmethod
+    def create(self, session_id: str, now: float):
+        """
+        Create an empty session.
+
+        Args:
+            session_id: Session ID
+            now: Creation time (epoch seconds)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def touch(self, session_id: str, now: float, timeout: float, refresh_after: float = 0) -> Optional[Dict[str, float]]:
+        """
+        Mark a session as accessed unless it is missing or expired.
+
+        Args:
+            session_id: Session ID
+            now: Access time (epoch seconds)
+            timeout: Idle seconds after which the session counts as expired
+            refresh_after: Only write the access time once the stored one is
+                older than this many seconds, so most lookups are reads
+
+        Returns:
+            Dictionary with created_at, last_accessed, version and expired,
+            or None if the session does not exist. Expired sessions are
+            reported with expired=True, left untouched and left in place for
+            the caller to clean up.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def append(self, session_id: str, values: Dict[str, str]) -> bool:
+        """
+        Atomically append one value to each of several lists of a session
+        and bump its version.
+
+        Args:
+            session_id: Session ID
+            values: List name -> value to append
+
+        Returns:
+            False if the session does not exist
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_list(self, session_id: str, field: str) -> List[str]:
+        """
+        Get a list of a session, oldest value first.
+
+        Args:
+            session_id: Session ID
+            field: List name
+
+        Returns:
+            List values (empty if the list or session does not exist)
+        """
+        raise NotImplementedError
+
+    def count(self, session_id: str, field: str) -> int:
+        """
+        Get the length of a list of a session.
+
+        Args:
+            session_id: Session ID
+            field: List name
+
+        Returns:
+            Number of values in the list
+        """
+        return len(self.get_list(session_id, field))
+
+    @abstractmethod
+    def clear_list(self, session_id: str, field: str):
+        """
+        Empty a list of a session and bump its version.
+
+        Args:
+            session_id: Session ID
+            field: List name
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        """
+        Remove a session and all of its lists.
+
+        Args:
+            session_id: Session ID
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def expired_sessions(self, cutoff: float) -> List[str]:
+        """
+        List sessions last accessed before a cutoff.
+
+        Args:
+            cutoff: Epoch seconds
+
+        Returns:
+            Session IDs
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_sessions(self) -> List[Tuple[str, float]]:
+        """
+        List all sessions, least recently accessed first.
+
+        Returns:
+            (session ID, last accessed epoch seconds) pairs
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def put_value(self, key: str, value: str, ttl: float):
+        """
+        Store a standalone value (e.g. background job state) with a lifetime.
+
+        Args:
+            key: Key
+            value: Value
+            ttl: Seconds until the value expires
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_value(self, key: str) -> Optional[str]:
+        """
+        Get a standalone value.
+
+        Args:
+            key: Key
+
+        Returns:
+            Value, or None if missing or expired
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release connections held by the store."""
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local store; the default for a single worker"""
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._values: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def create(self, session_id: str, now: float):
+        with self._lock:
+            self._sessions[session_id] = {"created_at": now, "last_accessed": now, "version": 0, "lists": {}}
+
+    def touch(self, session_id: str, now: float, timeout: float, refresh_after: float = 0) -> Optional[Dict[str, float]]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if now - session["last_accessed"] > timeout:
+                return {
+                    "created_at": session["created_at"],
+                    "last_accessed": session["last_accessed"],
+                    "version": session["version"],
+                    "expired": True
+                }
+            session["last_accessed"] = now
+            return {"created_at": session["created_at"], "last_accessed": now, "version": session["version"], "expired": False}
+
+    def append(self, session_id: str, values: Dict[str, str]) -> bool:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            for field, value in values.items():
+                session["lists"].setdefault(field, []).append(value)
+            session["version"] += 1
+            return True
+
+    def get_list(self, session_id: str, field: str) -> List[str]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return []
+            return list(session["lists"].get(field, []))
+
+    def count(self, session_id: str, field: str) -> int:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return 0
+            return len(session["lists"].get(field, []))
+
+    def clear_list(self, session_id: str, field: str):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session["lists"].pop(field, None)
+                session["version"] += 1
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def expired_sessions(self, cutoff: float) -> List[str]:
+        with self._lock:
+            return [
+                session_id for session_id, session in self._sessions.items()
+                if session["last_accessed"] < cutoff
+            ]
+
+    def list_sessions(self) -> List[Tuple[str, float]]:
+        with self._lock:
+            sessions = [(session_id, session["last_accessed"]) for session_id, session in self._sessions.items()]
+        return sorted(sessions, key=lambda item: item[1])
+
+    def put_value(self, key: str, value: str, ttl: float):
+        with self._lock:
+            self._values[key] = (value, time.time() + ttl)
+
+    def get_value(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.time():
+                del self._values[key]
+                return None
+            return entry[0]
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Store backed by a SQLite database file.
+
+    Suitable for several workers on one host (or instances sharing a volume
+    with working file locks). Uses WAL mode so readers do not block writers.
+    """
+
+    shared = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            created_at REAL NOT NULL,
+            last_accessed REAL NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS session_items (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            field TEXT NOT NULL,
+            value TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS session_items_lookup ON session_items (session_id, field, seq);
+        CREATE TABLE IF NOT EXISTS kv (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize SQLite store.
+
+        Args:
+            path: Database file path (created if missing)
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+
+        # Databases created before sessions had a version
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(sessions)")]
+        if "version" not in columns:
+            conn.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit; multi-statement writes use explicit transactions
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, session_id: str, now: float):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO sessions (id, created_at, last_accessed) VALUES (?, ?, ?)",
+            (session_id, now, now)
+        )
+
+    def touch(self, session_id: str, now: float, timeout: float, refresh_after: float = 0) -> Optional[Dict[str, float]]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT created_at, last_accessed, version FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        created_at, last_accessed, version = row
+        if now - last_accessed > timeout:
+            return {"created_at": created_at, "last_accessed": last_accessed, "version": version, "expired": True}
+
+        if now - last_accessed > refresh_after:
+            # A single statement needs no explicit transaction; a concurrent
+            # delete or a newer access time makes it a no-op
+            conn.execute(
+                "UPDATE sessions SET last_accessed = ? WHERE id = ? AND last_accessed < ?",
+                (now, session_id, now)
+            )
+            last_accessed = now
+        return {"created_at": created_at, "last_accessed": last_accessed, "version": version, "expired": False}
+
+    def append(self, session_id: str, values: Dict[str, str]) -> bool:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            exists = conn.execute(
+                "UPDATE sessions SET version = version + 1 WHERE id = ?", (session_id,)
+            ).rowcount
+            if exists:
+                conn.executemany(
+                    "INSERT INTO session_items (session_id, field, value) VALUES (?, ?, ?)",
+                    [(session_id, field, value) for field, value in values.items()]
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return bool(exists)
+
+    def get_list(self, session_id: str, field: str) -> List[str]:
+        rows = self._connect().execute(
+            "SELECT value FROM session_items WHERE session_id = ? AND field = ? ORDER BY seq",
+            (session_id, field)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def count(self, session_id: str, field: str) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM session_items WHERE session_id = ? AND field = ?",
+            (session_id, field)
+        ).fetchone()[0]
+
+    def clear_list(self, session_id: str, field: str):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM session_items WHERE session_id = ? AND field = ?",
+                (session_id, field)
+            )
+            conn.execute("UPDATE sessions SET version = version + 1 WHERE id = ?", (session_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, session_id: str):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM session_items WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def expired_sessions(self, cutoff: float) -> List[str]:
+        rows = self._connect().execute(
+            "SELECT id FROM sessions WHERE last_accessed < ?", (cutoff,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def list_sessions(self) -> List[Tuple[str, float]]:
+        rows = self._connect().execute(
+            "SELECT id, last_accessed FROM sessions ORDER BY last_accessed"
+        ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def put_value(self, key: str, value: str, ttl: float):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, now + ttl)
+        )
+        conn.execute("DELETE FROM kv WHERE expires_at < ?", (now,))
+
+    def get_value(self, key: str) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT value FROM kv WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+
+class _NotSent(ConnectionError):
+    """The connection failed before a request was fully written, so none of it ran"""
+
+
+class _RespConnection:
+    """Minimal blocking RESP2 client connection"""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+
+    def send(self, *commands: tuple):
+        buffer = bytearray()
+        for command in commands:
+            buffer += b"*%d\r\n" % len(command)
+            for arg in command:
+                if isinstance(arg, str):
+                    arg = arg.encode("utf-8")
+                elif not isinstance(arg, bytes):
+                    arg = str(arg).encode("ascii")
+                buffer += b"$%d\r\n" % len(arg) + arg + b"\r\n"
+        self._sock.sendall(buffer)
+
+    def read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, body = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            raise RespError(body.decode("utf-8"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [self.read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from server: {line!r}")
+
+    def close(self):
+        try:
+            self._reader.close()
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Store backed by a Redis-protocol server (Redis, Valkey, KeyDB, ...).
+
+    Speaks RESP2 directly over a socket, so no client library is required
+    and any server implementing the basic string, hash, list, set and sorted
+    set commands plus MULTI/EXEC and WATCH works.
+
+    Keys:
+        <prefix>sessions                 sorted set of session ID by last access
+        <prefix>session:<id>             hash with created_at and version
+        <prefix>session:<id>:fields      set of list names in use
+        <prefix>session:<id>:list:<name> list values
+        <prefix>kv:<key>                 standalone values (with expiry)
+    """
+
+    shared = True
+
+    # Times a watched update is rebuilt after a concurrent change to its session
+    WATCH_ATTEMPTS = 10
+
+    def __init__(self, url: str, prefix: str = "fontsub:", timeout: float = 5.0):
+        """
+        Initialize Redis store.
+
+        Args:
+            url: redis://[:password@]host[:port][/db]
+            prefix: Key prefix
+            timeout: Socket timeout in seconds
+        """
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._local = threading.local()
+
+        # Fail fast on a bad URL or unreachable server
+        self._execute("PING", idempotent=True)
+
+    def _connection(self) -> _RespConnection:
+        """Get this thread's connection, opening and authenticating it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _RespConnection(self.host, self.port, self.timeout)
+            try:
+                if self.password:
+                    if self.username:
+                        conn.send(("AUTH", self.username, self.password))
+                    else:
+                        conn.send(("AUTH", self.password))
+                    conn.read_reply()
+                if self.db:
+                    conn.send(("SELECT", self.db))
+                    conn.read_reply()
+            except Exception:
+                conn.close()
+                raise
+            self._local.conn = conn
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _roundtrip(self, commands: List[tuple]) -> List[Any]:
+        """
+        Send commands in one write and read one reply per command.
+
+        Raises:
+            _NotSent: If connecting or writing failed; the server has not
+                run any of the commands
+        """
+        try:
+            conn = self._connection()
+            conn.send(*commands)
+        except (ConnectionError, OSError) as e:
+            self._reset()
+            raise _NotSent(str(e)) from e
+
+        try:
+            return [conn.read_reply() for _ in commands]
+        except (RespError, ConnectionError, OSError):
+            # Replies may be left unread; the connection cannot be reused
+            self._reset()
+            raise
+
+    def _request(self, commands: List[tuple], idempotent: bool = False) -> List[Any]:
+        """
+        Run commands, reconnecting once if the connection dropped.
+
+        A request that never reached the server is always sent again. One
+        that failed after it was written is only sent again if idempotent:
+        the server may already have run it, and repeating a write such as
+        RPUSH or HINCRBY would apply it twice.
+        """
+        for attempt in range(2):
+            try:
+                return self._roundtrip(commands)
+            except _NotSent:
+                if attempt:
+                    raise
+            except (ConnectionError, OSError):
+                if attempt or not idempotent:
+                    raise
+
+    def _execute(self, *command, idempotent: bool = False) -> Any:
+        """Run one command (see _request for retries)"""
+        return self._request([command], idempotent)[0]
+
+    def _transaction(self, *commands: tuple, idempotent: bool = False) -> List[Any]:
+        """Run commands atomically with MULTI/EXEC and return their replies"""
+        replies = self._request([("MULTI",), *commands, ("EXEC",)], idempotent)[-1]
+        if replies is None:
+            raise RespError("Transaction aborted")
+        return replies
+
+    def _watched_transaction(self, session_id: str, build: Callable[[], Optional[List[tuple]]]) -> bool:
+        """
+        Run a transaction built from a session's current state, atomically.
+
+        The session hash is WATCHed before build() reads anything. Creating,
+        updating or deleting the session before EXEC drops the transaction,
+        and it is built again from fresh reads.
+
+        Args:
+            session_id: Session ID
+            build: Reads what it needs and returns the commands to run, or
+                None to leave the session alone
+
+        Returns:
+            False if build() returned None
+
+        Raises:
+            RespError: If the session kept changing for WATCH_ATTEMPTS tries
+        """
+        key = self._key(session_id)
+        for _ in range(self.WATCH_ATTEMPTS):
+            self._execute("WATCH", key, idempotent=True)
+            conn = self._local.conn
+            commands = build()
+            if self._local.conn is not conn:
+                # Reconnected while reading; the watch went with the old connection
+                continue
+            if commands is None:
+                self._execute("UNWATCH", idempotent=True)
+                return False
+            try:
+                replies = self._roundtrip([("MULTI",), *commands, ("EXEC",)])
+            except _NotSent:
+                continue
+            if replies[-1] is not None:
+                return True
+        raise RespError(f"Session {session_id} kept changing during an update")
+
+    def _key(self, session_id: str, *parts: str) -> str:
+        return ":".join((f"{self.prefix}session", session_id) + parts)
+
+    def create(self, session_id: str, now: float):
+        self._transaction(
+            ("HSET", self._key(session_id), "created_at", repr(now)),
+            ("ZADD", f"{self.prefix}sessions", repr(now), session_id),
+            idempotent=True
+        )
+
+    def touch(self, session_id: str, now: float, timeout: float, refresh_after: float = 0) -> Optional[Dict[str, float]]:
+        score, (created_at, version) = self._transaction(
+            ("ZSCORE", f"{self.prefix}sessions", session_id),
+            ("HMGET", self._key(session_id), "created_at", "version"),
+            idempotent=True
+        )
+        if score is None:
+            return None
+
+        last_accessed = float(score)
+        if now - last_accessed > timeout:
+            return {
+                "created_at": float(created_at or score),
+                "last_accessed": last_accessed,
+                "version": int(version or 0),
+                "expired": True
+            }
+
+        if now - last_accessed > refresh_after:
+            self._execute("ZADD", f"{self.prefix}sessions", "XX", repr(now), session_id, idempotent=True)
+            last_accessed = now
+        return {"created_at": float(created_at or now), "last_accessed": last_accessed, "version": int(version or 0), "expired": False}
+
+    def _exists(self, session_id: str) -> bool:
+        # Created and deleted together with the sessions entry
+        return bool(self._execute("EXISTS", self._key(session_id), idempotent=True))
+
+    def append(self, session_id: str, values: Dict[str, str]) -> bool:
+        commands = [("SADD", self._key(session_id, "fields"), *values.keys())]
+        commands += [("RPUSH", self._key(session_id, "list", field), value) for field, value in values.items()]
+        commands.append(("HINCRBY", self._key(session_id), "version", 1))
+        return self._watched_transaction(session_id, lambda: commands if self._exists(session_id) else None)
+
+    def get_list(self, session_id: str, field: str) -> List[str]:
+        values = self._execute("LRANGE", self._key(session_id, "list", field), 0, -1, idempotent=True) or []
+        return [value.decode("utf-8") for value in values]
+
+    def count(self, session_id: str, field: str) -> int:
+        return self._execute("LLEN", self._key(session_id, "list", field), idempotent=True)
+
+    def clear_list(self, session_id: str, field: str):
+        commands = [
+            ("DEL", self._key(session_id, "list", field)),
+            ("HINCRBY", self._key(session_id), "version", 1)
+        ]
+        self._watched_transaction(session_id, lambda: commands if self._exists(session_id) else None)
+
+    def delete(self, session_id: str):
+        def build() -> List[tuple]:
+            # An append between listing the fields and deleting would leave its list behind
+            fields = self._execute("SMEMBERS", self._key(session_id, "fields"), idempotent=True) or []
+            keys = [self._key(session_id, "list", field.decode("utf-8")) for field in fields]
+            return [
+                ("DEL", self._key(session_id), self._key(session_id, "fields"), *keys),
+                ("ZREM", f"{self.prefix}sessions", session_id)
+            ]
+
+        self._watched_transaction(session_id, build)
+
+    def expired_sessions(self, cutoff: float) -> List[str]:
+        session_ids = self._execute(
+            "ZRANGEBYSCORE", f"{self.prefix}sessions", "-inf", f"({cutoff!r}", idempotent=True
+        ) or []
+        return [session_id.decode("utf-8") for session_id in session_ids]
+
+    def list_sessions(self) -> List[Tuple[str, float]]:
+        reply = self._execute("ZRANGE", f"{self.prefix}sessions", 0, -1, "WITHSCORES", idempotent=True) or []
+        return [
+            (reply[i].decode("utf-8"), float(reply[i + 1]))
+            for i in range(0, len(reply), 2)
+        ]
+
+    def put_value(self, key: str, value: str, ttl: float):
+        self._execute("SET", f"{self.prefix}kv:{key}", value, "PX", max(int(ttl * 1000), 1), idempotent=True)
+
+    def get_value(self, key: str) -> Optional[str]:
+        value = self._execute("GET", f"{self.prefix}kv:{key}", idempotent=True)
+        return value.decode("utf-8") if value is not None else None
+
+    def close(self):
+        self._reset()
+
+
+def create_session_store(url: Optional[str]) -> SessionStore:
+    """
+    Build a session store from a URL.
+
+    Args:
+        url: "memory" (default), "sqlite:///path/to/sessions.db" or
+            "redis://[:password@]host[:port][/db]"
+
+    Returns:
+        SessionStore
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    if not url or url == "memory":
+        return MemorySessionStore()
+
+    if url.startswith("sqlite:///"):
+        path = url[len("sqlite:///"):]
+        logger.info(f"Using SQLite session store: {path}")
+        return SQLiteSessionStore(path)
+
+    if url.startswith(("redis://", "valkey://")):
+        store = RedisSessionStore(url)
+        logger.info(f"Using Redis session store: {store.host}:{store.port}/{store.db}")
+        return store
+
+    raise ValueError(f"Unsupported session store: {url}")
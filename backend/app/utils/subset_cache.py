@@ -0,0 +1,243 @@
+"""
+Content-addressed, size-bounded cache of generated font files.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SubsetCache:
+    """
+    LRU cache of subset results stored on disk with an in-memory index.
+
+    Entries are keyed by a digest of everything that determines the subset
+    output (source font hash, codepoints, subsetter options, flavor), so a
+    hit can be served with a plain file copy instead of re-running fontTools.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize subset cache.
+
+        Args:
+            cache_dir: Directory to store cached subset files
+            max_bytes: Maximum total size of cached files in bytes
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load_index()
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """
+        Build a cache key from the inputs that determine a subset.
+
+        Args:
+            **parts: JSON-serializable key components
+
+        Returns:
+            Hex digest cache key
+        """
+        payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def fetch(self, key: str, dest_path: str) -> bool:
+        """
+        Copy a cached subset to dest_path if present.
+
+        Args:
+            key: Cache key
+            dest_path: Where to place the cached file
+
+        Returns:
+            True on a cache hit, False otherwise
+        """
+        entry_path = self._entry_path(key)
+
+        with self._lock:
+            if key not in self._index and not self._adopt(key, entry_path):
+                self.misses += 1
+                return False
+            self._index.move_to_end(key)
+
+        try:
+            shutil.copyfile(entry_path, dest_path)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            # Entry was removed behind our back (e.g. by another worker)
+            with self._lock:
+                size = self._index.pop(key, None)
+                if size is not None:
+                    self._total_bytes -= size
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Get the path of a cached file so it can be served in place.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Path to the cached file, or None on a cache miss
+        """
+        entry_path = self._entry_path(key)
+
+        with self._lock:
+            if key not in self._index:
+                self._adopt(key, entry_path)
+            if key not in self._index or not entry_path.exists():
+                size = self._index.pop(key, None)
+                if size is not None:
+                    self._total_bytes -= size
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+
+        os.utime(entry_path)
+        return str(entry_path)
+
+    def temp_path(self) -> str:
+        """
+        Get a fresh temp file inside the cache directory.
+
+        Files written there can be added with store(..., move=True) without
+        a copy. They are not indexed until stored.
+
+        Returns:
+            Path to an empty temp file
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        return tmp_path
+
+    def store(self, key: str, src_path: str, move: bool = False):
+        """
+        Add a file to the cache.
+
+        Args:
+            key: Cache key
+            src_path: Path to the freshly generated file
+            move: Move src_path into the cache instead of copying it
+        """
+        size = os.path.getsize(src_path)
+        if size > self.max_bytes:
+            return
+
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if move:
+            os.replace(src_path, entry_path)
+        else:
+            # Write to a temp file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+            os.close(fd)
+            try:
+                shutil.copyfile(src_path, tmp_path)
+                os.replace(tmp_path, entry_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous
+            self._index[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counts and occupancy
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.bin"
+
+    def _adopt(self, key: str, entry_path: Path) -> bool:
+        """
+        Index an entry written by another process sharing the cache directory.
+        Caller holds the lock.
+        """
+        try:
+            size = entry_path.stat().st_size
+        except FileNotFoundError:
+            return False
+        self._index[key] = size
+        self._total_bytes += size
+        self._evict()
+        return key in self._index
+
+    def _evict(self):
+        """Drop least recently used entries until under budget. Caller holds the lock."""
+        while self._total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                self._entry_path(key).unlink()
+            except FileNotFoundError:
+                pass
+            logger.info(f"Evicted subset cache entry: {key}")
+
+    def _load_index(self):
+        """Rebuild the in-memory index from entries already on disk, oldest first."""
+        entries = []
+        for path in self.cache_dir.glob("*/*.bin"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+        with self._lock:
+            self._evict()
+
+        if entries:
+            logger.info(f"Loaded {len(self._index)} subset cache entries ({self._total_bytes} bytes)")
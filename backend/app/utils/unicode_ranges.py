@@ -0,0 +1,203 @@
+"""
+Helpers for working with Unicode code point ranges.
+"""
+import bisect
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+
+MAX_CODE_POINT = 0x10FFFF
+
+
+def to_ranges(code_points: Iterable[int]) -> List[Tuple[int, int]]:
+    """
+    Collapse code points into sorted, inclusive (start, end) ranges.
+
+    Args:
+        code_points: Code points in any order, duplicates allowed
+
+    Returns:
+        List of (start, end) tuples
+    """
+    ranges: List[Tuple[int, int]] = []
+    for code_point in sorted(set(code_points)):
+        if ranges and code_point == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], code_point)
+        else:
+            ranges.append((code_point, code_point))
+    return ranges
+
+
+def requested_ranges(characters: str, unicode_ranges: Optional[Iterable[str]] = None) -> List[Tuple[int, int]]:
+    """
+    Combine subset characters and CSS unicode-range values into ranges.
+
+    The ranges are not expanded, so a request for U+0000-10FFFF stays a
+    single tuple until it is matched against a font's cmap.
+
+    Args:
+        characters: Characters to include
+        unicode_ranges: Additional code points in CSS unicode-range syntax
+
+    Returns:
+        Sorted, merged list of (start, end) tuples
+
+    Raises:
+        ValueError: If a unicode-range value is malformed
+    """
+    ranges = to_ranges(ord(char) for char in characters)
+    for spec in unicode_ranges or []:
+        ranges.extend(parse_unicode_range(spec))
+    return merge_ranges(ranges)
+
+
+# Named slices for unicode-range splitting, in CSS unicode-range syntax.
+# Script ranges follow the split commonly used by web font services.
+SLICE_PRESETS: Dict[str, str] = {
+    "latin": (
+        "U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, "
+        "U+0304, U+0308, U+0329, U+2000-206F, U+2074, U+20AC, U+2122, U+2191, "
+        "U+2193, U+2212, U+2215, U+FEFF, U+FFFD"
+    ),
+    "latin-ext": (
+        "U+0100-02AF, U+0304, U+0308, U+0329, U+1E00-1E9F, U+1EF2-1EFF, U+2020, "
+        "U+20A0-20AB, U+20AD-20C0, U+2113, U+2C60-2C7F, U+A720-A7FF"
+    ),
+    "vietnamese": (
+        "U+0102-0103, U+0110-0111, U+0128-0129, U+0168-0169, U+01A0-01A1, "
+        "U+01AF-01B0, U+0300-0301, U+0303-0304, U+0308-0309, U+0323, U+0329, "
+        "U+1EA0-1EF9, U+20AB"
+    ),
+    "cyrillic": "U+0301, U+0400-045F, U+0490-0491, U+04B0-04B1, U+2116",
+    "cyrillic-ext": "U+0460-052F, U+1C80-1C88, U+20B4, U+2DE0-2DFF, U+A640-A69F, U+FE2E-FE2F",
+    "greek": "U+0370-0377, U+037A-037F, U+0384-038A, U+038C, U+038E-03A1, U+03A3-03FF",
+    "greek-ext": "U+1F00-1FFF",
+    "cjk-symbols": "U+3000-303F, U+3040-30FF, U+31F0-31FF, U+FF00-FFEF",
+    "hangul": "U+1100-11FF, U+3130-318F, U+A960-A97F, U+AC00-D7AF, U+D7B0-D7FF",
+    "cjk-ideographs": "U+4E00-9FFF, U+F900-FAFF",
+    "cjk-ideographs-ext": "U+3400-4DBF, U+20000-2A6DF, U+2A700-2EBEF",
+}
+
+# Slices used when a slicing request does not name any
+DEFAULT_SLICES = [
+    "latin", "latin-ext", "vietnamese", "cyrillic", "cyrillic-ext", "greek", "greek-ext",
+    "cjk-symbols", "hangul", "cjk-ideographs", "cjk-ideographs-ext",
+]
+
+
+def parse_unicode_range(spec: str) -> List[Tuple[int, int]]:
+    """
+    Parse a CSS unicode-range value into inclusive ranges.
+
+    Accepts comma-separated single code points (U+20AC), ranges (U+0000-00FF)
+    and wildcard ranges (U+4??). The "U+" prefix is optional.
+
+    Args:
+        spec: unicode-range value
+
+    Returns:
+        Sorted, merged list of (start, end) tuples
+
+    Raises:
+        ValueError: If the value is malformed or outside the Unicode range
+    """
+    ranges: List[Tuple[int, int]] = []
+    for token in spec.split(","):
+        token = token.strip()
+        if not token:
+            continue
+
+        body = token[2:] if token[:2].upper() == "U+" else token
+        try:
+            if "?" in body:
+                if "-" in body or body.rstrip("?").count("?"):
+                    raise ValueError
+                start = int(body.replace("?", "0"), 16)
+                end = int(body.replace("?", "F"), 16)
+            elif "-" in body:
+                first, last = body.split("-", 1)
+                start, end = int(first, 16), int(last, 16)
+            else:
+                start = end = int(body, 16)
+        except ValueError:
+            raise ValueError(f"Invalid unicode range: {token}")
+
+        if start > end or end > MAX_CODE_POINT:
+            raise ValueError(f"Invalid unicode range: {token}")
+        ranges.append((start, end))
+
+    return merge_ranges(ranges)
+
+
+def merge_ranges(ranges: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Sort inclusive ranges and merge overlapping or adjacent ones.
+
+    Args:
+        ranges: Inclusive ranges in any order
+
+    Returns:
+        Sorted, merged list of (start, end) tuples
+    """
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def format_unicode_range(ranges: Iterable[Tuple[int, int]]) -> str:
+    """
+    Format inclusive ranges as a CSS unicode-range value.
+
+    Args:
+        ranges: Inclusive ranges
+
+    Returns:
+        unicode-range value, e.g. "U+0000-00FF, U+20AC"
+    """
+    parts = []
+    for start, end in ranges:
+        if start == end:
+            parts.append(f"U+{start:04X}")
+        else:
+            parts.append(f"U+{start:04X}-{end:04X}")
+    return ", ".join(parts)
+
+
+def in_ranges(code_point: int, ranges: List[Tuple[int, int]]) -> bool:
+    """
+    Check whether a code point falls in sorted, merged inclusive ranges.
+
+    Args:
+        code_point: Code point to test
+        ranges: Sorted, non-overlapping ranges
+
+    Returns:
+        True if the code point is covered
+    """
+    index = bisect.bisect_right(ranges, (code_point, MAX_CODE_POINT)) - 1
+    return index >= 0 and ranges[index][0] <= code_point <= ranges[index][1]
+
+
+def select_code_points(ranges: List[Tuple[int, int]], candidates: Collection[int]) -> List[int]:
+    """
+    Pick the candidate code points covered by sorted, merged ranges.
+
+    Walks whichever side is smaller, so wide ranges against a small cmap and
+    a few characters against a large one are both cheap.
+
+    Args:
+        ranges: Sorted, non-overlapping ranges
+        candidates: Code points to choose from (e.g. a font's cmap)
+
+    Returns:
+        Sorted list of covered candidates
+    """
+    span = sum(end - start + 1 for start, end in ranges)
+    if span <= len(candidates):
+        return [
+            code_point for start, end in ranges for code_point in range(start, end + 1)
+            if code_point in candidates
+        ]
+    return sorted(code_point for code_point in candidates if in_ranges(code_point, ranges))
@@ -0,0 +1,99 @@
+"""
+Streaming zip archive writer for font downloads.
+"""
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+CHUNK_SIZE = 256 * 1024
+
+# Formats whose data is already compressed; deflating them again only costs CPU
+STORED_SUFFIXES = {".woff", ".woff2", ".zip"}
+
+
+def member_compression(path: str) -> int:
+    """
+    Choose the zip compression method for a member by its format.
+
+    Args:
+        path: Member file path
+
+    Returns:
+        zipfile.ZIP_STORED for precompressed formats, ZIP_DEFLATED otherwise
+    """
+    if Path(path).suffix.lower() in STORED_SUFFIXES:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+class _ChunkSink:
+    """Write-only file object that collects whatever zipfile writes to it"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        if chunks:
+            yield b"".join(chunks)
+
+
+def stream_zip(file_paths: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Generate a zip archive of the given files as a stream of bytes.
+
+    Nothing is written to disk; members are read in chunks and the archive
+    bytes are yielded as soon as zipfile produces them, so memory use stays
+    around one chunk regardless of archive size. Missing files are skipped.
+
+    Args:
+        file_paths: Paths of the files to include (stored under their basename)
+        chunk_size: Read size for member files
+
+    Yields:
+        Consecutive pieces of the zip archive
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w") as zipf:
+        for file_path in file_paths:
+            path = Path(file_path)
+            if not path.is_file():
+                continue
+
+            info = zipfile.ZipInfo.from_file(path, path.name)
+            info.compress_type = member_compression(file_path)
+
+            with open(path, "rb") as src, zipf.open(info, "w") as dest:
+                for chunk in iter(lambda: src.read(chunk_size), b""):
+                    dest.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+
+    # Central directory
+    yield from sink.drain()
+
+
+def zip_bytes(members: Dict[str, bytes]) -> bytes:
+    """
+    Build a zip archive from in-memory data.
+
+    Members carry a fixed timestamp, so the same inputs give the same archive.
+
+    Args:
+        members: Member name to contents
+
+    Returns:
+        The zip archive
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w") as zipf:
+        for name, data in members.items():
+            zipf.writestr(zipfile.ZipInfo(name), data, compress_type=member_compression(name))
+    return b"".join(sink.drain())
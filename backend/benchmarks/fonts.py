@@ -0,0 +1,230 @@
+"""
+Deterministic synthetic fonts for benchmarks.
+
+Fonts are drawn with fontTools' FontBuilder from a seeded random generator,
+so every run (and every machine with the same fontTools version) produces
+byte-identical files of a controlled size. No real font files are needed.
+"""
+import hashlib
+import math
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.misc.timeTools import timestampFromString
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.tables.TupleVariation import TupleVariation
+
+BASIC_LATIN = list(range(0x20, 0x7F))
+LATIN_1 = list(range(0xA0, 0x100))
+LATIN_EXTENDED_A = list(range(0x100, 0x180))
+CJK_START = 0x4E00
+
+# head.created/modified of every generated font
+TIMESTAMP = timestampFromString("Mon Jan  1 00:00:00 2024")
+
+# Latin-1 letters built as composites of a base letter and an accent (glyf fonts)
+COMPOSITES = {
+    0xC0: ("A", "grave"), 0xC1: ("A", "acute"), 0xC2: ("A", "circumflex"), 0xC4: ("A", "dieresis"),
+    0xC8: ("E", "grave"), 0xC9: ("E", "acute"), 0xCA: ("E", "circumflex"), 0xCB: ("E", "dieresis"),
+    0xE0: ("a", "grave"), 0xE1: ("a", "acute"), 0xE2: ("a", "circumflex"), 0xE4: ("a", "dieresis"),
+    0xE8: ("e", "grave"), 0xE9: ("e", "acute"), 0xEA: ("e", "circumflex"), 0xEB: ("e", "dieresis"),
+    0xF2: ("o", "grave"), 0xF3: ("o", "acute"), 0xF4: ("o", "circumflex"), 0xF6: ("o", "dieresis"),
+}
+ACCENTS = ("grave", "acute", "circumflex", "dieresis")
+
+# Benchmark fonts: repertoire, outline format, outline complexity and container.
+# "cjk_glyphs" is multiplied by the scale factor; "source" rewraps another font.
+FONT_SPECS: Dict[str, Dict[str, Any]] = {
+    "latin-glyf": {
+        "outline": "glyf", "latin": True, "cjk_glyphs": 0,
+        "contours": (1, 3), "points": (8, 24),
+    },
+    "latin-cff": {
+        "outline": "cff", "latin": True, "cjk_glyphs": 0,
+        "contours": (1, 3), "points": (8, 24),
+    },
+    "cjk-glyf": {
+        "outline": "glyf", "latin": False, "cjk_glyphs": 4000,
+        "contours": (4, 10), "points": (8, 16),
+    },
+    "cjk-woff2": {"source": "cjk-glyf", "flavor": "woff2"},
+    "variable-glyf": {
+        "outline": "glyf", "latin": True, "cjk_glyphs": 0, "variable": True,
+        "contours": (1, 3), "points": (8, 24),
+    },
+}
+
+# Characters each benchmark subsets a font to
+SUBSET_TEXT = {
+    "latin": "".join(chr(code_point) for code_point in BASIC_LATIN),
+    "cjk": "".join(chr(code_point) for code_point in BASIC_LATIN)
+           + "".join(chr(CJK_START + i) for i in range(1500)),
+}
+
+
+def subset_text(name: str) -> str:
+    """
+    Get the characters benchmarks subset a font to.
+
+    Args:
+        name: Font spec name
+
+    Returns:
+        ASCII for Latin fonts, ASCII plus the first 1500 ideographs for CJK fonts
+    """
+    spec = FONT_SPECS[name]
+    spec = FONT_SPECS.get(spec.get("source"), spec)
+    return SUBSET_TEXT["cjk" if spec["cjk_glyphs"] else "latin"]
+
+
+def _draw_outline(pen, rng: random.Random, contours: Tuple[int, int], points: Tuple[int, int]):
+    """Draw closed quadratic contours with jittered points around random centers"""
+    for _ in range(rng.randint(*contours)):
+        center_x, center_y = rng.randint(100, 500), rng.randint(0, 600)
+        radius = rng.randint(40, 200)
+        count = rng.randint(*points) // 2 * 2
+        contour = []
+        for i in range(count):
+            angle = 2 * math.pi * i / count
+            distance = radius * rng.uniform(0.6, 1.0)
+            contour.append((round(center_x + distance * math.cos(angle)), round(center_y + distance * math.sin(angle))))
+        pen.moveTo(contour[0])
+        for i in range(1, count - 1, 2):
+            pen.qCurveTo(contour[i], contour[i + 1])
+        pen.lineTo(contour[-1])
+        pen.closePath()
+
+
+def _repertoire(spec: Dict[str, Any], scale: float) -> List[int]:
+    code_points = list(BASIC_LATIN)
+    if spec["latin"]:
+        code_points += LATIN_1 + LATIN_EXTENDED_A
+    code_points += [CJK_START + i for i in range(int(spec["cjk_glyphs"] * scale))]
+    return code_points
+
+
+def build_font(name: str, output_dir: str, scale: float = 1.0) -> Dict[str, Any]:
+    """
+    Generate a benchmark font.
+
+    Args:
+        name: Font spec name (see FONT_SPECS)
+        output_dir: Directory to write the font to
+        scale: Multiplier for the number of CJK glyphs
+
+    Returns:
+        Dictionary with the font path, file size, glyph count and SHA-256
+    """
+    spec = FONT_SPECS[name]
+    if spec.get("source"):
+        return _rewrap_font(name, output_dir, build_font(spec["source"], output_dir, scale))
+
+    rng = random.Random(name)
+    is_ttf = spec["outline"] == "glyf"
+
+    code_points = _repertoire(spec, scale)
+    glyph_names = {code_point: f"uni{code_point:04X}" for code_point in code_points}
+    glyph_names.update({ord(char): char for char in "AEaeo"})
+    accents = list(ACCENTS) if is_ttf else []
+    # Accents come first so composites can reference them
+    glyph_order = [".notdef"] + accents + [glyph_names[code_point] for code_point in code_points]
+
+    code_points_by_name = {glyph_name: code_point for code_point, glyph_name in glyph_names.items()}
+    glyphs = {}
+    charstrings = {}
+    for glyph_name in glyph_order:
+        if is_ttf and code_points_by_name.get(glyph_name) in COMPOSITES:
+            code_point = code_points_by_name[glyph_name]
+            base, accent = COMPOSITES[code_point]
+            pen = TTGlyphPen(glyphs)
+            pen.addComponent(base, (1, 0, 0, 1, 0, 0))
+            pen.addComponent(accent, (1, 0, 0, 1, 0, 500))
+            glyphs[glyph_name] = pen.glyph()
+        elif is_ttf:
+            pen = TTGlyphPen(None)
+            _draw_outline(pen, rng, spec["contours"], spec["points"])
+            glyphs[glyph_name] = pen.glyph()
+        else:
+            pen = T2CharStringPen(600, None)
+            _draw_outline(pen, rng, spec["contours"], spec["points"])
+            charstrings[glyph_name] = pen.getCharString()
+
+    family = f"Bench {name}"
+    builder = FontBuilder(1000, isTTF=is_ttf)
+    builder.setupGlyphOrder(glyph_order)
+    builder.setupCharacterMap({code_point: glyph_names[code_point] for code_point in code_points})
+    if is_ttf:
+        builder.setupGlyf(glyphs)
+    else:
+        builder.setupCFF(family.replace(" ", ""), {"FullName": family}, charstrings, {})
+    builder.setupHorizontalMetrics({glyph_name: (600, 50) for glyph_name in glyph_order})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({"familyName": family, "styleName": "Regular"})
+    builder.setupOS2()
+    builder.setupPost()
+
+    if spec.get("variable"):
+        builder.setupFvar([("wght", 100, 400, 900, "Weight")], [])
+        variations = {}
+        for glyph_name in glyph_order:
+            glyph = builder.font["glyf"][glyph_name]
+            # One delta per outline point plus the four phantom points
+            point_count = (len(glyph.coordinates) if glyph.numberOfContours > 0 else len(getattr(glyph, "components", []))) + 4
+            deltas = [(rng.randint(-30, 30), rng.randint(-10, 10)) for _ in range(point_count)]
+            variations[glyph_name] = [TupleVariation({"wght": (0, 1.0, 1.0)}, deltas)]
+        builder.setupGvar(variations)
+
+    # Fixed timestamps keep the files byte-identical across runs
+    builder.updateHead(created=TIMESTAMP, modified=TIMESTAMP)
+    builder.font.recalcTimestamp = False
+    path = Path(output_dir) / f"Bench-{name}{'.ttf' if is_ttf else '.otf'}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    builder.save(str(path))
+
+    return _font_info(path, len(glyph_order))
+
+
+def _rewrap_font(name: str, output_dir: str, source: Dict[str, Any]) -> Dict[str, Any]:
+    """Save a generated font in another container"""
+    spec = FONT_SPECS[name]
+    font = TTFont(source["path"], recalcTimestamp=False)
+    font.flavor = spec["flavor"]
+    path = Path(output_dir) / f"Bench-{name}.{spec['flavor']}"
+    font.save(str(path))
+    return _font_info(path, source["glyph_count"])
+
+
+def _font_info(path: Path, glyph_count: int) -> Dict[str, Any]:
+    data = path.read_bytes()
+    return {
+        "path": str(path),
+        "size": len(data),
+        "glyph_count": glyph_count,
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def build_fonts(output_dir: str, scale: float = 1.0) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate every benchmark font.
+
+    Args:
+        output_dir: Directory to write the fonts to
+        scale: Multiplier for the number of CJK glyphs
+
+    Returns:
+        Dictionary of font spec name to build_font() result
+    """
+    fonts = {}
+    for name, spec in FONT_SPECS.items():
+        source = spec.get("source")
+        if source in fonts:
+            fonts[name] = _rewrap_font(name, output_dir, fonts[source])
+        else:
+            fonts[name] = build_font(name, output_dir, scale)
+    return fonts
+
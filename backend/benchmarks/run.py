@@ -0,0 +1,521 @@
+"""
+Benchmark runner for the font pipeline.
+
+Usage (from the backend directory):
+    python -m benchmarks.run [--repeat 3] [--only 'create_subset*'] [--output results.json]
+    python -m benchmarks.run --save-baseline
+
+Generates synthetic fonts (see benchmarks.fonts), then times each pipeline
+stage per font (extract_metadata, estimate_subset, create_subset,
+convert_formats, create_zip_archive), the upload response on its own and the
+end-to-end HTTP flow (upload, subset, export, download-all) through the
+FastAPI app in-process. Each
+benchmark reports the median and minimum wall time over --repeat runs after
+a warm-up run, and the peak Python heap of one extra traced run.
+
+Results are compared with the stored baseline (benchmarks/baseline.json).
+Times are normalized by a fixed pure-Python calibration workload, so a
+baseline recorded on one machine remains meaningful on another; memory is
+compared as-is. The exit code is 1 if any benchmark regressed beyond the
+thresholds. Nothing touches the network.
+"""
+import argparse
+import fnmatch
+import gc
+import hashlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+import fontTools
+
+from benchmarks.fonts import build_fonts, subset_text
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Changes smaller than these are noise regardless of the relative thresholds
+MIN_TIME_DELTA = 0.002
+MIN_MEMORY_DELTA = 256 * 1024
+
+EXPORT_FORMATS = ["ttf", "woff", "woff2"]
+
+
+def calibrate(rounds: int = 7) -> float:
+    """
+    Time a fixed pure-Python workload used to normalize timings across machines.
+
+    Args:
+        rounds: Number of timed rounds
+
+    Returns:
+        Fastest round in seconds (the least disturbed by other load)
+    """
+    def workload():
+        values = [(i * 7919) % 100003 for i in range(300000)]
+        values.sort()
+        table = {value: str(value) for value in values[:100000]}
+        digest = hashlib.sha256()
+        for value in values[:20000]:
+            digest.update(table.get(value, "").encode("ascii"))
+        return digest.hexdigest()
+
+    workload()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        workload()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure(func: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """
+    Time a benchmark and record its peak memory.
+
+    If func has a setup attribute, it is called untimed before every run.
+
+    Args:
+        func: Benchmark body
+        repeat: Timed runs
+        warmup: Untimed runs first (imports, caches of the library itself)
+
+    Returns:
+        Dictionary with median_seconds, min_seconds and peak_bytes (peak
+        Python heap of one traced run)
+    """
+    setup = getattr(func, "setup", None) or (lambda: None)
+    for _ in range(warmup):
+        setup()
+        func()
+
+    timings = []
+    for _ in range(repeat):
+        setup()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # Tracing slows allocation down, so memory gets a run of its own
+    setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "peak_bytes": peak,
+    }
+
+
+def _with_setup(func: Callable[[], Any], setup: Callable[[], Any]) -> Callable[[], Any]:
+    """Attach an untimed per-run setup step to a benchmark (see measure)"""
+    func.setup = setup
+    return func
+
+
+def stage_benchmarks(fonts: Dict[str, Dict[str, Any]], work_dir: Path) -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    Build the per-stage benchmarks.
+
+    The service runs without caches and serially, so every run does the full
+    work of the stage.
+
+    Args:
+        fonts: Generated fonts (see build_fonts)
+        work_dir: Scratch directory for outputs
+
+    Returns:
+        (benchmark name, zero-argument callable) pairs
+    """
+    from app.services.font_service import FontService
+
+    service = FontService()
+    benchmarks = []
+    for name, font in fonts.items():
+        path = font["path"]
+        characters = subset_text(name)
+        output_dir = work_dir / name
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Inputs for later stages are produced once, outside the timed code
+        subset_path = service.create_subset(path, characters, str(output_dir), custom_font_name=f"{name}-subset")
+        exported = service.convert_formats(subset_path, EXPORT_FORMATS, str(output_dir), custom_font_name=f"{name}-export")
+        exported_paths = [str(output_dir / item["filename"]) for item in exported]
+
+        benchmarks += [
+            (f"extract_metadata[{name}]", lambda path=path: service.extract_metadata(path)),
+            (f"estimate_subset[{name}]", lambda path=path, characters=characters: service.estimate_subset(path, characters)),
+            (f"create_subset[{name}]", lambda path=path, characters=characters, output_dir=output_dir: service.create_subset(
+                path, characters, str(output_dir), custom_font_name=f"{name}-subset"
+            )),
+            (f"convert_formats[{name}]", lambda subset_path=subset_path, output_dir=output_dir: service.convert_formats(
+                subset_path, EXPORT_FORMATS, str(output_dir), custom_font_name=f"{name}-export"
+            )),
+            (f"create_zip_archive[{name}]", lambda exported_paths=exported_paths: service.create_zip_archive(
+                exported_paths, "bench", font_name=name
+            )),
+        ]
+    return benchmarks
+
+
+def http_benchmarks(fonts: Dict[str, Dict[str, Any]], work_dir: Path) -> Tuple[List[Tuple[str, Callable[[], Any]]], Any]:
+    """
+    Build the end-to-end HTTP benchmarks.
+
+    The app is imported with its upload, output and cache directories under
+    work_dir, subset/archive/parsed-font caches disabled and rate limits off,
+    and driven in-process through Starlette's TestClient (requires httpx).
+    http_upload times the upload response on its own. Glyph cost indexing
+    stays on for it: every run starts without the font's index, once the
+    previous run's background index job has finished.
+
+    Args:
+        fonts: Generated fonts (see build_fonts)
+        work_dir: Scratch directory for the app's files
+
+    Returns:
+        Tuple of ((benchmark name, callable) pairs, TestClient to close
+        when done)
+    """
+    work_dir.mkdir(parents=True, exist_ok=True)
+    os.environ.update({
+        "UPLOAD_DIR": str(work_dir / "uploads"),
+        "OUTPUT_DIR": str(work_dir / "outputs"),
+        "CACHE_DIR": str(work_dir / "cache"),
+        "SESSION_STORE": "memory",
+        "FONT_WORKERS": "0",
+        "SUBSET_CACHE_MAX_BYTES": "0",
+        "ARCHIVE_CACHE_MAX_BYTES": "0",
+        "FONT_CACHE_MAX_BYTES": "0",
+        "GLYPH_COST_CACHE_MAX_BYTES": "0",
+    })
+    from fastapi.testclient import TestClient
+    from app.main import app, font_service, job_manager
+
+    app.state.limiter.enabled = False
+    client = TestClient(app)
+    client.__enter__()
+
+    def flow(name: str, path: str, characters: str):
+        with open(path, "rb") as f:
+            response = client.post("/api/upload", files={"file": (Path(path).name, f)})
+        _check(response, "upload")
+        session_id = response.json()["session_id"]
+        try:
+            _check(client.post("/api/subset", json={"session_id": session_id, "characters": characters}), "subset")
+            _check(client.post("/api/export", json={"session_id": session_id, "formats": EXPORT_FORMATS}), "export")
+            _check(client.get(f"/api/download-all/{session_id}"), "download-all")
+        finally:
+            client.delete(f"/api/session/{session_id}")
+
+    def upload(path: str):
+        with open(path, "rb") as f:
+            response = client.post("/api/upload", files={"file": (Path(path).name, f)})
+        _check(response, "upload")
+        client.delete(f"/api/session/{response.json()['session_id']}")
+
+    def cold_index():
+        # Let the previous run's glyph cost index job finish, then forget the
+        # index so the next upload starts from scratch
+        while job_manager.queue_depth():
+            time.sleep(0.01)
+        font_service.glyph_cost_store.clear_memory()
+
+    def one_shot(path: str, characters: str):
+        with open(path, "rb") as f:
+            response = client.post(
+                "/api/subset-font",
+                files={"file": (Path(path).name, f)},
+                data={"characters": characters, "formats": ",".join(EXPORT_FORMATS)}
+            )
+        _check(response, "subset-font")
+
+    benchmarks = [
+        (f"http_flow[{name}]", lambda name=name, path=font["path"]: flow(name, path, subset_text(name)))
+        for name, font in fonts.items()
+    ]
+    benchmarks += [
+        (f"http_upload[{name}]", _with_setup(lambda path=font["path"]: upload(path), cold_index))
+        for name, font in fonts.items()
+    ]
+    benchmarks += [
+        (f"http_one_shot[{name}]", lambda name=name, path=font["path"]: one_shot(path, subset_text(name)))
+        for name, font in fonts.items()
+    ]
+    return benchmarks, client
+
+
+def _check(response, step: str):
+    if response.status_code != 200:
+        raise RuntimeError(f"{step} returned {response.status_code}: {response.text[:200]}")
+
+
+def environment() -> Dict[str, str]:
+    """
+    Describe the software and machine the benchmarks ran on.
+
+    Returns:
+        Dictionary of version and platform strings
+    """
+    try:
+        import brotli
+        brotli_version = getattr(brotli, "__version__", "unknown")
+    except ImportError:
+        brotli_version = "missing"
+    return {
+        "python": platform.python_version(),
+        "fonttools": fontTools.version,
+        "brotli": brotli_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": str(os.cpu_count()),
+    }
+
+
+def run_benchmarks(
+    repeat: int = 3,
+    scale: float = 1.0,
+    only: Optional[List[str]] = None,
+    include_http: bool = True
+) -> Dict[str, Any]:
+    """
+    Generate the fonts and run every selected benchmark.
+
+    Args:
+        repeat: Timed runs per benchmark
+        scale: Multiplier for the number of CJK glyphs
+        only: fnmatch patterns selecting benchmarks by name
+        include_http: Run the end-to-end HTTP benchmarks
+
+    Returns:
+        Results dictionary (environment, calibration, fonts, benchmarks)
+    """
+    work_dir = Path(tempfile.mkdtemp(prefix="fontsub-bench-"))
+    client = None
+    try:
+        logger.info("Generating fonts")
+        fonts = build_fonts(str(work_dir / "fonts"), scale)
+
+        benchmarks = stage_benchmarks(fonts, work_dir / "stages")
+        if include_http:
+            try:
+                http, client = http_benchmarks(fonts, work_dir / "http")
+                benchmarks += http
+            except ImportError as e:
+                logger.warning(f"Skipping HTTP benchmarks ({e}); install httpx to run them")
+        if only:
+            benchmarks = [
+                (name, func) for name, func in benchmarks
+                if any(fnmatch.fnmatch(name, pattern) for pattern in only)
+            ]
+
+        calibration = calibrate()
+        results = {}
+        for name, func in benchmarks:
+            logger.info(f"Running {name}")
+            results[name] = measure(func, repeat)
+
+        # Calibrating on both sides of the run evens out frequency scaling
+        calibration = min(calibration, calibrate())
+        for result in results.values():
+            result["normalized"] = result["min_seconds"] / calibration
+
+        return {
+            "environment": environment(),
+            "calibration_seconds": calibration,
+            "repeat": repeat,
+            "scale": scale,
+            "fonts": {
+                name: {key: font[key] for key in ("size", "glyph_count", "sha256")}
+                for name, font in fonts.items()
+            },
+            "benchmarks": results,
+        }
+    finally:
+        if client is not None:
+            client.__exit__(None, None, None)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.25,
+    memory_threshold: float = 0.25
+) -> Dict[str, Any]:
+    """
+    Compare results with a baseline.
+
+    Times are compared on the fastest run, normalized by the calibration
+    workload. A benchmark regresses when its normalized time grows by more than
+    threshold (and by more than MIN_TIME_DELTA seconds), or its peak memory
+    grows by more than memory_threshold (and by more than MIN_MEMORY_DELTA).
+
+    Args:
+        results: Output of run_benchmarks()
+        baseline: Earlier output of run_benchmarks()
+        threshold: Allowed relative slowdown
+        memory_threshold: Allowed relative memory growth
+
+    Returns:
+        Dictionary with per-benchmark ratios, the regressed benchmark names
+        and warnings about inputs that differ from the baseline
+    """
+    warnings = []
+    if results["scale"] != baseline.get("scale"):
+        warnings.append(f"scale {results['scale']} differs from the baseline's {baseline.get('scale')}")
+    for name, font in results["fonts"].items():
+        previous = baseline.get("fonts", {}).get(name)
+        if previous and previous["sha256"] != font["sha256"]:
+            warnings.append(f"generated font {name} differs from the baseline's")
+    for key, value in results["environment"].items():
+        previous = baseline.get("environment", {}).get(key)
+        if key in ("python", "fonttools", "brotli") and previous and previous != value:
+            warnings.append(f"{key} {value} (baseline: {previous})")
+
+    comparisons = {}
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            comparisons[name] = {"status": "new"}
+            continue
+
+        time_ratio = current["normalized"] / previous["normalized"] if previous["normalized"] else 1.0
+        memory_ratio = current["peak_bytes"] / previous["peak_bytes"] if previous["peak_bytes"] else 1.0
+        # Express the absolute change in this machine's seconds
+        time_delta = current["min_seconds"] - previous["normalized"] * results["calibration_seconds"]
+        memory_delta = current["peak_bytes"] - previous["peak_bytes"]
+
+        slower = time_ratio > 1 + threshold and time_delta > MIN_TIME_DELTA
+        larger = memory_ratio > 1 + memory_threshold and memory_delta > MIN_MEMORY_DELTA
+        status = "regressed" if slower or larger else "ok"
+        if status == "regressed":
+            regressions.append(name)
+        comparisons[name] = {
+            "status": status,
+            "time_ratio": round(time_ratio, 3),
+            "memory_ratio": round(memory_ratio, 3),
+        }
+
+    return {"benchmarks": comparisons, "regressions": regressions, "warnings": warnings}
+
+
+def format_table(results: Dict[str, Any], comparison: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Render results (and a comparison) as a plain text table.
+
+    Args:
+        results: Output of run_benchmarks()
+        comparison: Output of compare()
+
+    Returns:
+        Table text
+    """
+    lines = [f"{'benchmark':36} {'median':>10} {'min':>10} {'peak MB':>9}  vs baseline"]
+    for name, result in results["benchmarks"].items():
+        line = (
+            f"{name:36} {result['median_seconds'] * 1000:8.1f}ms {result['min_seconds'] * 1000:8.1f}ms "
+            f"{result['peak_bytes'] / 1024 / 1024:9.2f}"
+        )
+        if comparison:
+            entry = comparison["benchmarks"][name]
+            if entry["status"] == "new":
+                line += "  new"
+            else:
+                line += f"  time x{entry['time_ratio']:.2f} memory x{entry['memory_ratio']:.2f}"
+                if entry["status"] == "regressed":
+                    line += "  REGRESSED"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Arguments (defaults to sys.argv)
+
+    Returns:
+        Exit code: 0 on success, 1 if any benchmark regressed, 2 on invalid input
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Font pipeline benchmarks")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the number of CJK glyphs")
+    parser.add_argument("--only", action="append", help="Run benchmarks matching this pattern (repeatable)")
+    parser.add_argument("--no-http", action="store_true", help="Skip the end-to-end HTTP benchmarks")
+    parser.add_argument("--output", help="Write the JSON results here")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown (0.25 = 25%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="Allowed relative peak memory growth")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr)
+    logging.getLogger("fontTools").setLevel(logging.WARNING)
+    if not args.verbose:
+        logging.getLogger("app").setLevel(logging.WARNING)
+    if args.repeat < 1:
+        print("error: --repeat must be at least 1", file=sys.stderr)
+        return 2
+
+    # Deterministic head timestamps in generated subsets
+    os.environ.setdefault("SOURCE_DATE_EPOCH", "0")
+
+    results = run_benchmarks(
+        repeat=args.repeat,
+        scale=args.scale,
+        only=args.only,
+        include_http=not args.no_http
+    )
+    if not results["benchmarks"]:
+        print(f"error: no benchmarks match {args.only}", file=sys.stderr)
+        return 2
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(format_table(results))
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return 0
+
+    try:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        print(format_table(results))
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one", file=sys.stderr)
+        return 0
+
+    comparison = compare(results, baseline, args.threshold, args.memory_threshold)
+    print(format_table(results, comparison))
+    for warning in comparison["warnings"]:
+        print(f"warning: {warning}", file=sys.stderr)
+    if comparison["regressions"]:
+        print(f"{len(comparison['regressions'])} benchmark(s) regressed", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""
+Cold start benchmark.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup [--repeat 5] [--output results.json]
+    python -m benchmarks.startup --save-baseline
+
+Starts the app in fresh interpreter processes, the way a scale-to-zero
+platform does, and measures:
+
+    startup_import          importing app.main
+    startup_ready           process start to the first "/" response
+                            (interpreter, imports, lifespan, first request)
+    startup_first_upload    first /api/upload right after "/", while the
+                            background warm-up runs (what a cold start's
+                            first user sees)
+    startup_upload_cold     first upload with STARTUP_WARMUP disabled
+    startup_upload_warm     first upload after the warm-up has finished
+    startup_warmup          the warm-up itself
+
+Memory is the child process's peak RSS. Results are compared with
+benchmarks/startup_baseline.json like benchmarks.run results (exit code 1
+on a regression). Requires httpx for the in-process client.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+# benchmarks.fonts and benchmarks.run import fontTools; they are imported in
+# the parent only, so child processes start as cold as the app does
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = Path(__file__).parent / "startup_baseline.json"
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Font uploaded by the child processes
+UPLOAD_FONT = "latin-glyf"
+
+# Child process scenarios: environment overrides and whether to warm up explicitly
+SCENARIOS = {
+    "background": {"env": {"STARTUP_WARMUP": "true"}, "warm_first": False},
+    "cold": {"env": {"STARTUP_WARMUP": "false"}, "warm_first": False},
+    "warm": {"env": {"STARTUP_WARMUP": "false"}, "warm_first": True},
+}
+
+# Benchmark name -> (scenario, timing reported by the child)
+METRICS = {
+    "startup_import": ("background", "import_seconds"),
+    "startup_ready": ("background", "ready_seconds"),
+    "startup_first_upload": ("background", "upload_seconds"),
+    "startup_upload_cold": ("cold", "upload_seconds"),
+    "startup_upload_warm": ("warm", "upload_seconds"),
+    "startup_warmup": ("warm", "warmup_seconds"),
+}
+
+
+def child(font_path: str, warm_first: bool):
+    """
+    Measure one cold start in this (fresh) process and print the timings as JSON.
+
+    Args:
+        font_path: Font to upload
+        warm_first: Run the warm-up to completion before the upload
+    """
+    start = time.perf_counter()
+    import app.main
+    imported = time.perf_counter()
+    from fastapi.testclient import TestClient
+
+    app.main.app.state.limiter.enabled = False
+    timings = {"import_seconds": imported - start}
+    with TestClient(app.main.app) as client:
+        if client.get("/").status_code != 200:
+            raise RuntimeError("health check failed")
+        timings["first_request_seconds"] = time.perf_counter() - imported
+        print("READY", flush=True)
+
+        if warm_first:
+            timings["warmup_seconds"] = app.main.font_service.warm_up()
+
+        upload_start = time.perf_counter()
+        with open(font_path, "rb") as f:
+            response = client.post("/api/upload", files={"file": (Path(font_path).name, f)})
+        if response.status_code != 200:
+            raise RuntimeError(f"upload returned {response.status_code}: {response.text[:200]}")
+        timings["upload_seconds"] = time.perf_counter() - upload_start
+
+    # ru_maxrss is in kilobytes on Linux
+    timings["peak_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    print(json.dumps(timings), flush=True)
+
+
+def run_child(scenario: str, font_path: str, work_dir: Path) -> Dict[str, float]:
+    """
+    Start a child process for a scenario and collect its timings.
+
+    Args:
+        scenario: Name in SCENARIOS
+        font_path: Font to upload
+        work_dir: Scratch directory for the app's upload, output and cache dirs
+
+    Returns:
+        The child's timings plus ready_seconds (process start to first response)
+    """
+    spec = SCENARIOS[scenario]
+    run_dir = Path(tempfile.mkdtemp(dir=work_dir))
+    env = {
+        **os.environ,
+        **spec["env"],
+        "UPLOAD_DIR": str(run_dir / "uploads"),
+        "OUTPUT_DIR": str(run_dir / "outputs"),
+        "CACHE_DIR": str(run_dir / "cache"),
+        "SESSION_STORE": "memory",
+        "FONT_WORKERS": "0",
+        "PYTHONPATH": str(BACKEND_DIR),
+    }
+    for name in ("uploads", "outputs", "cache"):
+        (run_dir / name).mkdir()
+
+    command = [sys.executable, "-m", "benchmarks.startup", "--child", font_path]
+    if spec["warm_first"]:
+        command.append("--warm-first")
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command, cwd=str(BACKEND_DIR), env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    ready = None
+    timings = None
+    for line in process.stdout:
+        if line.startswith("READY") and ready is None:
+            ready = time.perf_counter() - start
+        elif line.startswith("{"):
+            timings = json.loads(line)
+    if process.wait() != 0 or timings is None or ready is None:
+        raise RuntimeError(f"{scenario} start failed (exit code {process.returncode})")
+
+    timings["ready_seconds"] = ready
+    return timings
+
+
+def run_startup(repeat: int = 5) -> Dict[str, Any]:
+    """
+    Run every scenario repeat times and summarize the metrics.
+
+    Args:
+        repeat: Processes started per scenario
+
+    Returns:
+        Results dictionary in the benchmarks.run format
+    """
+    from benchmarks.fonts import build_font
+    from benchmarks.run import calibrate, environment
+
+    with tempfile.TemporaryDirectory(prefix="fontsub-startup-") as work:
+        work_dir = Path(work)
+        font = build_font(UPLOAD_FONT, str(work_dir / "fonts"))
+
+        calibration = calibrate()
+        runs: Dict[str, List[Dict[str, float]]] = {name: [] for name in SCENARIOS}
+        # Interleave scenarios so background load affects them alike
+        for _ in range(repeat):
+            for scenario in SCENARIOS:
+                logger.info(f"Starting {scenario} process")
+                runs[scenario].append(run_child(scenario, font["path"], work_dir))
+        calibration = min(calibration, calibrate())
+
+    results = {}
+    for name, (scenario, key) in METRICS.items():
+        values = [run[key] for run in runs[scenario]]
+        results[name] = {
+            "median_seconds": statistics.median(values),
+            "min_seconds": min(values),
+            "peak_bytes": max(run["peak_bytes"] for run in runs[scenario]),
+            "normalized": min(values) / calibration,
+        }
+
+    return {
+        "environment": environment(),
+        "calibration_seconds": calibration,
+        "repeat": repeat,
+        "scale": 1.0,
+        "fonts": {UPLOAD_FONT: {key: font[key] for key in ("size", "glyph_count", "sha256")}},
+        "benchmarks": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Arguments (defaults to sys.argv)
+
+    Returns:
+        Exit code: 0 on success, 1 if any metric regressed, 2 on invalid input
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="Cold start benchmark")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress")
+    parser.add_argument("--repeat", type=int, default=5, help="Processes started per scenario")
+    parser.add_argument("--output", help="Write the JSON results here")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown (0.25 = 25%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="Allowed relative peak RSS growth")
+    parser.add_argument("--child", metavar="FONT", help=argparse.SUPPRESS)
+    parser.add_argument("--warm-first", action="store_true", help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+    if args.child:
+        child(args.child, args.warm_first)
+        return 0
+
+    from benchmarks.run import compare, format_table
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr)
+    if args.repeat < 1:
+        print("error: --repeat must be at least 1", file=sys.stderr)
+        return 2
+
+    results = run_startup(args.repeat)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(format_table(results))
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return 0
+
+    try:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        print(format_table(results))
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one", file=sys.stderr)
+        return 0
+
+    comparison = compare(results, baseline, args.threshold, args.memory_threshold)
+    print(format_table(results, comparison))
+    for warning in comparison["warnings"]:
+        print(f"warning: {warning}", file=sys.stderr)
+    if comparison["regressions"]:
+        print(f"{len(comparison['regressions'])} benchmark(s) regressed", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+Tests for the SQLite and Redis session store backends.
+
+The Redis store is exercised against scripted sockets: each fake socket
+replays canned server replies and records what the client wrote.
+"""
+import socket
+import sqlite3
+from io import BytesIO
+from typing import List, Optional
+
+import pytest
+
+from app.utils.session_store import RedisSessionStore, RespError, SQLiteSessionStore, _RespConnection
+
+
+class FakeSocket:
+    """Socket stand-in that replays canned replies and records sent bytes"""
+
+    def __init__(self, replies: bytes = b"", fail_after_sends: Optional[int] = None):
+        self.replies = replies
+        self.sent = bytearray()
+        self.sends = 0
+        self.fail_after_sends = fail_after_sends
+
+    def setsockopt(self, *args):
+        pass
+
+    def makefile(self, mode: str) -> BytesIO:
+        return BytesIO(self.replies)
+
+    def sendall(self, data: bytes):
+        if self.fail_after_sends is not None and self.sends >= self.fail_after_sends:
+            raise BrokenPipeError("Broken pipe")
+        self.sends += 1
+        self.sent += data
+
+    def close(self):
+        pass
+
+
+class FakeServer:
+    """Hands out queued fake sockets, in order, to new connections"""
+
+    def __init__(self):
+        self.pending: List[FakeSocket] = []
+        self.opened: List[FakeSocket] = []
+
+    def add(self, sock: FakeSocket) -> FakeSocket:
+        self.pending.append(sock)
+        return sock
+
+    def create_connection(self, address, timeout=None) -> FakeSocket:
+        sock = self.pending.pop(0)
+        self.opened.append(sock)
+        return sock
+
+
+@pytest.fixture
+def server(monkeypatch) -> FakeServer:
+    fake = FakeServer()
+    monkeypatch.setattr(socket, "create_connection", fake.create_connection)
+    return fake
+
+
+def connection_over(data: bytes) -> _RespConnection:
+    """A connection that reads replies from data"""
+    conn = _RespConnection.__new__(_RespConnection)
+    conn._reader = BytesIO(data)
+    return conn
+
+
+def sent_commands(sock: FakeSocket) -> List[List[str]]:
+    """Decode the commands a client wrote to a fake socket"""
+    conn = connection_over(bytes(sock.sent))
+    commands = []
+    while conn._reader.tell() < len(sock.sent):
+        commands.append([arg.decode("utf-8") for arg in conn.read_reply()])
+    return commands
+
+
+def test_read_reply_parses_resp2_types():
+    conn = connection_over(
+        b"+OK\r\n"
+        b":42\r\n"
+        b"$5\r\nhe\r\no\r\n"
+        b"$-1\r\n"
+        b"*2\r\n$1\r\na\r\n*1\r\n:-3\r\n"
+        b"*-1\r\n"
+        b"*0\r\n"
+    )
+    assert conn.read_reply() == "OK"
+    assert conn.read_reply() == 42
+    assert conn.read_reply() == b"he\r\no"
+    assert conn.read_reply() is None
+    assert conn.read_reply() == [b"a", [-3]]
+    assert conn.read_reply() is None
+    assert conn.read_reply() == []
+
+
+def test_read_reply_errors():
+    conn = connection_over(b"-WRONGTYPE Operation against a key\r\n?\r\n")
+    with pytest.raises(RespError, match="WRONGTYPE"):
+        conn.read_reply()
+    with pytest.raises(ConnectionError, match="Unexpected reply"):
+        conn.read_reply()
+    with pytest.raises(ConnectionError, match="closed"):
+        conn.read_reply()
+
+
+def test_send_encodes_commands_in_one_write(server):
+    sock = server.add(FakeSocket())
+    conn = _RespConnection("localhost", 6379, 1.0)
+    conn.send(("SET", "k", "é"), ("PEXPIRE", b"k", 1500))
+
+    assert sock.sends == 1
+    assert bytes(sock.sent) == (
+        b"*3\r\n$3\r\nSET\r\n$1\r\nk\r\n$2\r\n\xc3\xa9\r\n"
+        b"*3\r\n$7\r\nPEXPIRE\r\n$1\r\nk\r\n$4\r\n1500\r\n"
+    )
+
+
+def test_transaction_returns_exec_replies(server):
+    sock = server.add(FakeSocket(b"+PONG\r\n" b"+OK\r\n+QUEUED\r\n+QUEUED\r\n" b"*2\r\n:1\r\n$-1\r\n"))
+    store = RedisSessionStore("redis://localhost")
+
+    assert store._transaction(("INCR", "a"), ("GET", "b")) == [1, None]
+    assert sent_commands(sock) == [["PING"], ["MULTI"], ["INCR", "a"], ["GET", "b"], ["EXEC"]]
+
+
+def test_aborted_transaction_raises(server):
+    server.add(FakeSocket(b"+PONG\r\n" b"+OK\r\n+QUEUED\r\n" b"*-1\r\n"))
+    store = RedisSessionStore("redis://localhost")
+
+    with pytest.raises(RespError, match="aborted"):
+        store._transaction(("INCR", "a"))
+
+
+def test_write_is_not_resent_after_reply_is_lost(server):
+    # The server closes the connection after the RPUSH was written
+    server.add(FakeSocket(b"+PONG\r\n"))
+    server.add(FakeSocket(b":1\r\n"))
+    store = RedisSessionStore("redis://localhost")
+
+    with pytest.raises(ConnectionError):
+        store._execute("RPUSH", "list", "value")
+    assert len(server.opened) == 1
+
+
+def test_idempotent_read_is_retried_after_reply_is_lost(server):
+    server.add(FakeSocket(b"+PONG\r\n"))
+    server.add(FakeSocket(b"$5\r\nvalue\r\n"))
+    store = RedisSessionStore("redis://localhost")
+
+    assert store._execute("GET", "key", idempotent=True) == b"value"
+    assert sent_commands(server.opened[1]) == [["GET", "key"]]
+
+
+def test_unsent_write_is_retried(server):
+    server.add(FakeSocket(b"+PONG\r\n", fail_after_sends=1))
+    server.add(FakeSocket(b":1\r\n"))
+    store = RedisSessionStore("redis://localhost")
+
+    assert store._execute("RPUSH", "list", "value") == 1
+    assert sent_commands(server.opened[1]) == [["RPUSH", "list", "value"]]
+
+
+def test_append_rebuilds_after_concurrent_change(server):
+    sock = server.add(FakeSocket(
+        b"+PONG\r\n"
+        # First attempt: EXEC returns nil because the session changed
+        b"+OK\r\n:1\r\n" b"+OK\r\n+QUEUED\r\n+QUEUED\r\n+QUEUED\r\n*-1\r\n"
+        # Second attempt commits
+        b"+OK\r\n:1\r\n" b"+OK\r\n+QUEUED\r\n+QUEUED\r\n+QUEUED\r\n*3\r\n:1\r\n:1\r\n:2\r\n"
+    ))
+    store = RedisSessionStore("redis://localhost", prefix="t:")
+
+    assert store.append("s1", {"fonts": "{}"}) is True
+    attempt = [
+        ["WATCH", "t:session:s1"],
+        ["EXISTS", "t:session:s1"],
+        ["MULTI"],
+        ["SADD", "t:session:s1:fields", "fonts"],
+        ["RPUSH", "t:session:s1:list:fonts", "{}"],
+        ["HINCRBY", "t:session:s1", "version", "1"],
+        ["EXEC"],
+    ]
+    assert sent_commands(sock) == [["PING"]] + attempt + attempt
+
+
+def test_append_to_missing_session_writes_nothing(server):
+    sock = server.add(FakeSocket(b"+PONG\r\n" b"+OK\r\n:0\r\n+OK\r\n"))
+    store = RedisSessionStore("redis://localhost", prefix="t:")
+
+    assert store.append("gone", {"fonts": "{}"}) is False
+    assert sent_commands(sock) == [
+        ["PING"], ["WATCH", "t:session:gone"], ["EXISTS", "t:session:gone"], ["UNWATCH"]
+    ]
+
+
+def test_sqlite_adds_version_column_to_legacy_database(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    legacy = sqlite3.connect(path)
+    legacy.execute("CREATE TABLE sessions (id TEXT PRIMARY KEY, created_at REAL NOT NULL, last_accessed REAL NOT NULL)")
+    legacy.execute("INSERT INTO sessions VALUES ('old', 1.0, 2.0)")
+    legacy.commit()
+    legacy.close()
+
+    store = SQLiteSessionStore(path)
+    assert store.touch("old", 3.0, timeout=60) == {
+        "created_at": 1.0, "last_accessed": 3.0, "version": 0, "expired": False
+    }
+    assert store.append("old", {"fonts": "a"})
+    assert store.touch("old", 3.0, timeout=60)["version"] == 1
+    assert store.get_list("old", "fonts") == ["a"]
+
+    # Opening a migrated database again leaves it alone
+    assert SQLiteSessionStore(path).touch("old", 3.0, timeout=60)["version"] == 1
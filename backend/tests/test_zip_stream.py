@@ -0,0 +1,41 @@
+"""
+Tests for the streaming zip writer.
+"""
+import os
+import zipfile
+from io import BytesIO
+
+from app.utils.zip_stream import stream_zip, zip_bytes
+
+
+def test_stream_zip_produces_valid_archive(tmp_path):
+    ttf = tmp_path / "Font-Subset.ttf"
+    woff2 = tmp_path / "Font-Subset.woff2"
+    ttf.write_bytes(b"\x00\x01\x00\x00" + b"glyf" * 5000)
+    woff2.write_bytes(os.urandom(10000))
+
+    chunks = list(stream_zip([str(ttf), str(tmp_path / "missing.woff"), str(woff2)], chunk_size=1024))
+    assert len(chunks) > 1
+
+    with zipfile.ZipFile(BytesIO(b"".join(chunks))) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["Font-Subset.ttf", "Font-Subset.woff2"]
+        assert archive.read("Font-Subset.ttf") == ttf.read_bytes()
+        assert archive.read("Font-Subset.woff2") == woff2.read_bytes()
+        assert archive.getinfo("Font-Subset.ttf").compress_type == zipfile.ZIP_DEFLATED
+        assert archive.getinfo("Font-Subset.woff2").compress_type == zipfile.ZIP_STORED
+
+
+def test_stream_zip_of_no_files_is_empty_archive():
+    with zipfile.ZipFile(BytesIO(b"".join(stream_zip([])))) as archive:
+        assert archive.namelist() == []
+
+
+def test_zip_bytes_is_reproducible():
+    members = {"a.ttf": b"a" * 100, "b.woff2": b"b" * 10}
+    data = zip_bytes(members)
+
+    assert data == zip_bytes(members)
+    with zipfile.ZipFile(BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert {name: archive.read(name) for name in archive.namelist()} == members
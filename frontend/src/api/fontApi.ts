@@ -1,9 +1,48 @@
-import type { FontMetadata, SubsetRequest, SubsetResponse, ExportRequest, ExportResponse } from '@/types/font';
+import type {
+  CompactFontMetadata,
+  FontMetadata,
+  GlyphPage,
+  SubsetRequest,
+  SubsetResponse,
+  ExportRequest,
+  ExportResponse,
+  SliceRequest,
+  SliceResponse,
+  CorpusScanOptions,
+  CorpusScanResponse,
+  EstimateRequest,
+  EstimateResponse,
+  JobAccepted,
+  JobProgress,
+  JobStatus,
+} from '@/types/font';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// Sessions above these sizes run subset/export as background jobs so the
+// request doesn't sit open while the backend works through large fonts.
+const ASYNC_JOB_MIN_BYTES = 2 * 1024 * 1024;
+const ASYNC_JOB_MIN_GLYPHS = 5000;
+const JOB_POLL_INTERVAL_MS = 1000;
+
+export type JobProgressHandler = (progress: JobProgress) => void;
+
+// Rebuild the character list from range-encoded coverage. Glyph names are
+// fetched on demand with getGlyphs() instead of shipping them with every upload.
+function expandCompactMetadata(compact: CompactFontMetadata): FontMetadata {
+  const characterSet: string[] = [];
+  for (const [start, end] of compact.codepoint_ranges) {
+    for (let codePoint = start; codePoint <= end; codePoint++) {
+      characterSet.push(String.fromCodePoint(codePoint));
+    }
+  }
+  return { ...compact, character_set: characterSet, glyphs: [] };
+}
+
 class FontApi {
   private sessionId: string | null = null;
+  private sessionFontBytes = 0;
+  private sessionGlyphCount = 0;
 
   async uploadFont(file: File): Promise<FontMetadata> {
     const formData = new FormData();
@@ -13,7 +52,7 @@ class FontApi {
       formData.append('session_id', this.sessionId);
     }
 
-    const response = await fetch(`${API_BASE_URL}/api/upload`, {
+    const response = await fetch(`${API_BASE_URL}/api/upload?compact=true`, {
       method: 'POST',
       body: formData,
     });
@@ -23,16 +62,40 @@ class FontApi {
       throw new Error(error.detail || 'Failed to upload font');
     }
 
-    const metadata: FontMetadata = await response.json();
+    const metadata = expandCompactMetadata(await response.json());
 
     if (metadata.session_id) {
       this.sessionId = metadata.session_id;
     }
 
+    this.sessionFontBytes += metadata.file_size;
+    this.sessionGlyphCount += metadata.glyph_count;
+
     return metadata;
   }
 
-  async generateSubset(characters: string, fontNameSuffix: string = 'Subset', customFontName?: string): Promise<SubsetResponse> {
+  async getGlyphs(fontIndex: number, offset: number = 0, limit: number = 500): Promise<GlyphPage> {
+    if (!this.sessionId) {
+      throw new Error('No active session. Please upload a font first.');
+    }
+
+    const params = new URLSearchParams({ offset: String(offset), limit: String(limit) });
+    const response = await fetch(`${API_BASE_URL}/api/fonts/${this.sessionId}/${fontIndex}/glyphs?${params}`);
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || 'Failed to load glyphs');
+    }
+
+    return response.json();
+  }
+
+  async generateSubset(
+    characters: string,
+    fontNameSuffix: string = 'Subset',
+    customFontName?: string,
+    onProgress?: JobProgressHandler
+  ): Promise<SubsetResponse> {
     if (!this.sessionId) {
       throw new Error('No active session. Please upload a font first.');
     }
@@ -42,6 +105,7 @@ class FontApi {
       characters,
       font_name_suffix: fontNameSuffix,
       custom_font_name: customFontName,
+      async_mode: this.shouldRunAsync(),
     };
 
     const response = await fetch(`${API_BASE_URL}/api/subset`, {
@@ -57,10 +121,78 @@ class FontApi {
       throw new Error(error.detail || 'Failed to generate subset');
     }
 
+    if (response.status === 202) {
+      return this.waitForJob<SubsetResponse>(await response.json(), onProgress);
+    }
+
+    return response.json();
+  }
+
+  async estimateSize(
+    characters: string,
+    unicodeRanges?: string[],
+    signal?: AbortSignal
+  ): Promise<EstimateResponse> {
+    if (!this.sessionId) {
+      throw new Error('No active session. Please upload a font first.');
+    }
+
+    const request: EstimateRequest = {
+      session_id: this.sessionId,
+      characters,
+      unicode_ranges: unicodeRanges,
+    };
+
+    const response = await fetch(`${API_BASE_URL}/api/estimate`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(request),
+      signal,
+    });
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || 'Failed to estimate subset size');
+    }
+
+    return response.json();
+  }
+
+  async scanCorpus(files: File[], options: CorpusScanOptions = {}): Promise<CorpusScanResponse> {
+    const formData = new FormData();
+    for (const file of files) {
+      formData.append('files', file);
+    }
+
+    if (this.sessionId) {
+      formData.append('session_id', this.sessionId);
+    }
+    for (const [key, value] of Object.entries(options)) {
+      if (value !== undefined) {
+        formData.append(key, String(value));
+      }
+    }
+
+    const response = await fetch(`${API_BASE_URL}/api/corpus`, {
+      method: 'POST',
+      body: formData,
+    });
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || 'Failed to scan corpus');
+    }
+
     return response.json();
   }
 
-  async exportFont(formats: string[], customFontName?: string): Promise<ExportResponse> {
+  async exportFont(
+    formats: string[],
+    customFontName?: string,
+    onProgress?: JobProgressHandler
+  ): Promise<ExportResponse> {
     if (!this.sessionId) {
       throw new Error('No active session. Please upload a font first.');
     }
@@ -69,6 +201,7 @@ class FontApi {
       session_id: this.sessionId,
       formats,
       font_name: customFontName,
+      async_mode: this.shouldRunAsync(),
     };
 
     const response = await fetch(`${API_BASE_URL}/api/export`, {
@@ -84,9 +217,105 @@ class FontApi {
       throw new Error(error.detail || 'Failed to export font');
     }
 
+    if (response.status === 202) {
+      return this.waitForJob<ExportResponse>(await response.json(), onProgress);
+    }
+
+    return response.json();
+  }
+
+  async sliceFonts(
+    options: Omit<SliceRequest, 'session_id' | 'async_mode'> = {},
+    onProgress?: JobProgressHandler
+  ): Promise<SliceResponse> {
+    if (!this.sessionId) {
+      throw new Error('No active session. Please upload a font first.');
+    }
+
+    const request: SliceRequest = {
+      ...options,
+      session_id: this.sessionId,
+      async_mode: this.shouldRunAsync(),
+    };
+
+    const response = await fetch(`${API_BASE_URL}/api/slice`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(request),
+    });
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || 'Failed to slice fonts');
+    }
+
+    if (response.status === 202) {
+      return this.waitForJob<SliceResponse>(await response.json(), onProgress);
+    }
+
     return response.json();
   }
 
+  private shouldRunAsync(): boolean {
+    return this.sessionFontBytes >= ASYNC_JOB_MIN_BYTES || this.sessionGlyphCount >= ASYNC_JOB_MIN_GLYPHS;
+  }
+
+  private waitForJob<T>(job: JobAccepted, onProgress?: JobProgressHandler): Promise<T> {
+    return new Promise<T>((resolve, reject) => {
+      const finish = (status: JobStatus<T>) => {
+        if (status.status === 'completed' && status.result) {
+          resolve(status.result);
+        } else {
+          reject(new Error(status.error || 'Job failed'));
+        }
+      };
+
+      // Fall back to polling when Server-Sent Events are unavailable
+      const poll = async () => {
+        try {
+          const response = await fetch(`${API_BASE_URL}${job.status_url}`);
+          if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.detail || 'Failed to get job status');
+          }
+          const status: JobStatus<T> = await response.json();
+          onProgress?.(status.progress);
+          if (status.status === 'completed' || status.status === 'failed') {
+            finish(status);
+          } else {
+            setTimeout(poll, JOB_POLL_INTERVAL_MS);
+          }
+        } catch (error) {
+          reject(error);
+        }
+      };
+
+      if (typeof EventSource === 'undefined') {
+        poll();
+        return;
+      }
+
+      const events = new EventSource(`${API_BASE_URL}${job.events_url}`);
+      events.addEventListener('progress', (event) => {
+        onProgress?.((JSON.parse((event as MessageEvent).data) as JobStatus<T>).progress);
+      });
+      const onDone = (event: Event) => {
+        events.close();
+        const status = JSON.parse((event as MessageEvent).data) as JobStatus<T>;
+        onProgress?.(status.progress);
+        finish(status);
+      };
+      events.addEventListener('completed', onDone);
+      events.addEventListener('failed', onDone);
+      events.onerror = () => {
+        events.close();
+        poll();
+      };
+    });
+  }
+
 
   getDownloadAllUrl(): string {
     if (!this.sessionId) {
@@ -113,6 +342,8 @@ class FontApi {
       console.error('Failed to cleanup session:', error);
     } finally {
       this.sessionId = null;
+      this.sessionFontBytes = 0;
+      this.sessionGlyphCount = 0;
     }
   }
 
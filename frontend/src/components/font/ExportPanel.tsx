@@ -19,7 +19,7 @@ export function ExportPanel({ selectedCharacters, fontFamily }: ExportPanelProps
   const [fontNameSuffix, setFontNameSuffix] = useState('Subset');
   const [customFileName, setCustomFileName] = useState('');
   const [selectedFormats, setSelectedFormats] = useState<Set<string>>(new Set(['woff2']));
-  const [exportedFiles, setExportedFiles] = useState<Array<{ filename: string; format: string; size: number }>>([]);
+  const [exportedFiles, setExportedFiles] = useState<Array<{ filename: string; download_name: string; format: string; size: number }>>([]);
 
   const formats = [
     { id: 'ttf', label: 'TTF', description: 'TrueType Font' },
@@ -248,7 +248,7 @@ export function ExportPanel({ selectedCharacters, fontFamily }: ExportPanelProps
               {exportedFiles.map((file, index) => (
                 <li key={index}>
                   <button
-                    onClick={() => handleDownload(file.filename)}
+                    onClick={() => handleDownload(file.download_name)}
                     className="w-full flex items-center justify-between p-3 border rounded-lg hover:bg-accent transition-colors cursor-pointer text-left focus:outline-none focus:ring-2 focus:ring-ring focus:ring-offset-2"
                     aria-label={`Download ${file.filename}, ${file.format.toUpperCase()} format, ${formatFileSize(file.size)}`}
                   >
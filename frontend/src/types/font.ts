@@ -4,9 +4,18 @@ export interface GlyphInfo {
   character: string | null;
 }
 
+export interface AxisInfo {
+  tag: string;
+  name: string | null;
+  min_value: number;
+  default_value: number;
+  max_value: number;
+}
+
 export interface FontMetadata {
   session_id?: string;
   file_path?: string;
+  content_hash?: string;
   family_name: string;
   style_name: string;
   full_name: string;
@@ -16,8 +25,62 @@ export interface FontMetadata {
   glyph_count: number;
   character_set: string[];
   glyphs: GlyphInfo[];
+  axes?: AxisInfo[];
+  file_size: number;
+  format: string;
+  collection?: string | null;
+  font_number?: number | null;
+}
+
+export interface CompactFontMetadata {
+  session_id?: string;
+  file_path?: string;
+  content_hash?: string;
+  family_name: string;
+  style_name: string;
+  full_name: string;
+  version?: string;
+  designer?: string;
+  description?: string;
+  glyph_count: number;
+  character_count: number;
+  codepoint_ranges: Array<[number, number]>;
+  axes?: AxisInfo[];
   file_size: number;
   format: string;
+  collection?: string | null;
+  font_number?: number | null;
+}
+
+export interface CollectionMember {
+  font_number: number;
+  family_name: string;
+  style_name: string;
+  full_name: string;
+  glyph_count: number;
+  character_count: number;
+  format: string;
+}
+
+export interface FontCollection {
+  session_id: string;
+  filename: string;
+  file_size: number;
+  members: CollectionMember[];
+}
+
+export interface CollectionSelectRequest {
+  session_id: string;
+  filename: string;
+  font_numbers: number[];
+}
+
+export interface GlyphPage {
+  font_index: number;
+  offset: number;
+  limit: number;
+  total: number;
+  glyphs: GlyphInfo[];
 }
 
 export interface SubsetRequest {
@@ -26,12 +89,33 @@ export interface SubsetRequest {
   font_name_suffix?: string;
   custom_font_name?: string;
   unicode_ranges?: string[];
+  axis_limits?: Record<string, number | [number, number] | null>;
+  collection_output?: boolean;
+  async_mode?: boolean;
 }
 
 export interface ExportRequest {
   session_id: string;
   formats: string[];
   font_name?: string;
+  async_mode?: boolean;
+}
+
+export interface UnicodeSlice {
+  name: string;
+  unicode_ranges?: string[];
+  characters?: string;
+}
+
+export interface SliceRequest {
+  session_id: string;
+  slices?: Array<string | UnicodeSlice>;
+  remainder_chunk_size?: number;
+  formats?: string[];
+  font_index?: number;
+  font_family?: string;
+  font_display?: string;
+  async_mode?: boolean;
 }
 
 export interface SubsetResponse {
@@ -46,8 +130,108 @@ export interface ExportResponse {
   message: string;
   files: Array<{
     filename: string;
+    download_name: string;
     format: string;
     size: number;
     path: string;
   }>;
 }
+
+export interface SliceResponse {
+  status: string;
+  message: string;
+  slices: Array<{
+    font_index: number;
+    name: string;
+    unicode_range: string;
+    character_count: number;
+    files: ExportResponse['files'];
+  }>;
+  stylesheet: string;
+  css: string;
+}
+
+export interface CorpusScanOptions {
+  min_count?: number;
+  max_characters?: number;
+  create_subset?: boolean;
+  font_name_suffix?: string;
+}
+
+export interface CorpusCoverage {
+  font_index: number;
+  full_name: string;
+  characters: number;
+  covered: number;
+  missing_count: number;
+  occurrence_coverage: number;
+  missing: Array<{ character: string; codepoint: string; count: number }>;
+}
+
+export interface CorpusScanResponse {
+  status: string;
+  characters: string;
+  character_count: number;
+  files_scanned: number;
+  files_skipped: number;
+  bytes_scanned: number;
+  total_characters: number;
+  distinct_characters: number;
+  frequencies: Array<[string, number]>;
+  coverage: CorpusCoverage[];
+  subset?: SubsetResponse;
+}
+
+export interface EstimateRequest {
+  session_id: string;
+  characters: string;
+  unicode_ranges?: string[];
+  font_index?: number;
+}
+
+export interface FontSizeEstimate {
+  font_index: number;
+  family_name: string;
+  style_name: string;
+  original_size: number;
+  glyph_count: number;
+  character_count: number;
+  ttf: number;
+  woff: number;
+  woff2: number;
+}
+
+export interface EstimateResponse {
+  status: string;
+  fonts: FontSizeEstimate[];
+  total: {
+    ttf: number;
+    woff: number;
+    woff2: number;
+  };
+}
+
+export interface JobAccepted {
+  status: 'accepted';
+  job_id: string;
+  status_url: string;
+  events_url: string;
+}
+
+export interface JobProgress {
+  completed: number;
+  total: number;
+  current: string | null;
+}
+
+export interface JobStatus<T = unknown> {
+  job_id: string;
+  kind: string;
+  session_id: string;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  progress: JobProgress;
+  result: T | null;
+  error: string | null;
+  created_at: string;
+  updated_at: string;
+}